@@ -8,15 +8,14 @@ import sys
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
-from app.core.database import Base
-from app.core.config import settings
+from app.core.database import Base, SYNC_DATABASE_URL
 from app.models import User, Achievement, Todo  # Import all models
 
 # this is the Alembic Config object
 config = context.config
 
-# Override sqlalchemy.url with settings
-config.set_main_option("sqlalchemy.url", settings.DATABASE_URL)
+# Override sqlalchemy.url with settings (migrations always use the sync driver)
+config.set_main_option("sqlalchemy.url", SYNC_DATABASE_URL)
 
 # Interpret the config file for Python logging.
 if config.config_file_name is not None:
@@ -0,0 +1,75 @@
+"""baseline schema: users, achievements and todos
+
+Revision ID: 0000
+Revises:
+Create Date: 2026-10-18 08:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0000'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def timestamps():
+    return [
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+    ]
+
+
+def upgrade() -> None:
+    # Databases made by create_all before Alembic already have these tables
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+    if "users" not in existing:
+        op.create_table(
+            "users",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("email", sa.String(), nullable=False),
+            sa.Column("hashed_password", sa.String(), nullable=False),
+            sa.Column("display_name", sa.String(), nullable=False),
+            sa.Column("avatar_url", sa.String(), nullable=True),
+            sa.Column("quote", sa.Text(), nullable=True),
+            *timestamps(),
+        )
+        op.create_index("ix_users_id", "users", ["id"])
+        op.create_index("ix_users_email", "users", ["email"], unique=True)
+    if "achievements" not in existing:
+        op.create_table(
+            "achievements",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+            sa.Column("title", sa.String(), nullable=False),
+            sa.Column("notes", sa.Text(), nullable=True),
+            sa.Column("date", sa.Date(), nullable=False),
+            sa.Column("completed", sa.Boolean(), nullable=True),
+            *timestamps(),
+        )
+        op.create_index("ix_achievements_id", "achievements", ["id"])
+        op.create_index("ix_achievements_date", "achievements", ["date"])
+    if "todos" not in existing:
+        op.create_table(
+            "todos",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+            sa.Column("title", sa.String(), nullable=False),
+            sa.Column("notes", sa.Text(), nullable=True),
+            sa.Column("date", sa.Date(), nullable=False),
+            sa.Column("completed", sa.Boolean(), nullable=True),
+            sa.Column("priority", sa.String(), nullable=True),
+            sa.Column("due_time", sa.String(), nullable=True),
+            *timestamps(),
+        )
+        op.create_index("ix_todos_id", "todos", ["id"])
+        op.create_index("ix_todos_date", "todos", ["date"])
+
+
+def downgrade() -> None:
+    op.drop_table("todos")
+    op.drop_table("achievements")
+    op.drop_table("users")
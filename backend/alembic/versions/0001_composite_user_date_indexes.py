@@ -0,0 +1,34 @@
+"""composite (user_id, date) indexes
+
+Revision ID: 0001
+Revises: 0000
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0001'
+down_revision = '0000'
+branch_labels = None
+depends_on = None
+
+
+INDEXES = [
+    ("ix_achievements_user_id_date", "achievements", ["user_id", "date"]),
+    ("ix_achievements_user_id_completed_date", "achievements", ["user_id", "completed", "date"]),
+    ("ix_todos_user_id_date", "todos", ["user_id", "date"]),
+    ("ix_todos_user_id_completed_date", "todos", ["user_id", "completed", "date"]),
+]
+
+
+def upgrade() -> None:
+    # Databases made by create_all already have these indexes from the models
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, if_not_exists=True)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
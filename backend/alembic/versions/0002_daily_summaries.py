@@ -0,0 +1,69 @@
+"""daily summaries aggregate table
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+COUNTERS = [
+    "achievements", "achievements_completed",
+    "todos", "todos_completed", "todos_low", "todos_medium", "todos_high",
+]
+
+
+def upgrade() -> None:
+    # create_all may already have made the table on startup, with the version
+    # column of 0004 and rows kept by the app; the backfill rebuilds those rows
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table("daily_summaries"):
+        op.create_table(
+            "daily_summaries",
+            sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+            sa.Column("date", sa.Date(), nullable=False),
+            *[sa.Column(name, sa.Integer(), nullable=False, server_default="0") for name in COUNTERS],
+            sa.PrimaryKeyConstraint("user_id", "date"),
+        )
+    
+    # Backfill from existing rows. Older create_all tables have no server
+    # default for version, so it is written explicitly when present
+    columns = ["user_id", "date", *COUNTERS]
+    values = ""
+    if "version" in {column["name"] for column in inspector.get_columns("daily_summaries")}:
+        columns.append("version")
+        values = ", 0"
+    op.execute("DELETE FROM daily_summaries")
+    op.execute(f"""
+        INSERT INTO daily_summaries ({", ".join(columns)})
+        SELECT user_id, date,
+               SUM(achievements), SUM(achievements_completed),
+               SUM(todos), SUM(todos_completed), SUM(todos_low), SUM(todos_medium), SUM(todos_high){values}
+        FROM (
+            SELECT user_id, date,
+                   1 AS achievements, CASE WHEN completed THEN 1 ELSE 0 END AS achievements_completed,
+                   0 AS todos, 0 AS todos_completed, 0 AS todos_low, 0 AS todos_medium, 0 AS todos_high
+            FROM achievements
+            UNION ALL
+            SELECT user_id, date, 0, 0,
+                   1, CASE WHEN completed THEN 1 ELSE 0 END,
+                   CASE WHEN priority = 'low' THEN 1 ELSE 0 END,
+                   CASE WHEN priority = 'medium' OR priority IS NULL THEN 1 ELSE 0 END,
+                   CASE WHEN priority = 'high' THEN 1 ELSE 0 END
+            FROM todos
+        ) AS rows
+        GROUP BY user_id, date
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table("daily_summaries")
@@ -0,0 +1,28 @@
+"""full-text search index for achievements and todos
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from alembic import op
+
+from app import search
+
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # FTS5 tables + triggers on SQLite, generated tsvector + GIN on PostgreSQL
+    connection = op.get_bind()
+    search.install(connection)
+    search.rebuild(connection)
+
+
+def downgrade() -> None:
+    search.uninstall(op.get_bind())
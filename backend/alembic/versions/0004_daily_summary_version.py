@@ -0,0 +1,30 @@
+"""per-day write version on daily summaries (day view ETags)
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Tables made by create_all on startup already have the column, and 0002
+    # filled it in for the rows it rebuilt
+    columns = {column["name"] for column in sa.inspect(op.get_bind()).get_columns("daily_summaries")}
+    if "version" not in columns:
+        with op.batch_alter_table("daily_summaries") as batch_op:
+            batch_op.add_column(sa.Column("version", sa.Integer(), nullable=False, server_default="0"))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("daily_summaries") as batch_op:
+        batch_op.drop_column("version")
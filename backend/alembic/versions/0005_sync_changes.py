@@ -0,0 +1,51 @@
+"""change log for delta sync (GET /api/sync)
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 19:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # create_all may already have made the table on startup, with rows kept
+    # by the app; the seeding below replaces them
+    if not sa.inspect(op.get_bind()).has_table("sync_changes"):
+        op.create_table(
+            "sync_changes",
+            sa.Column("seq", sa.Integer(), primary_key=True),
+            sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+            sa.Column("kind", sa.String(), nullable=False),
+            sa.Column("row_id", sa.Integer(), nullable=False),
+            sa.Column("deleted", sa.Boolean(), nullable=False),
+            sqlite_autoincrement=True,
+        )
+        op.create_index("ix_sync_changes_user_id_seq", "sync_changes", ["user_id", "seq"])
+        op.create_index("ix_sync_changes_kind_row_id", "sync_changes", ["kind", "row_id"])
+    
+    # Seed one entry per existing row so a full sync returns everything
+    changes = sa.table(
+        "sync_changes",
+        sa.column("user_id"), sa.column("kind"), sa.column("row_id"), sa.column("deleted"),
+    )
+    op.execute("DELETE FROM sync_changes")
+    for table, kind, owner in (("users", "user", "id"), ("achievements", "achievement", "user_id"),
+                               ("todos", "todo", "user_id")):
+        source = sa.table(table, sa.column("id"), sa.column(owner))
+        op.execute(changes.insert().from_select(
+            ["user_id", "kind", "row_id", "deleted"],
+            sa.select(source.c[owner], sa.literal(kind), source.c.id, sa.false()),
+        ))
+
+
+def downgrade() -> None:
+    op.drop_table("sync_changes")
@@ -0,0 +1,68 @@
+"""recurrence rules, sparse occurrence overrides and the per-user rules version
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 21:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # create_all may already have made the tables and column on startup
+    inspector = sa.inspect(op.get_bind())
+    columns = {column["name"] for column in inspector.get_columns("users")}
+    if "recurrence_version" not in columns:
+        with op.batch_alter_table("users") as batch_op:
+            batch_op.add_column(sa.Column("recurrence_version", sa.Integer(), nullable=False, server_default="0"))
+
+    if not inspector.has_table("recurrence_rules"):
+        op.create_table(
+            "recurrence_rules",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+            sa.Column("title", sa.String(), nullable=False),
+            sa.Column("notes", sa.Text(), nullable=True),
+            sa.Column("priority", sa.String(), nullable=True),
+            sa.Column("due_time", sa.String(), nullable=True),
+            sa.Column("rrule", sa.String(), nullable=False),
+            sa.Column("dtstart", sa.Date(), nullable=False),
+            sa.Column("until", sa.Date(), nullable=True),
+            sa.Column("version", sa.Integer(), nullable=False, server_default="0"),
+            sa.Column("created_at", sa.DateTime(), nullable=True),
+            sa.Column("updated_at", sa.DateTime(), nullable=True),
+        )
+        op.create_index("ix_recurrence_rules_id", "recurrence_rules", ["id"])
+        op.create_index("ix_recurrence_rules_user_id_dtstart", "recurrence_rules", ["user_id", "dtstart"])
+
+    if not inspector.has_table("recurrence_overrides"):
+        op.create_table(
+            "recurrence_overrides",
+            sa.Column("rule_id", sa.Integer(), sa.ForeignKey("recurrence_rules.id"), nullable=False),
+            sa.Column("date", sa.Date(), nullable=False),
+            sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+            sa.Column("completed", sa.Boolean(), nullable=True),
+            sa.Column("title", sa.String(), nullable=True),
+            sa.Column("notes", sa.Text(), nullable=True),
+            sa.Column("priority", sa.String(), nullable=True),
+            sa.Column("due_time", sa.String(), nullable=True),
+            sa.Column("cancelled", sa.Boolean(), nullable=False, server_default=sa.false()),
+            sa.Column("updated_at", sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint("rule_id", "date"),
+        )
+        op.create_index("ix_recurrence_overrides_user_id_date", "recurrence_overrides", ["user_id", "date"])
+
+
+def downgrade() -> None:
+    op.drop_table("recurrence_overrides")
+    op.drop_table("recurrence_rules")
+    with op.batch_alter_table("users") as batch_op:
+        batch_op.drop_column("recurrence_version")
@@ -0,0 +1,87 @@
+"""soft delete: deleted_at, partial live-row indexes and archive tables for purged rows
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 23:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+
+LIVE = sa.text("deleted_at IS NULL")
+TOMBSTONE = sa.text("deleted_at IS NOT NULL")
+
+# (index, table, columns); rebuilt as partial indexes over live rows
+LIVE_INDEXES = [
+    ("ix_achievements_user_id_date", "achievements", ["user_id", "date"]),
+    ("ix_achievements_user_id_completed_date", "achievements", ["user_id", "completed", "date"]),
+    ("ix_todos_user_id_date", "todos", ["user_id", "date"]),
+    ("ix_todos_user_id_completed_date", "todos", ["user_id", "completed", "date"]),
+]
+
+
+def _archive_columns(table: str):
+    columns = [
+        sa.Column("archive_id", sa.Integer(), primary_key=True),
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("title", sa.String(), nullable=False),
+        sa.Column("notes", sa.Text(), nullable=True),
+        sa.Column("date", sa.Date(), nullable=False),
+        sa.Column("completed", sa.Boolean(), nullable=True),
+    ]
+    if table == "todos":
+        columns += [
+            sa.Column("priority", sa.String(), nullable=True),
+            sa.Column("due_time", sa.String(), nullable=True),
+        ]
+    return columns + [
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.Column("deleted_at", sa.DateTime(), nullable=False),
+        sa.Column("archived_at", sa.DateTime(), nullable=False),
+    ]
+
+
+def upgrade() -> None:
+    # create_all may already have made the column, partial indexes and tables on startup
+    inspector = sa.inspect(op.get_bind())
+    for table in ("achievements", "todos"):
+        if "deleted_at" in {column["name"] for column in inspector.get_columns(table)}:
+            continue
+        op.add_column(table, sa.Column("deleted_at", sa.DateTime(), nullable=True))
+        for name, index_table, columns in LIVE_INDEXES:
+            if index_table == table:
+                op.drop_index(name, table_name=table, if_exists=True)
+                op.create_index(name, table, columns, sqlite_where=LIVE, postgresql_where=LIVE)
+        op.create_index(f"ix_{table}_deleted_at", table, ["deleted_at"],
+                        sqlite_where=TOMBSTONE, postgresql_where=TOMBSTONE)
+
+    for table in ("achievements", "todos"):
+        archive = f"deleted_{table}"
+        if not inspector.has_table(archive):
+            op.create_table(archive, *_archive_columns(table))
+            op.create_index(f"ix_{archive}_user_id_date", archive, ["user_id", "date"])
+
+
+def downgrade() -> None:
+    op.drop_table("deleted_todos")
+    op.drop_table("deleted_achievements")
+    for table in ("achievements", "todos"):
+        # Without the column, tombstones would come back as live rows
+        op.execute(f"DELETE FROM {table} WHERE deleted_at IS NOT NULL")
+        op.drop_index(f"ix_{table}_deleted_at", table_name=table)
+        for name, index_table, columns in LIVE_INDEXES:
+            if index_table == table:
+                op.drop_index(name, table_name=table)
+                op.create_index(name, table, columns)
+        # A plain DROP COLUMN (SQLite 3.35+); a batch table rebuild would drop the search triggers
+        op.drop_column(table, "deleted_at")
@@ -0,0 +1,28 @@
+"""per-user cold storage watermark (the per-year archive tables are created by app.archive)
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-19 01:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0008'
+down_revision = '0007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # create_all may already have made the column on startup
+    columns = {column["name"] for column in sa.inspect(op.get_bind()).get_columns("users")}
+    if "archived_before" not in columns:
+        op.add_column("users", sa.Column("archived_before", sa.Date(), nullable=True))
+
+
+def downgrade() -> None:
+    # Run "python -m app.archive --restore" first: without the watermark, archived rows are not read
+    op.drop_column("users", "archived_before")
@@ -1,2 +1,5 @@
 # Achievement Tracker Backend
+import time
 
+# Start of the cold-start clock (app.startup); the first app import
+BOOT_STARTED = time.perf_counter()
@@ -1,15 +1,74 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
-from datetime import date
+from datetime import date, datetime
+from typing import List, Optional
 
 from app.core.database import get_db
+from app.core.replicas import get_read_db
 from app.api.dependencies import get_current_user
+from app.api.batch import bulk_create, bulk_update, bulk_delete
+from app.api.listing import SortOrder, list_statement, page
+from app.archive import thaw
 from app.models import User, Achievement
-from app.schemas import AchievementCreate, AchievementUpdate, AchievementResponse
+from app.tombstones import live, deleted
+from app.schemas import (
+    AchievementCreate, AchievementUpdate, AchievementBatchUpdate, AchievementResponse, AchievementListResponse,
+    BatchDeleteResponse
+)
 
 router = APIRouter(prefix="/api/achievements", tags=["achievements"])
 
 
+# Batch routes are declared first so "/batch" is not parsed as a date or id
+@router.post("/batch", response_model=List[AchievementResponse], status_code=status.HTTP_201_CREATED)
+def create_achievements_batch(
+    achievements: List[AchievementCreate],
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Create many achievements in one transaction"""
+    return bulk_create(db, Achievement, current_user.id, achievements, AchievementResponse)
+
+
+@router.patch("/batch", response_model=List[AchievementResponse])
+def update_achievements_batch(
+    achievements: List[AchievementBatchUpdate],
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Update many achievements (by id) in one transaction"""
+    return bulk_update(db, Achievement, current_user.id, achievements, AchievementResponse)
+
+
+@router.delete("/batch", response_model=BatchDeleteResponse)
+def delete_achievements_batch(
+    ids: List[int] = Body(...),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Delete many achievements (by id) in one transaction"""
+    return {"deleted": bulk_delete(db, Achievement, current_user.id, ids)}
+
+
+@router.get("", response_model=AchievementListResponse)
+def list_achievements(
+    completed: Optional[bool] = Query(None),
+    start: Optional[date] = Query(None, description="Only achievements on or after this date"),
+    end: Optional[date] = Query(None, description="Only achievements on or before this date"),
+    order: SortOrder = Query(SortOrder.asc),
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
+):
+    """List achievements ordered by (date, id) with keyset pagination"""
+    stmt = list_statement(
+        Achievement, current_user.id, limit, order, cursor,
+        completed=completed, start=start, end=end
+    )
+    return page(db.scalars(stmt).all(), limit, AchievementResponse)
+
+
 @router.post("/{day_date}", response_model=AchievementResponse, status_code=status.HTTP_201_CREATED)
 def create_achievement(
     day_date: date,
@@ -43,8 +102,11 @@ def update_achievement(
     """Update an achievement"""
     db_achievement = db.query(Achievement).filter(
         Achievement.id == achievement_id,
-        Achievement.user_id == current_user.id
+        Achievement.user_id == current_user.id,
+        live(Achievement)
     ).first()
+    if not db_achievement and thaw(db.connection(), Achievement, achievement_id, current_user.id):
+        db_achievement = db.get(Achievement, achievement_id)
     
     if not db_achievement:
         raise HTTPException(
@@ -68,11 +130,14 @@ def delete_achievement(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Delete an achievement"""
+    """Delete an achievement; it can be restored until it is purged"""
     db_achievement = db.query(Achievement).filter(
         Achievement.id == achievement_id,
-        Achievement.user_id == current_user.id
+        Achievement.user_id == current_user.id,
+        live(Achievement)
     ).first()
+    if not db_achievement and thaw(db.connection(), Achievement, achievement_id, current_user.id):
+        db_achievement = db.get(Achievement, achievement_id)
     
     if not db_achievement:
         raise HTTPException(
@@ -80,8 +145,34 @@ def delete_achievement(
             detail="Achievement not found"
         )
     
-    db.delete(db_achievement)
+    db_achievement.deleted_at = datetime.utcnow()
     db.commit()
     
     return None
 
+
+@router.post("/{achievement_id}/restore", response_model=AchievementResponse)
+def restore_achievement(
+    achievement_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Undo the deletion of an achievement"""
+    db_achievement = db.query(Achievement).filter(
+        Achievement.id == achievement_id,
+        Achievement.user_id == current_user.id,
+        deleted(Achievement)
+    ).first()
+    
+    if not db_achievement:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Deleted achievement not found"
+        )
+    
+    db_achievement.deleted_at = None
+    db.commit()
+    db.refresh(db_achievement)
+    
+    return db_achievement
+
@@ -0,0 +1 @@
+# Async API routes, used when DATABASE_URL selects an async driver
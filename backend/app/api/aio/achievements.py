@@ -0,0 +1,175 @@
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import date, datetime
+from typing import List, Optional
+
+from app.core.database import get_async_db
+from app.core.replicas import get_async_read_db
+from app.api.aio.dependencies import get_current_user
+from app.api.batch import bulk_create_async, bulk_update_async, bulk_delete_async
+from app.api.listing import SortOrder, list_statement, page
+from app.archive import thaw
+from app.models import User, Achievement
+from app.tombstones import live, deleted
+from app.schemas import (
+    AchievementCreate, AchievementUpdate, AchievementBatchUpdate, AchievementResponse, AchievementListResponse,
+    BatchDeleteResponse
+)
+
+router = APIRouter(prefix="/api/achievements", tags=["achievements"])
+
+
+async def _get_owned_achievement(db: AsyncSession, achievement_id: int, user_id: int) -> Achievement:
+    result = await db.execute(
+        select(Achievement).where(
+            Achievement.id == achievement_id,
+            Achievement.user_id == user_id,
+            live(Achievement)
+        )
+    )
+    db_achievement = result.scalars().first()
+    if not db_achievement and await (await db.connection()).run_sync(thaw, Achievement, achievement_id, user_id):
+        db_achievement = await db.get(Achievement, achievement_id)
+    if not db_achievement:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Achievement not found"
+        )
+    return db_achievement
+
+
+# Batch routes are declared first so "/batch" is not parsed as a date or id
+@router.post("/batch", response_model=List[AchievementResponse], status_code=status.HTTP_201_CREATED)
+async def create_achievements_batch(
+    achievements: List[AchievementCreate],
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Create many achievements in one transaction"""
+    return await bulk_create_async(db, Achievement, current_user.id, achievements, AchievementResponse)
+
+
+@router.patch("/batch", response_model=List[AchievementResponse])
+async def update_achievements_batch(
+    achievements: List[AchievementBatchUpdate],
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Update many achievements (by id) in one transaction"""
+    return await bulk_update_async(db, Achievement, current_user.id, achievements, AchievementResponse)
+
+
+@router.delete("/batch", response_model=BatchDeleteResponse)
+async def delete_achievements_batch(
+    ids: List[int] = Body(...),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Delete many achievements (by id) in one transaction"""
+    return {"deleted": await bulk_delete_async(db, Achievement, current_user.id, ids)}
+
+
+@router.get("", response_model=AchievementListResponse)
+async def list_achievements(
+    completed: Optional[bool] = Query(None),
+    start: Optional[date] = Query(None, description="Only achievements on or after this date"),
+    end: Optional[date] = Query(None, description="Only achievements on or before this date"),
+    order: SortOrder = Query(SortOrder.asc),
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """List achievements ordered by (date, id) with keyset pagination"""
+    stmt = list_statement(
+        Achievement, current_user.id, limit, order, cursor,
+        completed=completed, start=start, end=end
+    )
+    return page((await db.scalars(stmt)).all(), limit, AchievementResponse)
+
+
+@router.post("/{day_date}", response_model=AchievementResponse, status_code=status.HTTP_201_CREATED)
+async def create_achievement(
+    day_date: date,
+    achievement: AchievementCreate,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Create a new achievement for a specific date"""
+    db_achievement = Achievement(
+        user_id=current_user.id,
+        title=achievement.title,
+        notes=achievement.notes,
+        date=day_date,
+        completed=achievement.completed
+    )
+    
+    db.add(db_achievement)
+    await db.commit()
+    await db.refresh(db_achievement)
+    
+    return db_achievement
+
+
+@router.patch("/{achievement_id}", response_model=AchievementResponse)
+async def update_achievement(
+    achievement_id: int,
+    achievement_update: AchievementUpdate,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Update an achievement"""
+    db_achievement = await _get_owned_achievement(db, achievement_id, current_user.id)
+    
+    update_data = achievement_update.model_dump(exclude_unset=True)
+    for field, value in update_data.items():
+        setattr(db_achievement, field, value)
+    
+    await db.commit()
+    await db.refresh(db_achievement)
+    
+    return db_achievement
+
+
+@router.delete("/{achievement_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_achievement(
+    achievement_id: int,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Delete an achievement; it can be restored until it is purged"""
+    db_achievement = await _get_owned_achievement(db, achievement_id, current_user.id)
+    
+    db_achievement.deleted_at = datetime.utcnow()
+    await db.commit()
+    
+    return None
+
+
+@router.post("/{achievement_id}/restore", response_model=AchievementResponse)
+async def restore_achievement(
+    achievement_id: int,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Undo the deletion of an achievement"""
+    result = await db.execute(
+        select(Achievement).where(
+            Achievement.id == achievement_id,
+            Achievement.user_id == current_user.id,
+            deleted(Achievement)
+        )
+    )
+    db_achievement = result.scalars().first()
+    if not db_achievement:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Deleted achievement not found"
+        )
+    
+    db_achievement.deleted_at = None
+    await db.commit()
+    await db.refresh(db_achievement)
+    
+    return db_achievement
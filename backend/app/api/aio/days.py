@@ -0,0 +1,87 @@
+from fastapi import APIRouter, Depends, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import date
+from typing import Optional
+
+from app.core.replicas import get_async_read_db
+from app.api.aio.dependencies import get_current_user
+from app.api.days import (
+    ACHIEVEMENT_FIELDS, TODO_FIELDS, validate_day_range, rows_statement, render_day, render_range, json_response,
+)
+from app.archive import cold_tables, with_archives
+from app.api.etag import day_etag, day_version_statement, etag_matches, not_modified
+from app.day_cache import get_day_view_async
+from app.models import User, Achievement, Todo
+from app.recurrence import expand, overrides_statement, rules_statement
+from app.schemas import DayViewResponse, DayRangeResponse
+
+router = APIRouter(prefix="/api/days", tags=["days"])
+
+
+async def load_rows(db: AsyncSession, model, fields, user_id: int, start: date, end: date,
+                    archived_before: Optional[date] = None) -> list:
+    stmt = rows_statement(model, fields, user_id, start, end)
+    if archived_before is not None:
+        connection = await db.connection()
+        tables = await connection.run_sync(cold_tables, model, start, end, archived_before)
+        stmt = with_archives(stmt, tables, fields, user_id, start, end)
+    return (await db.execute(stmt)).all()
+
+
+@router.get("", response_model=DayRangeResponse)
+async def get_day_range(
+    request: Request,
+    start: date = Query(..., description="First day of the range (inclusive)"),
+    end: date = Query(..., description="Last day of the range (inclusive)"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """Get achievements and todos for every day between start and end"""
+    validate_day_range(start, end)
+    
+    version = tuple((await db.execute(day_version_statement(current_user.id, start, end))).one())
+    etag = day_etag(current_user.id, start, end, version)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    
+    achievements = await load_rows(db, Achievement, ACHIEVEMENT_FIELDS, current_user.id, start, end, version[2])
+    todos = await load_rows(db, Todo, TODO_FIELDS, current_user.id, start, end, version[2])
+    recurring = await load_occurrences(db, current_user.id, start, end, rules_version=version[1])
+    
+    return json_response(render_range(start, end, achievements, todos, recurring), etag)
+
+
+async def load_occurrences(db: AsyncSession, user_id: int, start: date, end: date, rules_version: int) -> list:
+    if not rules_version:
+        return []
+    rules = (await db.execute(rules_statement(user_id, start, end))).all()
+    if not rules:
+        return []
+    overrides = (await db.execute(overrides_statement(user_id, start, end))).all()
+    return expand(rules, overrides, start, end)
+
+
+async def load_day(db: AsyncSession, user_id: int, day_date: date, rules_version: int,
+                   archived_before: Optional[date] = None) -> bytes:
+    achievements = await load_rows(db, Achievement, ACHIEVEMENT_FIELDS, user_id, day_date, day_date, archived_before)
+    todos = await load_rows(db, Todo, TODO_FIELDS, user_id, day_date, day_date, archived_before)
+    recurring = await load_occurrences(db, user_id, day_date, day_date, rules_version)
+    return render_day(day_date, achievements, todos, recurring)
+
+
+@router.get("/{day_date}", response_model=DayViewResponse)
+async def get_day(
+    day_date: date,
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """Get achievements and todos for a specific date"""
+    version = tuple((await db.execute(day_version_statement(current_user.id, day_date, day_date))).one())
+    etag = day_etag(current_user.id, day_date, day_date, version)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    
+    body = await get_day_view_async(current_user.id, day_date, version,
+                                    lambda: load_day(db, current_user.id, day_date, version[1], version[2]))
+    return json_response(body, etag)
@@ -0,0 +1,55 @@
+from fastapi import Depends, HTTPException, status
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.replicas import get_async_read_db, primary_session
+from app.core.security import decode_access_token_cached
+from app.api.dependencies import security, user_cache
+from app.models import User
+
+
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_read_db)
+) -> User:
+    """Get current authenticated user from JWT token (async session)"""
+    token = credentials.credentials
+    payload = decode_access_token_cached(token)
+    
+    if payload is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    email: str = payload.get("sub")
+    if email is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    user = user_cache.get(email)
+    if user is not None:
+        return user
+    
+    result = await db.execute(select(User).where(User.email == email))
+    user = result.scalars().first()
+    if user is None and primary_session(db) is not db:
+        # Registered moments ago and not replicated yet
+        db = primary_session(db)
+        user = (await db.execute(select(User).where(User.email == email))).scalars().first()
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    db.expunge(user)
+    user_cache.set(email, user)
+    
+    return user
@@ -0,0 +1,170 @@
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import date, datetime
+from typing import List, Optional
+
+from app.core.database import get_async_db
+from app.core.replicas import get_async_read_db
+from app.api.aio.dependencies import get_current_user
+from app.api.batch import bulk_create_async, bulk_update_async, bulk_delete_async
+from app.api.listing import SortOrder, list_statement, page
+from app.archive import thaw
+from app.models import User, Todo
+from app.tombstones import live, deleted
+from app.schemas import (
+    TodoCreate, TodoUpdate, TodoBatchUpdate, TodoResponse, TodoListResponse,
+    BatchDeleteResponse
+)
+
+router = APIRouter(prefix="/api/todos", tags=["todos"])
+
+
+async def _get_owned_todo(db: AsyncSession, todo_id: int, user_id: int) -> Todo:
+    result = await db.execute(
+        select(Todo).where(Todo.id == todo_id, Todo.user_id == user_id, live(Todo))
+    )
+    db_todo = result.scalars().first()
+    if not db_todo and await (await db.connection()).run_sync(thaw, Todo, todo_id, user_id):
+        db_todo = await db.get(Todo, todo_id)
+    if not db_todo:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Todo not found"
+        )
+    return db_todo
+
+
+# Batch routes are declared first so "/batch" is not parsed as a date or id
+@router.post("/batch", response_model=List[TodoResponse], status_code=status.HTTP_201_CREATED)
+async def create_todos_batch(
+    todos: List[TodoCreate],
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Create many todos in one transaction"""
+    return await bulk_create_async(db, Todo, current_user.id, todos, TodoResponse)
+
+
+@router.patch("/batch", response_model=List[TodoResponse])
+async def update_todos_batch(
+    todos: List[TodoBatchUpdate],
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Update many todos (by id) in one transaction"""
+    return await bulk_update_async(db, Todo, current_user.id, todos, TodoResponse)
+
+
+@router.delete("/batch", response_model=BatchDeleteResponse)
+async def delete_todos_batch(
+    ids: List[int] = Body(...),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Delete many todos (by id) in one transaction"""
+    return {"deleted": await bulk_delete_async(db, Todo, current_user.id, ids)}
+
+
+@router.get("", response_model=TodoListResponse)
+async def list_todos(
+    completed: Optional[bool] = Query(None),
+    priority: Optional[str] = Query(None),
+    start: Optional[date] = Query(None, description="Only todos on or after this date"),
+    end: Optional[date] = Query(None, description="Only todos on or before this date"),
+    order: SortOrder = Query(SortOrder.asc),
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """List todos ordered by (date, id) with keyset pagination"""
+    stmt = list_statement(
+        Todo, current_user.id, limit, order, cursor,
+        completed=completed, start=start, end=end, priority=priority
+    )
+    return page((await db.scalars(stmt)).all(), limit, TodoResponse)
+
+
+@router.post("/{day_date}", response_model=TodoResponse, status_code=status.HTTP_201_CREATED)
+async def create_todo(
+    day_date: date,
+    todo: TodoCreate,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Create a new todo for a specific date"""
+    db_todo = Todo(
+        user_id=current_user.id,
+        title=todo.title,
+        notes=todo.notes,
+        date=day_date,
+        completed=todo.completed,
+        priority=todo.priority,
+        due_time=todo.due_time
+    )
+    
+    db.add(db_todo)
+    await db.commit()
+    await db.refresh(db_todo)
+    
+    return db_todo
+
+
+@router.patch("/{todo_id}", response_model=TodoResponse)
+async def update_todo(
+    todo_id: int,
+    todo_update: TodoUpdate,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Update a todo"""
+    db_todo = await _get_owned_todo(db, todo_id, current_user.id)
+    
+    update_data = todo_update.model_dump(exclude_unset=True)
+    for field, value in update_data.items():
+        setattr(db_todo, field, value)
+    
+    await db.commit()
+    await db.refresh(db_todo)
+    
+    return db_todo
+
+
+@router.delete("/{todo_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_todo(
+    todo_id: int,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Delete a todo; it can be restored until it is purged"""
+    db_todo = await _get_owned_todo(db, todo_id, current_user.id)
+    
+    db_todo.deleted_at = datetime.utcnow()
+    await db.commit()
+    
+    return None
+
+
+@router.post("/{todo_id}/restore", response_model=TodoResponse)
+async def restore_todo(
+    todo_id: int,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Undo the deletion of a todo"""
+    result = await db.execute(
+        select(Todo).where(Todo.id == todo_id, Todo.user_id == current_user.id, deleted(Todo))
+    )
+    db_todo = result.scalars().first()
+    if not db_todo:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Deleted todo not found"
+        )
+    
+    db_todo.deleted_at = None
+    await db.commit()
+    await db.refresh(db_todo)
+    
+    return db_todo
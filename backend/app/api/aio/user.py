@@ -0,0 +1,45 @@
+from fastapi import APIRouter, Depends, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_async_db
+from app.api.aio.dependencies import get_current_user
+from app.api.dependencies import invalidate_user
+from app.api.etag import conditional, user_etag
+from app.models import User
+from app.schemas import UserResponse, UserUpdate
+
+router = APIRouter(prefix="/api/user", tags=["user"])
+
+
+@router.get("/me", response_model=UserResponse)
+async def get_current_user_info(
+    request: Request,
+    response: Response,
+    current_user: User = Depends(get_current_user)
+):
+    """Get current user profile"""
+    not_modified = conditional(request, response, user_etag(current_user))
+    if not_modified is not None:
+        return not_modified
+    
+    return current_user
+
+
+@router.patch("/me", response_model=UserResponse)
+async def update_current_user(
+    user_update: UserUpdate,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Update current user profile (quote, name, avatar)"""
+    update_data = user_update.model_dump(exclude_unset=True)
+    
+    db_user = await db.get(User, current_user.id)
+    for field, value in update_data.items():
+        setattr(db_user, field, value)
+    
+    await db.commit()
+    await db.refresh(db_user)
+    invalidate_user(db_user.email)
+    
+    return db_user
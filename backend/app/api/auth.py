@@ -1,20 +1,36 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from datetime import timedelta
 
 from app.core.database import get_db
-from app.core.security import verify_password, get_password_hash, create_access_token
+from app.core.security import (
+    verify_password, get_password_hash, needs_rehash, create_access_token, password_pool
+)
 from app.core.config import settings
+from app.api.dependencies import invalidate_user
 from app.models import User
 from app.schemas import LoginRequest, Token, UserResponse, UserCreate
 
 router = APIRouter(prefix="/api/auth", tags=["auth"])
 
 
+def find_user(db: Session, email: str):
+    return db.query(User).filter(User.email == email).first()
+
+
+def save_user(db: Session, user: User) -> None:
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+
+
+# The handlers are async so bcrypt waits on password_pool without holding a
+# request threadpool slot; their session work still runs in the threadpool
 @router.post("/login", response_model=Token)
-def login(login_data: LoginRequest, db: Session = Depends(get_db)):
+async def login(login_data: LoginRequest, db: Session = Depends(get_db)):
     """Demo login - accepts any password for demo user"""
-    user = db.query(User).filter(User.email == login_data.email).first()
+    user = await run_in_threadpool(find_user, db, login_data.email)
     
     # Demo mode: if user exists, allow any password
     # In production, use: if not user or not verify_password(login_data.password, user.hashed_password)
@@ -29,6 +45,14 @@ def login(login_data: LoginRequest, db: Session = Depends(get_db)):
     # if not verify_password(login_data.password, user.hashed_password):
     #     raise HTTPException(...)
     
+    # Upgrade hashes made with a different bcrypt cost than BCRYPT_ROUNDS
+    if needs_rehash(user.hashed_password) and await password_pool.run_async(
+        verify_password, login_data.password, user.hashed_password
+    ):
+        user.hashed_password = await password_pool.run_async(get_password_hash, login_data.password)
+        await run_in_threadpool(db.commit)
+        invalidate_user(user.email)
+    
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
         data={"sub": user.email}, expires_delta=access_token_expires
@@ -38,16 +62,15 @@ def login(login_data: LoginRequest, db: Session = Depends(get_db)):
 
 
 @router.post("/register", response_model=UserResponse)
-def register(user_data: UserCreate, db: Session = Depends(get_db)):
+async def register(user_data: UserCreate, db: Session = Depends(get_db)):
     """Register a new user (demo endpoint)"""
-    existing_user = db.query(User).filter(User.email == user_data.email).first()
-    if existing_user:
+    if await run_in_threadpool(find_user, db, user_data.email):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
     
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await password_pool.run_async(get_password_hash, user_data.password)
     db_user = User(
         email=user_data.email,
         hashed_password=hashed_password,
@@ -56,9 +79,7 @@ def register(user_data: UserCreate, db: Session = Depends(get_db)):
         quote=user_data.quote or ""
     )
     
-    db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await run_in_threadpool(save_user, db, db_user)
     
     return db_user
 
@@ -0,0 +1,202 @@
+"""
+Shared implementation of the /batch endpoints for todos and achievements.
+
+Each batch runs in one transaction: rows are written with a single bulk
+INSERT ... RETURNING, UPDATE-by-primary-key executemany or a soft-deleting
+UPDATE ... IN (see app.tombstones), and ownership of every id is checked with one SELECT up front. Bulk
+statements bypass the ORM flush, so DailySummary deltas, change feed
+events and sync log entries are recorded here.
+"""
+from datetime import datetime
+from typing import List, Sequence, Type
+
+from fastapi import HTTPException, status
+from pydantic import BaseModel
+from sqlalchemy import insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.changes import deleted_item, record_changes
+from app.core.config import settings
+from app.summaries import TRACKED_FIELDS, add_row, apply_deltas, new_deltas
+from app.sync import log_rows
+from app.tombstones import live
+
+
+def check_batch_size(count: int) -> None:
+    if count > settings.MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.MAX_BATCH_SIZE} items per batch"
+        )
+
+
+def _check_unique(ids: Sequence[int]) -> None:
+    if len(set(ids)) != len(ids):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Duplicate ids in batch"
+        )
+
+
+def _check_found(model, ids: Sequence[int], found: Sequence[int]) -> None:
+    missing = sorted(set(ids) - set(found))
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"{model.__name__} not found: {missing}"
+        )
+
+
+def _insert_rows(user_id: int, items: Sequence[BaseModel]) -> List[dict]:
+    return [dict(item.model_dump(), user_id=user_id) for item in items]
+
+
+def _update_rows(items: Sequence[BaseModel]) -> List[dict]:
+    rows = [dict(item.model_dump(exclude_unset=True, exclude={"id"}), id=item.id) for item in items]
+    # Rows with the same columns are sent as one executemany
+    return sorted(rows, key=lambda row: sorted(row))
+
+
+def _owned_rows(model, user_id: int, ids: Sequence[int]):
+    """Ownership check that also returns the fields DailySummary depends on"""
+    columns = [getattr(model, name) for name in TRACKED_FIELDS if hasattr(model, name)]
+    return select(model.id, *columns).where(model.user_id == user_id, model.id.in_(ids), live(model))
+
+
+def _soft_delete(model, user_id: int, ids: Sequence[int]):
+    return update(model).where(model.user_id == user_id, model.id.in_(ids)).values(deleted_at=datetime.utcnow())
+
+
+def _summary_deltas(model, removed=(), added=()):
+    """DailySummary changes for removed (SELECTed rows) and added (dicts) rows"""
+    deltas = new_deltas()
+    for row in removed:
+        add_row(deltas, model, row._mapping, sign=-1)
+    for row in added:
+        add_row(deltas, model, row)
+    return deltas
+
+
+def _tracked(obj) -> dict:
+    return {name: getattr(obj, name, None) for name in TRACKED_FIELDS}
+
+
+def _dumped(result: Sequence[BaseModel]) -> List[dict]:
+    return [item.model_dump(mode="json") for item in result]
+
+
+def _in_request_order(rows, ids: Sequence[int], response_model: Type[BaseModel]) -> list:
+    by_id = {row.id: row for row in rows}
+    return [response_model.model_validate(by_id[i]) for i in ids]
+
+
+def bulk_create(db: Session, model, user_id: int, items: Sequence[BaseModel],
+                response_model: Type[BaseModel]) -> list:
+    """Insert all items in one statement and return them as response models"""
+    check_batch_size(len(items))
+    if not items:
+        return []
+    rows = _insert_rows(user_id, items)
+    created = db.scalars(insert(model).returning(model), rows).all()
+    apply_deltas(db.connection(), _summary_deltas(model, added=rows))
+    # Serialize before commit expires the instances
+    result = [response_model.model_validate(row) for row in created]
+    record_changes(db, model, user_id, "created", _dumped(result))
+    log_rows(db.connection(), model, user_id, [row.id for row in result])
+    db.commit()
+    return result
+
+
+def bulk_update(db: Session, model, user_id: int, items: Sequence[BaseModel],
+                response_model: Type[BaseModel]) -> list:
+    """Apply partial updates to owned rows by primary key"""
+    check_batch_size(len(items))
+    ids = [item.id for item in items]
+    _check_unique(ids)
+    if not ids:
+        return []
+    owned = db.execute(_owned_rows(model, user_id, ids)).all()
+    _check_found(model, ids, [row.id for row in owned])
+    
+    db.execute(update(model), _update_rows(items))
+    rows = db.scalars(
+        select(model).where(model.id.in_(ids)).execution_options(populate_existing=True)
+    ).all()
+    apply_deltas(db.connection(), _summary_deltas(model, owned, [_tracked(row) for row in rows]))
+    result = _in_request_order(rows, ids, response_model)
+    record_changes(db, model, user_id, "updated", _dumped(result))
+    log_rows(db.connection(), model, user_id, ids)
+    db.commit()
+    return result
+
+
+def bulk_delete(db: Session, model, user_id: int, ids: Sequence[int]) -> int:
+    """Soft-delete owned rows; fails without deleting anything if any id is unknown"""
+    check_batch_size(len(ids))
+    _check_unique(ids)
+    if not ids:
+        return 0
+    owned = db.execute(_owned_rows(model, user_id, ids)).all()
+    _check_found(model, ids, [row.id for row in owned])
+    
+    db.execute(_soft_delete(model, user_id, ids), execution_options={"synchronize_session": False})
+    apply_deltas(db.connection(), _summary_deltas(model, removed=owned))
+    record_changes(db, model, user_id, "deleted", [deleted_item(row) for row in owned])
+    log_rows(db.connection(), model, user_id, ids, deleted=True)
+    db.commit()
+    return len(ids)
+
+
+async def bulk_create_async(db: AsyncSession, model, user_id: int, items: Sequence[BaseModel],
+                            response_model: Type[BaseModel]) -> list:
+    check_batch_size(len(items))
+    if not items:
+        return []
+    rows = _insert_rows(user_id, items)
+    created = (await db.scalars(insert(model).returning(model), rows)).all()
+    await (await db.connection()).run_sync(apply_deltas, _summary_deltas(model, added=rows))
+    result = [response_model.model_validate(row) for row in created]
+    record_changes(db.sync_session, model, user_id, "created", _dumped(result))
+    await (await db.connection()).run_sync(log_rows, model, user_id, [row.id for row in result])
+    await db.commit()
+    return result
+
+
+async def bulk_update_async(db: AsyncSession, model, user_id: int, items: Sequence[BaseModel],
+                            response_model: Type[BaseModel]) -> list:
+    check_batch_size(len(items))
+    ids = [item.id for item in items]
+    _check_unique(ids)
+    if not ids:
+        return []
+    owned = (await db.execute(_owned_rows(model, user_id, ids))).all()
+    _check_found(model, ids, [row.id for row in owned])
+    
+    await db.execute(update(model), _update_rows(items))
+    rows = (await db.scalars(
+        select(model).where(model.id.in_(ids)).execution_options(populate_existing=True)
+    )).all()
+    deltas = _summary_deltas(model, owned, [_tracked(row) for row in rows])
+    await (await db.connection()).run_sync(apply_deltas, deltas)
+    result = _in_request_order(rows, ids, response_model)
+    record_changes(db.sync_session, model, user_id, "updated", _dumped(result))
+    await (await db.connection()).run_sync(log_rows, model, user_id, ids)
+    await db.commit()
+    return result
+
+
+async def bulk_delete_async(db: AsyncSession, model, user_id: int, ids: Sequence[int]) -> int:
+    check_batch_size(len(ids))
+    _check_unique(ids)
+    if not ids:
+        return 0
+    owned = (await db.execute(_owned_rows(model, user_id, ids))).all()
+    _check_found(model, ids, [row.id for row in owned])
+    
+    await db.execute(_soft_delete(model, user_id, ids), execution_options={"synchronize_session": False})
+    await (await db.connection()).run_sync(apply_deltas, _summary_deltas(model, removed=owned))
+    record_changes(db.sync_session, model, user_id, "deleted", [deleted_item(row) for row in owned])
+    await (await db.connection()).run_sync(log_rows, model, user_id, ids, True)
+    await db.commit()
+    return len(ids)
@@ -1,35 +1,141 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from datetime import date
+from datetime import date, timedelta
+from typing import Optional
+import orjson
 
-from app.core.database import get_db
+from app.core.config import settings
+from app.core.replicas import get_read_db
 from app.api.dependencies import get_current_user
+from app.archive import cold_tables, with_archives
+from app.api.etag import day_etag, day_version_statement, etag_matches, not_modified
+from app.core.metrics import timed_serialization
+from app.day_cache import get_day_view
 from app.models import User, Achievement, Todo
-from app.schemas import DayViewResponse, AchievementResponse, TodoResponse
+from app.recurrence import load_occurrences
+from app.tombstones import live
+from app.schemas import DayViewResponse, DayRangeResponse, AchievementResponse, TodoResponse
 
 router = APIRouter(prefix="/api/days", tags=["days"])
 
+# Day views select exactly the response fields and render them with orjson.
+# The columns are typed by the model, so the rows need no Pydantic round trip;
+# response_model stays on the routes for the OpenAPI schema only.
+ACHIEVEMENT_FIELDS = tuple(AchievementResponse.model_fields)
+TODO_FIELDS = tuple(TodoResponse.model_fields)
+
+
+def validate_day_range(start: date, end: date) -> None:
+    """Reject inverted or overly long ranges"""
+    if end < start:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="end must not be before start"
+        )
+    if (end - start).days + 1 > settings.MAX_DAY_RANGE_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Range may span at most {settings.MAX_DAY_RANGE_DAYS} days"
+        )
+
+
+def rows_statement(model, fields, user_id: int, start: date, end: date):
+    """The response columns of the owner's live rows in the range, in (date, id) order"""
+    return select(*(getattr(model, name) for name in fields)).where(
+        model.user_id == user_id,
+        model.date >= start,
+        model.date <= end,
+        live(model)
+    ).order_by(model.date, model.id)
+
+
+def load_rows(db: Session, model, fields, user_id: int, start: date, end: date,
+              archived_before: Optional[date] = None) -> list:
+    """The range's rows, including archived ones for days before archived_before"""
+    stmt = rows_statement(model, fields, user_id, start, end)
+    if archived_before is not None:
+        tables = cold_tables(db.connection(), model, start, end, archived_before)
+        stmt = with_archives(stmt, tables, fields, user_id, start, end)
+    return db.execute(stmt).all()
+
+
+def render_day(day_date: date, achievements, todos, recurring=()) -> bytes:
+    """DayViewResponse JSON built directly from column tuples (and occurrence dicts)"""
+    with timed_serialization():
+        return orjson.dumps({
+            "date": day_date,
+            "achievements": [dict(zip(ACHIEVEMENT_FIELDS, row)) for row in achievements],
+            "todos": [dict(zip(TODO_FIELDS, row)) for row in todos],
+            "recurring": list(recurring),
+        })
+
+
+def render_range(start: date, end: date, achievements, todos, recurring=()) -> bytes:
+    """DayRangeResponse JSON with one entry per day, from date-ordered column tuples"""
+    with timed_serialization():
+        days = {}
+        for offset in range((end - start).days + 1):
+            day = start + timedelta(days=offset)
+            days[day.isoformat()] = {"date": day, "achievements": [], "todos": [], "recurring": []}
+        for row in achievements:
+            days[row.date.isoformat()]["achievements"].append(dict(zip(ACHIEVEMENT_FIELDS, row)))
+        for row in todos:
+            days[row.date.isoformat()]["todos"].append(dict(zip(TODO_FIELDS, row)))
+        for occurrence in recurring:
+            days[occurrence["date"].isoformat()]["recurring"].append(occurrence)
+        
+        return orjson.dumps({"start": start, "end": end, "days": days})
+
+
+def json_response(body: bytes, etag: str) -> Response:
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
+
+@router.get("", response_model=DayRangeResponse)
+def get_day_range(
+    request: Request,
+    start: date = Query(..., description="First day of the range (inclusive)"),
+    end: date = Query(..., description="Last day of the range (inclusive)"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
+):
+    """Get achievements and todos for every day between start and end"""
+    validate_day_range(start, end)
+    
+    version = tuple(db.execute(day_version_statement(current_user.id, start, end)).one())
+    etag = day_etag(current_user.id, start, end, version)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    
+    achievements = load_rows(db, Achievement, ACHIEVEMENT_FIELDS, current_user.id, start, end, version[2])
+    todos = load_rows(db, Todo, TODO_FIELDS, current_user.id, start, end, version[2])
+    recurring = load_occurrences(db, current_user.id, start, end, rules_version=version[1])
+    
+    return json_response(render_range(start, end, achievements, todos, recurring), etag)
+
+
+def load_day(db: Session, user_id: int, day_date: date, rules_version: int,
+             archived_before: Optional[date] = None) -> bytes:
+    achievements = load_rows(db, Achievement, ACHIEVEMENT_FIELDS, user_id, day_date, day_date, archived_before)
+    todos = load_rows(db, Todo, TODO_FIELDS, user_id, day_date, day_date, archived_before)
+    recurring = load_occurrences(db, user_id, day_date, day_date, rules_version)
+    return render_day(day_date, achievements, todos, recurring)
+
 
 @router.get("/{day_date}", response_model=DayViewResponse)
 def get_day(
     day_date: date,
+    request: Request,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get achievements and todos for a specific date"""
-    achievements = db.query(Achievement).filter(
-        Achievement.user_id == current_user.id,
-        Achievement.date == day_date
-    ).all()
-    
-    todos = db.query(Todo).filter(
-        Todo.user_id == current_user.id,
-        Todo.date == day_date
-    ).all()
+    version = tuple(db.execute(day_version_statement(current_user.id, day_date, day_date)).one())
+    etag = day_etag(current_user.id, day_date, day_date, version)
+    if etag_matches(request, etag):
+        return not_modified(etag)
     
-    return DayViewResponse(
-        date=day_date,
-        achievements=[AchievementResponse.model_validate(a) for a in achievements],
-        todos=[TodoResponse.model_validate(t) for t in todos]
-    )
-
+    body = get_day_view(current_user.id, day_date, version,
+                        lambda: load_day(db, current_user.id, day_date, version[1], version[2]))
+    return json_response(body, etag)
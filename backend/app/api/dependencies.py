@@ -1,21 +1,64 @@
+import hmac
+from typing import Optional
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 
-from app.core.database import get_db
-from app.core.security import decode_access_token
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.replicas import get_read_db, primary_session
+from app.core.security import decode_access_token_cached, token_cache
 from app.models import User
 
 security = HTTPBearer()
+stats_security = HTTPBearer(auto_error=False)
+
+# Detached User rows keyed by token subject (email)
+user_cache = TTLCache(
+    max_size=settings.USER_CACHE_MAX_SIZE,
+    ttl_seconds=settings.AUTH_CACHE_TTL_SECONDS,
+)
+
+
+def invalidate_user(email: str) -> None:
+    """Drop a cached user so the next request reloads it from the database"""
+    user_cache.delete(email)
+
+
+def auth_cache_stats() -> dict:
+    """Hit/miss counters of the token and user caches"""
+    return {"tokens": token_cache.stats(), "users": user_cache.stats()}
+
+
+def require_stats_token(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(stats_security)
+) -> None:
+    """Let only holders of STATS_TOKEN read the operational stats"""
+    if not settings.STATS_TOKEN:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Not Found"
+        )
+    if credentials is None or not hmac.compare_digest(credentials.credentials, settings.STATS_TOKEN):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid stats token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
 
 
 def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ) -> User:
-    """Get current authenticated user from JWT token"""
+    """Get current authenticated user from JWT token
+    
+    The returned user is detached from the session; handlers that modify it
+    must reload it first (see ``update_current_user``).
+    """
     token = credentials.credentials
-    payload = decode_access_token(token)
+    payload = decode_access_token_cached(token)
     
     if payload is None:
         raise HTTPException(
@@ -32,7 +75,15 @@ def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    user = user_cache.get(email)
+    if user is not None:
+        return user
+    
     user = db.query(User).filter(User.email == email).first()
+    if user is None and primary_session(db) is not db:
+        # Registered moments ago and not replicated yet
+        db = primary_session(db)
+        user = db.query(User).filter(User.email == email).first()
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -40,5 +91,7 @@ def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    db.expunge(user)
+    user_cache.set(email, user)
+    
     return user
-
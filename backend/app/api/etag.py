@@ -0,0 +1,68 @@
+"""
+Strong ETags and If-None-Match handling for polled read endpoints.
+
+Day views are tagged with DailySummary.version, which app.summaries bumps
+on every insert, update and delete of the day's achievements and todos
+(and app.recurrence on occurrence overrides), together with the user's
+recurrence_version, bumped whenever a recurrence rule changes. Versions
+only grow, so their sum over a range changes whenever any day in it does.
+The user's archived_before, which moves when app.archive moves rows to cold
+storage, completes the version and tells the day routes where to read.
+All are read with one query before the payload, so a matching request is
+answered with 304 without loading or serializing any rows.
+"""
+import hashlib
+from datetime import date
+from typing import Optional, Tuple
+
+from fastapi import Request, Response, status
+from sqlalchemy import func, select
+
+from app.models import DailySummary, User
+
+
+def make_etag(*parts) -> str:
+    """Quoted strong ETag for the given version parts"""
+    digest = hashlib.sha1(repr(parts).encode()).hexdigest()[:32]
+    return f'"{digest}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Whether If-None-Match lists this ETag (weak comparison, per RFC 9110)"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in header.split(",")]
+    return etag in (tag[2:] if tag.startswith("W/") else tag for tag in candidates)
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+
+def conditional(request: Request, response: Response, etag: str) -> Optional[Response]:
+    """Return a 304 when the client copy is current, else tag the 200 response"""
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+    return None
+
+
+def day_version_statement(user_id: int, start: date, end: date):
+    """(sum of the DailySummary versions over the days, the user's recurrence version, archived_before)"""
+    days = select(func.coalesce(func.sum(DailySummary.version), 0)).where(
+        DailySummary.user_id == user_id,
+        DailySummary.date >= start,
+        DailySummary.date <= end
+    ).scalar_subquery()
+    return select(days, User.recurrence_version, User.archived_before).where(User.id == user_id)
+
+
+def day_etag(user_id: int, start: date, end: date, version: Tuple[int, int, Optional[date]]) -> str:
+    return make_etag("days", user_id, start.isoformat(), end.isoformat(), version)
+
+
+def user_etag(user) -> str:
+    return make_etag("user", user.id, user.updated_at)
@@ -0,0 +1,131 @@
+"""
+Per-user change feed over Server-Sent Events and WebSocket.
+
+Every open tab/device subscribes to its user's channel and receives the
+create/update/delete events of app.changes instead of polling day views.
+Both transports send a heartbeat after EVENTS_HEARTBEAT_SECONDS of silence.
+A consumer that falls EVENTS_QUEUE_SIZE events behind is dropped: it gets a
+final "dropped" event and should reconnect and refetch.
+"""
+import asyncio
+from typing import AsyncIterator, Optional
+
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Header, Query, WebSocket, WebSocketDisconnect, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy.orm import Session
+
+from app.changes import hub, user_channel
+from app.core.config import settings
+from app.core.database import get_db
+from app.core.pubsub import DROPPED, HEARTBEAT, Subscription
+from app.api.dependencies import get_current_user
+from app.models import User
+
+router = APIRouter(prefix="/api/events", tags=["events"])
+
+
+def authenticate(token: Optional[str], db: Session) -> User:
+    """Resolve a bearer token like get_current_user, then release the session
+    
+    Streams stay open for a long time and must not pin a pooled connection.
+    """
+    if not token:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    try:
+        return get_current_user(HTTPAuthorizationCredentials(scheme="Bearer", credentials=token), db)
+    finally:
+        db.close()
+
+
+def get_stream_user(
+    token: Optional[str] = Query(None, description="Access token, for clients that cannot set headers (EventSource)"),
+    authorization: Optional[str] = Header(None),
+    db: Session = Depends(get_db)
+) -> User:
+    if authorization and authorization.lower().startswith("bearer "):
+        token = authorization[7:]
+    return authenticate(token, db)
+
+
+def sse_message(message: dict) -> bytes:
+    return b"event: " + message["type"].encode() + b"\ndata: " + orjson.dumps(message) + b"\n\n"
+
+
+async def event_stream(subscription: Subscription, heartbeat: float) -> AsyncIterator[bytes]:
+    """SSE frames for a subscription until the client leaves or is dropped"""
+    try:
+        yield b"retry: 3000\n\n"
+        while True:
+            message = await subscription.get(heartbeat)
+            if message is HEARTBEAT:
+                yield b": heartbeat\n\n"
+            elif message is DROPPED:
+                yield b"event: dropped\ndata: {}\n\n"
+                return
+            else:
+                yield sse_message(message)
+    finally:
+        hub.unsubscribe(subscription)
+
+
+@router.get("")
+async def stream_events(current_user: User = Depends(get_stream_user)):
+    """Server-Sent Events stream of the current user's changes"""
+    subscription = hub.subscribe(user_channel(current_user.id))
+    return StreamingResponse(
+        event_stream(subscription, settings.EVENTS_HEARTBEAT_SECONDS),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/ws")
+async def websocket_events(
+    websocket: WebSocket,
+    token: Optional[str] = Query(None),
+    db: Session = Depends(get_db)
+):
+    """WebSocket stream of the current user's changes (JSON text frames)"""
+    try:
+        current_user = await run_in_threadpool(authenticate, token, db)
+    except HTTPException:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    
+    await websocket.accept()
+    subscription = hub.subscribe(user_channel(current_user.id))
+    
+    async def until_disconnect():
+        # Client frames are ignored; this only notices the socket closing
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
+    
+    disconnected = asyncio.ensure_future(until_disconnect())
+    try:
+        while True:
+            next_message = asyncio.ensure_future(subscription.get(settings.EVENTS_HEARTBEAT_SECONDS))
+            await asyncio.wait({next_message, disconnected}, return_when=asyncio.FIRST_COMPLETED)
+            if disconnected.done():
+                next_message.cancel()
+                return
+            message = next_message.result()
+            if message is HEARTBEAT:
+                await websocket.send_text('{"type": "heartbeat"}')
+            elif message is DROPPED:
+                await websocket.send_text('{"type": "dropped"}')
+                await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+                return
+            else:
+                await websocket.send_text(orjson.dumps(message).decode())
+    except WebSocketDisconnect:
+        pass
+    finally:
+        disconnected.cancel()
+        hub.unsubscribe(subscription)
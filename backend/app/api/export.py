@@ -0,0 +1,146 @@
+import csv
+import io
+import json
+import zlib
+from datetime import date
+from enum import Enum
+from typing import Iterator, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.replicas import get_read_db
+from app.api.dependencies import get_current_user
+from app.archive import all_tables, with_archives
+from app.models import User, Achievement, Todo
+from app.tombstones import live
+
+router = APIRouter(prefix="/api/export", tags=["export"])
+
+# Union of Achievement and Todo columns; "type" tells the rows apart
+EXPORT_FIELDS = [
+    "type", "id", "date", "title", "notes", "completed",
+    "priority", "due_time", "created_at", "updated_at",
+]
+
+# Flush to the client once this many bytes are buffered
+CHUNK_SIZE = 64 * 1024
+
+
+class ExportFormat(str, Enum):
+    ndjson = "ndjson"
+    csv = "csv"
+    json = "json"
+
+
+MEDIA_TYPES = {
+    ExportFormat.ndjson: "application/x-ndjson",
+    ExportFormat.csv: "text/csv",
+    ExportFormat.json: "application/json",
+}
+
+
+def _rows(db: Session, model, user_id: int, start: Optional[date], end: Optional[date]) -> Iterator[dict]:
+    """Stream one table, and its archived rows, through a server-side cursor, oldest first"""
+    fields = [name for name in EXPORT_FIELDS[1:] if hasattr(model, name)]
+    stmt = select(*(getattr(model, name) for name in fields)).where(model.user_id == user_id, live(model))
+    if start is not None:
+        stmt = stmt.where(model.date >= start)
+    if end is not None:
+        stmt = stmt.where(model.date <= end)
+    stmt = stmt.order_by(model.date, model.id)
+    stmt = with_archives(stmt, all_tables(db.connection(), model), fields, user_id, start, end)
+    stmt = stmt.execution_options(yield_per=settings.EXPORT_YIELD_PER)
+    
+    kind = model.__tablename__[:-1]  # "achievement" / "todo"
+    for row in db.execute(stmt):
+        record = {"type": kind}
+        record.update(row._mapping)
+        yield record
+
+
+def _default(value):
+    return value.isoformat()
+
+
+def _ndjson(records) -> Iterator[str]:
+    for record in records:
+        yield json.dumps(record, default=_default) + "\n"
+
+
+def _csv(records) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS, extrasaction="ignore")
+    writer.writeheader()
+    for record in records:
+        writer.writerow(record)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue()
+
+
+def _json(achievements, todos) -> Iterator[str]:
+    for key, records in (("achievements", achievements), ("todos", todos)):
+        yield ('{"' if key == "achievements" else ',"') + key + '":['
+        first = True
+        for record in records:
+            del record["type"]
+            yield ("" if first else ",") + json.dumps(record, default=_default)
+            first = False
+        yield "]"
+    yield "}"
+
+
+def _chunked(parts: Iterator[str], gzip: bool) -> Iterator[bytes]:
+    """Coalesce small pieces into CHUNK_SIZE writes, optionally gzip-compressed"""
+    compressor = zlib.compressobj(wbits=31) if gzip else None
+    buffer = []
+    size = 0
+    for part in parts:
+        buffer.append(part)
+        size += len(part)
+        if size >= CHUNK_SIZE:
+            data = "".join(buffer).encode("utf-8")
+            buffer, size = [], 0
+            data = compressor.compress(data) if compressor else data
+            if data:
+                yield data
+    data = "".join(buffer).encode("utf-8")
+    if compressor:
+        data = compressor.compress(data) + compressor.flush()
+    if data:
+        yield data
+
+
+@router.get("")
+def export_history(
+    format: ExportFormat = Query(ExportFormat.ndjson),
+    start: Optional[date] = Query(None, description="Only rows on or after this date"),
+    end: Optional[date] = Query(None, description="Only rows on or before this date"),
+    gzip: bool = Query(False, description="Compress the stream (Content-Encoding: gzip)"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
+):
+    """Stream the user's achievements and todos in constant memory"""
+    if start and end and end < start:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="end must not be before start"
+        )
+    
+    achievements = _rows(db, Achievement, current_user.id, start, end)
+    todos = _rows(db, Todo, current_user.id, start, end)
+    if format == ExportFormat.json:
+        parts = _json(achievements, todos)
+    else:
+        records = (record for rows in (achievements, todos) for record in rows)
+        parts = _ndjson(records) if format == ExportFormat.ndjson else _csv(records)
+    
+    headers = {"Content-Disposition": f'attachment; filename="export.{format.value}"'}
+    if gzip:
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(_chunked(parts, gzip), media_type=MEDIA_TYPES[format], headers=headers)
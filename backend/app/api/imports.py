@@ -0,0 +1,148 @@
+import codecs
+import csv
+import json
+from enum import Enum
+from typing import AsyncIterator, Dict, List
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.concurrency import run_in_threadpool
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import get_db
+from app.api.dependencies import get_current_user
+from app.models import User, Achievement, Todo
+from app.schemas import AchievementCreate, TodoCreate, ImportResponse
+from app.changes import publish_change
+from app.summaries import apply_rows
+from app.sync import log_rows
+
+router = APIRouter(prefix="/api/import", tags=["import"])
+
+# Record "type" -> (model, schema); matches the rows written by /api/export
+IMPORT_TYPES = {
+    "achievement": (Achievement, AchievementCreate),
+    "todo": (Todo, TodoCreate),
+}
+
+
+class ImportFormat(str, Enum):
+    ndjson = "ndjson"
+    csv = "csv"
+
+
+async def _lines(request: Request) -> AsyncIterator[str]:
+    """Split the request body into lines as it arrives, without buffering it"""
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    pending = ""
+    async for chunk in request.stream():
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+
+async def _ndjson_records(lines: AsyncIterator[str]) -> AsyncIterator[dict]:
+    async for line in lines:
+        if line.strip():
+            yield json.loads(line)
+
+
+async def _csv_records(lines: AsyncIterator[str]) -> AsyncIterator[dict]:
+    header = None
+    record = ""
+    async for line in lines:
+        record = record + "\n" + line if record else line
+        # A quoted field may contain newlines: wait until the quotes balance
+        if record.count('"') % 2:
+            continue
+        fields = next(csv.reader([record])) if record.strip() else None
+        record = ""
+        if fields is None:
+            continue
+        if header is None:
+            header = fields
+            continue
+        # Empty cells fall back to the schema defaults
+        yield {key: value for key, value in zip(header, fields) if value != ""}
+
+
+def _write_chunk(db: Session, user_id: int, rows: Dict[str, List[dict]]) -> None:
+    """Insert one chunk with an executemany per table, in a single transaction"""
+    try:
+        for kind, items in rows.items():
+            if items:
+                model, _ = IMPORT_TYPES[kind]
+                owned = [dict(item, user_id=user_id) for item in items]
+                ids = db.scalars(insert(model).returning(model.id), owned).all()
+                apply_rows(db, model, owned)
+                log_rows(db.connection(), model, user_id, ids)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+
+@router.post("", response_model=ImportResponse)
+async def import_history(
+    request: Request,
+    format: ImportFormat = Query(ImportFormat.ndjson),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Import achievements and todos from an NDJSON/CSV body, committing per chunk
+    
+    Each record needs a "type" of "achievement" or "todo" plus the fields of
+    AchievementCreate/TodoCreate. On an invalid record the import stops with
+    422; chunks committed before it are kept and reported in the error.
+    """
+    parse = _ndjson_records if format == ImportFormat.ndjson else _csv_records
+    counts = {kind: 0 for kind in IMPORT_TYPES}
+    chunks = 0
+    chunk = {kind: [] for kind in IMPORT_TYPES}
+    size = 0
+    record_number = 0
+    
+    def invalid(errors) -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail={"record": record_number, "errors": errors, "imported": counts},
+        )
+    
+    async def flush() -> None:
+        nonlocal chunk, chunks, size
+        await run_in_threadpool(_write_chunk, db, current_user.id, chunk)
+        for key, items in chunk.items():
+            counts[key] += len(items)
+        chunks += 1
+        # Too many rows to announce one by one; clients refetch what they show
+        publish_change(current_user.id, "import", "committed",
+                       [{"achievements": len(chunk["achievement"]), "todos": len(chunk["todo"])}])
+        chunk = {key: [] for key in IMPORT_TYPES}
+        size = 0
+    
+    try:
+        async for record in parse(_lines(request)):
+            record_number += 1
+            kind = record.get("type") if isinstance(record, dict) else None
+            if kind not in IMPORT_TYPES:
+                raise invalid([f"type must be one of {sorted(IMPORT_TYPES)}"])
+            _, schema = IMPORT_TYPES[kind]
+            chunk[kind].append(schema.model_validate(record).model_dump())
+            size += 1
+            if size >= settings.IMPORT_BATCH_SIZE:
+                await flush()
+    except ValidationError as exc:
+        raise invalid(json.loads(exc.json(include_url=False)))
+    except (json.JSONDecodeError, UnicodeDecodeError, csv.Error) as exc:
+        raise invalid([str(exc)])
+    
+    if size:
+        await flush()
+    
+    return ImportResponse(achievements=counts["achievement"], todos=counts["todo"], chunks=chunks)
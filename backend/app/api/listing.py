@@ -0,0 +1,87 @@
+"""
+Keyset ("seek") pagination for the todo and achievement list endpoints.
+
+Pages are ordered by (date, id) and continue from the last row seen via a
+row-value comparison, so every page is an index range scan on
+(user_id, date) / (user_id, completed, date) no matter how deep it is.
+"""
+import base64
+import json
+from datetime import date
+from enum import Enum
+from typing import Optional, Sequence, Tuple, Type
+
+from fastapi import HTTPException, status
+from pydantic import BaseModel
+from sqlalchemy import select, tuple_
+
+from app.tombstones import live
+
+
+class SortOrder(str, Enum):
+    asc = "asc"
+    desc = "desc"
+
+
+def encode_cursor(*values) -> str:
+    return base64.urlsafe_b64encode(json.dumps(values, default=str).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> list:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except ValueError:
+        values = None
+    if not isinstance(values, list):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+    return values
+
+
+def _date_id_cursor(cursor: str) -> Tuple[date, int]:
+    values = decode_cursor(cursor)
+    try:
+        return date.fromisoformat(values[0]), int(values[1])
+    except (IndexError, TypeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+def list_statement(model, user_id: int, limit: int, order: SortOrder = SortOrder.asc,
+                   cursor: Optional[str] = None, completed: Optional[bool] = None,
+                   start: Optional[date] = None, end: Optional[date] = None, **equals):
+    """SELECT for one page (limit + 1 rows, the extra one signals a next page)"""
+    stmt = select(model).where(model.user_id == user_id, live(model))
+    if completed is not None:
+        stmt = stmt.where(model.completed == completed)
+    if start is not None:
+        stmt = stmt.where(model.date >= start)
+    if end is not None:
+        stmt = stmt.where(model.date <= end)
+    for name, value in equals.items():
+        if value is not None:
+            stmt = stmt.where(getattr(model, name) == value)
+    
+    key = tuple_(model.date, model.id)
+    if cursor:
+        after = tuple_(*_date_id_cursor(cursor))
+        stmt = stmt.where(key > after if order == SortOrder.asc else key < after)
+    if order == SortOrder.asc:
+        stmt = stmt.order_by(model.date, model.id)
+    else:
+        stmt = stmt.order_by(model.date.desc(), model.id.desc())
+    return stmt.limit(limit + 1)
+
+
+def page(rows: Sequence, limit: int, response_model: Type[BaseModel]) -> dict:
+    """Split the limit + 1 fetched rows into items and the next cursor"""
+    items = [response_model.model_validate(row) for row in rows[:limit]]
+    next_cursor = None
+    if len(rows) > limit:
+        last = items[-1]
+        next_cursor = encode_cursor(last.date.isoformat(), last.id)
+    return {"items": items, "next_cursor": next_cursor}
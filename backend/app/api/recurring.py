@@ -0,0 +1,165 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+from datetime import date
+from typing import List, Optional
+
+from app.core.database import get_db
+from app.core.replicas import get_read_db
+from app.api.dependencies import get_current_user
+from app.models import User, RecurrenceRule, RecurrenceOverride
+from app.recurrence import NoOccurrences, last_occurrence, occurrence, occurrence_dates
+from app.schemas import (
+    RecurrenceRuleCreate, RecurrenceRuleUpdate, RecurrenceRuleResponse, OccurrenceUpdate, OccurrenceResponse
+)
+
+router = APIRouter(prefix="/api/recurring", tags=["recurring"])
+
+
+def _until(rrule: str, dtstart: date) -> Optional[date]:
+    try:
+        return last_occurrence(rrule, dtstart)
+    except NoOccurrences as exc:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=str(exc)
+        )
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc)
+        )
+
+
+def _get_rule(db: Session, rule_id: int, user_id: int) -> RecurrenceRule:
+    rule = db.query(RecurrenceRule).filter(
+        RecurrenceRule.id == rule_id,
+        RecurrenceRule.user_id == user_id
+    ).first()
+    if not rule:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Recurring todo not found"
+        )
+    return rule
+
+
+def _get_override(db: Session, rule: RecurrenceRule, day_date: date) -> RecurrenceOverride:
+    """The occurrence's override row, new if it has none yet"""
+    if day_date not in occurrence_dates(rule, day_date, day_date):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="The recurring todo has no occurrence on this date"
+        )
+    override = db.get(RecurrenceOverride, (rule.id, day_date))
+    if override is None:
+        override = RecurrenceOverride(rule_id=rule.id, date=day_date, user_id=rule.user_id, cancelled=False)
+        db.add(override)
+    return override
+
+
+@router.get("", response_model=List[RecurrenceRuleResponse])
+def list_rules(
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
+):
+    """List the user's recurring todos"""
+    return db.query(RecurrenceRule).filter(
+        RecurrenceRule.user_id == current_user.id
+    ).order_by(RecurrenceRule.id).all()
+
+
+@router.post("", response_model=RecurrenceRuleResponse, status_code=status.HTTP_201_CREATED)
+def create_rule(
+    rule: RecurrenceRuleCreate,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Create a recurring todo from an RRULE such as FREQ=WEEKLY;BYDAY=MO,WE"""
+    db_rule = RecurrenceRule(
+        user_id=current_user.id,
+        until=_until(rule.rrule, rule.dtstart),
+        version=0,
+        **rule.model_dump()
+    )
+    
+    db.add(db_rule)
+    db.commit()
+    db.refresh(db_rule)
+    
+    return db_rule
+
+
+@router.patch("/{rule_id}", response_model=RecurrenceRuleResponse)
+def update_rule(
+    rule_id: int,
+    rule_update: RecurrenceRuleUpdate,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Update a recurring todo; the change applies to every occurrence without an override"""
+    db_rule = _get_rule(db, rule_id, current_user.id)
+    
+    update_data = rule_update.model_dump(exclude_unset=True)
+    for field, value in update_data.items():
+        setattr(db_rule, field, value)
+    if "rrule" in update_data or "dtstart" in update_data:
+        db_rule.until = _until(db_rule.rrule, db_rule.dtstart)
+    
+    db.commit()
+    db.refresh(db_rule)
+    
+    return db_rule
+
+
+@router.delete("/{rule_id}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_rule(
+    rule_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Delete a recurring todo with all its occurrences"""
+    db_rule = _get_rule(db, rule_id, current_user.id)
+    
+    db.delete(db_rule)
+    db.commit()
+    
+    return None
+
+
+@router.patch("/{rule_id}/occurrences/{day_date}", response_model=OccurrenceResponse)
+def update_occurrence(
+    rule_id: int,
+    day_date: date,
+    occurrence_update: OccurrenceUpdate,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Complete or edit one occurrence (cancelled=false restores a cancelled one)"""
+    db_rule = _get_rule(db, rule_id, current_user.id)
+    override = _get_override(db, db_rule, day_date)
+    
+    for field, value in occurrence_update.model_dump(exclude_unset=True).items():
+        if field == "cancelled":
+            value = bool(value)
+        setattr(override, field, value)
+    
+    db.commit()
+    
+    return occurrence(db_rule, day_date, override)
+
+
+@router.delete("/{rule_id}/occurrences/{day_date}", status_code=status.HTTP_204_NO_CONTENT)
+def cancel_occurrence(
+    rule_id: int,
+    day_date: date,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Skip one occurrence, leaving the rest of the series in place"""
+    db_rule = _get_rule(db, rule_id, current_user.id)
+    override = _get_override(db, db_rule, day_date)
+    override.cancelled = True
+    
+    db.commit()
+    
+    return None
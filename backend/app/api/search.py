@@ -0,0 +1,62 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+from enum import Enum
+from typing import Optional
+
+from app.core.replicas import get_read_db
+from app.api.dependencies import get_current_user
+from app.api.listing import encode_cursor
+from app.models import User
+from app.schemas import SearchHit, SearchResponse
+from app import search as search_index
+
+router = APIRouter(prefix="/api/search", tags=["search"])
+
+
+class SearchType(str, Enum):
+    all = "all"
+    achievement = "achievement"
+    todo = "todo"
+
+
+@router.get("", response_model=SearchResponse)
+def search(
+    q: str = Query(..., min_length=1, description="Words to look for; each matches as a prefix"),
+    type: SearchType = Query(SearchType.all),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
+):
+    """Ranked full-text search over achievement and todo titles and notes"""
+    if not search_index.is_supported(db.get_bind().dialect.name):
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail="Search is not available on this database"
+        )
+    terms = search_index.search_terms(q)
+    if not terms:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Query must contain at least one word"
+        )
+    after = None
+    if cursor:
+        try:
+            after = search_index.decode_search_cursor(cursor)
+        except (ValueError, TypeError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            )
+    
+    kinds = list(search_index.SEARCH_TABLES) if type == SearchType.all else [type.value]
+    rows = search_index.search(db.connection(), current_user.id, terms, kinds, limit + 1, after)
+    
+    items = [SearchHit(type=row["kind"], **{k: v for k, v in row.items() if k != "kind"}) for row in rows[:limit]]
+    next_cursor = None
+    if len(rows) > limit:
+        last = items[-1]
+        next_cursor = encode_cursor(last.score, last.type, last.id)
+    
+    return SearchResponse(items=items, next_cursor=next_cursor)
@@ -0,0 +1,100 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from datetime import date, timedelta
+from enum import Enum
+from typing import Optional, Tuple
+
+from app.core.replicas import get_read_db
+from app.api.dependencies import get_current_user
+from app.models import User, DailySummary
+from app.schemas import StreakResponse, PeriodSummaryResponse, DailySummaryResponse
+
+router = APIRouter(prefix="/api/stats", tags=["stats"])
+
+
+class Period(str, Enum):
+    week = "week"
+    month = "month"
+    year = "year"
+
+
+def period_bounds(period: Period, day: date) -> Tuple[date, date]:
+    """First and last day of the week (Monday-based), month or year containing day"""
+    if period == Period.week:
+        start = day - timedelta(days=day.weekday())
+        return start, start + timedelta(days=6)
+    if period == Period.month:
+        start = day.replace(day=1)
+        next_month = (start + timedelta(days=32)).replace(day=1)
+        return start, next_month - timedelta(days=1)
+    return date(day.year, 1, 1), date(day.year, 12, 31)
+
+
+@router.get("/streak", response_model=StreakResponse)
+def get_streak(
+    as_of: Optional[date] = Query(None, description="The client's today (defaults to the server date)"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
+):
+    """Consecutive days with at least one achievement: current and longest run"""
+    today = as_of or date.today()
+    active_days = [
+        row.date for row in db.query(DailySummary.date).filter(
+            DailySummary.user_id == current_user.id,
+            DailySummary.achievements > 0,
+            DailySummary.date <= today
+        ).order_by(DailySummary.date.desc())
+    ]
+    if not active_days:
+        return StreakResponse(current=0, longest=0)
+    
+    longest = run = 1
+    current = None
+    for newer, older in zip(active_days, active_days[1:]):
+        if newer - older == timedelta(days=1):
+            run += 1
+        else:
+            current = run if current is None else current
+            run = 1
+        longest = max(longest, run)
+    current = run if current is None else current
+    
+    # Today's achievements may not be logged yet, so a run ending yesterday still counts
+    if today - active_days[0] > timedelta(days=1):
+        current = 0
+    
+    return StreakResponse(current=current, longest=longest, last_active=active_days[0])
+
+
+@router.get("/summary", response_model=PeriodSummaryResponse)
+def get_summary(
+    period: Period = Query(Period.week),
+    day: Optional[date] = Query(None, alias="date", description="Any day inside the period (defaults to today)"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
+):
+    """Totals for the week, month or year containing the given date"""
+    start, end = period_bounds(period, day or date.today())
+    rows = db.query(DailySummary).filter(
+        DailySummary.user_id == current_user.id,
+        DailySummary.date >= start,
+        DailySummary.date <= end
+    ).order_by(DailySummary.date).all()
+    
+    days = [DailySummaryResponse.model_validate(row) for row in rows]
+    return PeriodSummaryResponse(
+        period=period.value,
+        start=start,
+        end=end,
+        achievements=sum(d.achievements for d in days),
+        achievements_completed=sum(d.achievements_completed for d in days),
+        todos=sum(d.todos for d in days),
+        todos_completed=sum(d.todos_completed for d in days),
+        todos_by_priority={
+            "low": sum(d.todos_low for d in days),
+            "medium": sum(d.todos_medium for d in days),
+            "high": sum(d.todos_high for d in days),
+        },
+        active_days=sum(1 for d in days if d.achievements or d.todos),
+        days=[d for d in days if d.achievements or d.todos],
+    )
@@ -0,0 +1,80 @@
+from collections import defaultdict
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.api.dependencies import get_current_user
+from app.api.listing import encode_cursor, decode_cursor
+from app.archive import archived_rows
+from app.models import User, Achievement, Todo, SyncChange
+from app.schemas import SyncResponse
+from app.tombstones import live
+
+router = APIRouter(prefix="/api/sync", tags=["sync"])
+
+
+def _since_seq(since: Optional[str]) -> int:
+    if since is None:
+        return 0
+    values = decode_cursor(since)
+    if len(values) != 1 or not isinstance(values[0], int):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+    return values[0]
+
+
+@router.get("", response_model=SyncResponse)
+def sync_changes(
+    since: Optional[str] = Query(None, description="cursor of the previous sync; omit for a full sync"),
+    limit: int = Query(1000, ge=1, le=10000, description="Most changed rows per page"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Rows changed (and ids deleted) since the cursor, oldest change first
+    
+    Keep calling with the returned cursor while has_more is true.
+    """
+    after = _since_seq(since)
+    entries = db.execute(
+        select(SyncChange.seq, SyncChange.kind, SyncChange.row_id, SyncChange.deleted)
+        .where(SyncChange.user_id == current_user.id, SyncChange.seq > after)
+        .order_by(SyncChange.seq)
+        .limit(limit + 1)
+    ).all()
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+    
+    changed = defaultdict(list)
+    deleted = defaultdict(list)
+    for entry in entries:
+        (deleted if entry.deleted else changed)[entry.kind].append(entry.row_id)
+    
+    # Rows deleted after the log was read are skipped; their tombstones come next time
+    def current_rows(model, kind):
+        if not changed[kind]:
+            return []
+        rows = db.query(model).filter(
+            model.user_id == current_user.id,
+            model.id.in_(changed[kind]),
+            live(model)
+        ).order_by(model.id).all()
+        missing = set(changed[kind]).difference(row.id for row in rows)
+        if missing:
+            rows = sorted(rows + archived_rows(db.connection(), model, current_user.id, sorted(missing)),
+                          key=lambda row: row.id)
+        return rows
+    
+    return SyncResponse(
+        achievements=current_rows(Achievement, "achievement"),
+        todos=current_rows(Todo, "todo"),
+        user=db.get(User, current_user.id) if changed["user"] else None,
+        deleted_achievements=deleted["achievement"],
+        deleted_todos=deleted["todo"],
+        cursor=encode_cursor(entries[-1].seq if entries else after),
+        has_more=has_more,
+    )
@@ -1,15 +1,75 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
-from datetime import date
+from datetime import date, datetime
+from typing import List, Optional
 
 from app.core.database import get_db
+from app.core.replicas import get_read_db
 from app.api.dependencies import get_current_user
+from app.api.batch import bulk_create, bulk_update, bulk_delete
+from app.api.listing import SortOrder, list_statement, page
+from app.archive import thaw
 from app.models import User, Todo
-from app.schemas import TodoCreate, TodoUpdate, TodoResponse
+from app.tombstones import live, deleted
+from app.schemas import (
+    TodoCreate, TodoUpdate, TodoBatchUpdate, TodoResponse, TodoListResponse,
+    BatchDeleteResponse
+)
 
 router = APIRouter(prefix="/api/todos", tags=["todos"])
 
 
+# Batch routes are declared first so "/batch" is not parsed as a date or id
+@router.post("/batch", response_model=List[TodoResponse], status_code=status.HTTP_201_CREATED)
+def create_todos_batch(
+    todos: List[TodoCreate],
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Create many todos in one transaction"""
+    return bulk_create(db, Todo, current_user.id, todos, TodoResponse)
+
+
+@router.patch("/batch", response_model=List[TodoResponse])
+def update_todos_batch(
+    todos: List[TodoBatchUpdate],
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Update many todos (by id) in one transaction"""
+    return bulk_update(db, Todo, current_user.id, todos, TodoResponse)
+
+
+@router.delete("/batch", response_model=BatchDeleteResponse)
+def delete_todos_batch(
+    ids: List[int] = Body(...),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Delete many todos (by id) in one transaction"""
+    return {"deleted": bulk_delete(db, Todo, current_user.id, ids)}
+
+
+@router.get("", response_model=TodoListResponse)
+def list_todos(
+    completed: Optional[bool] = Query(None),
+    priority: Optional[str] = Query(None),
+    start: Optional[date] = Query(None, description="Only todos on or after this date"),
+    end: Optional[date] = Query(None, description="Only todos on or before this date"),
+    order: SortOrder = Query(SortOrder.asc),
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
+):
+    """List todos ordered by (date, id) with keyset pagination"""
+    stmt = list_statement(
+        Todo, current_user.id, limit, order, cursor,
+        completed=completed, start=start, end=end, priority=priority
+    )
+    return page(db.scalars(stmt).all(), limit, TodoResponse)
+
+
 @router.post("/{day_date}", response_model=TodoResponse, status_code=status.HTTP_201_CREATED)
 def create_todo(
     day_date: date,
@@ -45,8 +105,11 @@ def update_todo(
     """Update a todo"""
     db_todo = db.query(Todo).filter(
         Todo.id == todo_id,
-        Todo.user_id == current_user.id
+        Todo.user_id == current_user.id,
+        live(Todo)
     ).first()
+    if not db_todo and thaw(db.connection(), Todo, todo_id, current_user.id):
+        db_todo = db.get(Todo, todo_id)
     
     if not db_todo:
         raise HTTPException(
@@ -70,11 +133,14 @@ def delete_todo(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Delete a todo"""
+    """Delete a todo; it can be restored until it is purged"""
     db_todo = db.query(Todo).filter(
         Todo.id == todo_id,
-        Todo.user_id == current_user.id
+        Todo.user_id == current_user.id,
+        live(Todo)
     ).first()
+    if not db_todo and thaw(db.connection(), Todo, todo_id, current_user.id):
+        db_todo = db.get(Todo, todo_id)
     
     if not db_todo:
         raise HTTPException(
@@ -82,8 +148,34 @@ def delete_todo(
             detail="Todo not found"
         )
     
-    db.delete(db_todo)
+    db_todo.deleted_at = datetime.utcnow()
     db.commit()
     
     return None
 
+
+@router.post("/{todo_id}/restore", response_model=TodoResponse)
+def restore_todo(
+    todo_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Undo the deletion of a todo"""
+    db_todo = db.query(Todo).filter(
+        Todo.id == todo_id,
+        Todo.user_id == current_user.id,
+        deleted(Todo)
+    ).first()
+    
+    if not db_todo:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Deleted todo not found"
+        )
+    
+    db_todo.deleted_at = None
+    db.commit()
+    db.refresh(db_todo)
+    
+    return db_todo
+
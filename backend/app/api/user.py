@@ -1,8 +1,9 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
-from app.api.dependencies import get_current_user
+from app.api.dependencies import get_current_user, invalidate_user
+from app.api.etag import conditional, user_etag
 from app.models import User
 from app.schemas import UserResponse, UserUpdate
 
@@ -10,8 +11,16 @@ router = APIRouter(prefix="/api/user", tags=["user"])
 
 
 @router.get("/me", response_model=UserResponse)
-def get_current_user_info(current_user: User = Depends(get_current_user)):
+def get_current_user_info(
+    request: Request,
+    response: Response,
+    current_user: User = Depends(get_current_user)
+):
     """Get current user profile"""
+    not_modified = conditional(request, response, user_etag(current_user))
+    if not_modified is not None:
+        return not_modified
+    
     return current_user
 
 
@@ -24,11 +33,14 @@ def update_current_user(
     """Update current user profile (quote, name, avatar)"""
     update_data = user_update.model_dump(exclude_unset=True)
     
+    # current_user may come from the auth cache, so reload it in this session
+    db_user = db.get(User, current_user.id)
     for field, value in update_data.items():
-        setattr(current_user, field, value)
+        setattr(db_user, field, value)
     
     db.commit()
-    db.refresh(current_user)
+    db.refresh(db_user)
+    invalidate_user(db_user.email)
     
-    return current_user
+    return db_user
 
@@ -0,0 +1,234 @@
+"""
+Cold storage for old achievements and todos.
+
+``archive_rows`` (``python -m app.archive``) moves live rows dated more
+than ARCHIVE_HORIZON_DAYS ago from the hot tables into per-year tables
+(achievements_archive_2021, todos_archive_2021, ...), created on demand,
+and advances the owner's users.archived_before. The hot tables and their
+indexes then only hold recent data. Each batch moves the rows and the
+watermark in one transaction.
+
+Day and range views read archived_before with their version query (see
+app.api.etag), so recent dates cost nothing extra. For dates before it the
+rows are the union of the hot table, which still takes new writes to old
+dates, and the archive tables of the years involved. Sync and export fall
+back to the archive too. A single-row update, delete or restore of an
+archived row first moves it back to the hot table (``thaw``). Lists,
+search and the batch endpoints only cover the hot tables.
+``python -m app.archive --restore`` moves everything back.
+
+Archiving does not change what a day contains, so DailySummary, the sync
+log and the search index of remaining rows are left alone. Rows leave the
+full-text index with the hot table and rejoin it when thawed.
+"""
+import argparse
+import re
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from sqlalchemy import Column, Index, MetaData, Table, delete, insert, inspect, or_, select, union_all, update
+
+from app.core.config import settings
+from app.core.database import get_engine
+from app.models import Achievement, Todo, User
+from app.tombstones import below_max_id, live
+
+MODELS = (Achievement, Todo)
+
+# Archive tables live outside Base.metadata: create_all and Alembic leave them alone
+archive_metadata = MetaData()
+_tables: Dict[str, Table] = {}
+# Names of archive tables known to exist; they are never dropped while the app runs
+_existing = set()
+
+
+def archive_table(model, year: int) -> Table:
+    """The archive table of the model for one year (not necessarily created yet)"""
+    name = f"{model.__tablename__}_archive_{year}"
+    table = _tables.get(name)
+    if table is None:
+        columns = [
+            Column(column.name, column.type, primary_key=column.primary_key, nullable=column.nullable)
+            for column in model.__table__.columns
+            if column.name != "deleted_at"
+        ]
+        table = Table(name, archive_metadata, *columns, Index(f"ix_{name}_user_id_date", "user_id", "date"))
+        _tables[name] = table
+    return table
+
+
+def existing_tables(connection, model, years: Iterable[int]) -> List[Table]:
+    """Archive tables of the given years that exist in the database"""
+    tables = []
+    inspector = None
+    for year in years:
+        table = archive_table(model, year)
+        if table.name not in _existing:
+            inspector = inspector or inspect(connection)
+            if not inspector.has_table(table.name):
+                continue
+            _existing.add(table.name)
+        tables.append(table)
+    return tables
+
+
+def all_tables(connection, model) -> List[Table]:
+    """Every archive table of the model, oldest year first"""
+    pattern = re.compile(rf"{model.__tablename__}_archive_(\d{{4}})$")
+    years = sorted(int(match.group(1)) for match in map(pattern.match, inspect(connection).get_table_names())
+                   if match)
+    return existing_tables(connection, model, years)
+
+
+def cold_tables(connection, model, start: date, end: date, archived_before: Optional[date]) -> List[Table]:
+    """Archive tables a read of [start, end] has to include, given the user's archived_before"""
+    if archived_before is None or start >= archived_before:
+        return []
+    last = min(end, archived_before - timedelta(days=1))
+    return existing_tables(connection, model, range(start.year, last.year + 1))
+
+
+def _archive_select(table: Table, fields: Sequence[str], user_id: int, start: Optional[date], end: Optional[date]):
+    stmt = select(*(table.c[name] for name in fields)).where(table.c.user_id == user_id)
+    if start is not None:
+        stmt = stmt.where(table.c.date >= start)
+    if end is not None:
+        stmt = stmt.where(table.c.date <= end)
+    return stmt
+
+
+def with_archives(stmt, tables: Sequence[Table], fields: Sequence[str], user_id: int,
+                  start: Optional[date], end: Optional[date]):
+    """The hot rows statement extended by the same range of the archive tables, in (date, id) order"""
+    if not tables:
+        return stmt
+    parts = [stmt.order_by(None)] + [_archive_select(table, fields, user_id, start, end) for table in tables]
+    rows = union_all(*parts).subquery()
+    return select(*(rows.c[name] for name in fields)).order_by(rows.c.date, rows.c.id)
+
+
+def archived_rows(connection, model, user_id: int, ids: Sequence[int]) -> list:
+    """Rows with the given ids found in the archive tables"""
+    found = []
+    for table in all_tables(connection, model):
+        found += connection.execute(select(table).where(table.c.user_id == user_id, table.c.id.in_(ids))).all()
+    return found
+
+
+def thaw(connection, model, row_id: int, user_id: int) -> bool:
+    """Move an archived row back to the hot table, before writing to it; whether it was archived"""
+    for table in all_tables(connection, model):
+        row = connection.execute(
+            delete(table).where(table.c.id == row_id, table.c.user_id == user_id).returning(*table.c)
+        ).mappings().first()
+        if row is not None:
+            connection.execute(insert(model.__table__), [dict(row)])
+            return True
+    return False
+
+
+def _archive_batch(connection, model, user_id: int, cutoff: date, batch_size: int) -> int:
+    table = model.__table__
+    ids = select(table.c.id).where(
+        table.c.user_id == user_id,
+        table.c.date < cutoff,
+        live(model),
+        below_max_id(table)
+    ).limit(batch_size)
+    rows = connection.execute(delete(table).where(table.c.id.in_(ids)).returning(*table.c)).mappings().all()
+    by_year = defaultdict(list)
+    for row in rows:
+        values = dict(row)
+        del values["deleted_at"]
+        by_year[values["date"].year].append(values)
+    for year, values in by_year.items():
+        archive = archive_table(model, year)
+        archive.create(connection, checkfirst=True)
+        _existing.add(archive.name)
+        connection.execute(insert(archive), values)
+
+    users = User.__table__
+    connection.execute(
+        update(users)
+        .where(users.c.id == user_id, or_(users.c.archived_before.is_(None), users.c.archived_before < cutoff))
+        .values(archived_before=cutoff, updated_at=users.c.updated_at)
+    )
+    return len(rows)
+
+
+def archive_rows(engine=None, horizon_days: Optional[int] = None, batch_size: Optional[int] = None,
+                 today: Optional[date] = None) -> Dict[str, int]:
+    """Move every live row older than the horizon to its year's archive table; rows moved per table"""
+    engine = get_engine() if engine is None else engine
+    horizon_days = settings.ARCHIVE_HORIZON_DAYS if horizon_days is None else horizon_days
+    batch_size = batch_size or settings.ARCHIVE_BATCH_SIZE
+    cutoff = (today or date.today()) - timedelta(days=horizon_days)
+
+    moved = {}
+    for model in MODELS:
+        with engine.connect() as connection:
+            user_ids = connection.scalars(
+                select(model.user_id).where(model.date < cutoff, live(model)).distinct()
+            ).all()
+        total = 0
+        for user_id in user_ids:
+            while True:
+                with engine.begin() as connection:
+                    count = _archive_batch(connection, model, user_id, cutoff, batch_size)
+                total += count
+                if count < batch_size:
+                    break
+        moved[model.__tablename__] = total
+    return moved
+
+
+def restore_rows(engine=None, batch_size: Optional[int] = None) -> Dict[str, int]:
+    """Move every archived row back to the hot tables and drop the archive tables
+
+    Run it with the app stopped: running processes remember which archive tables exist.
+    """
+    engine = get_engine() if engine is None else engine
+    batch_size = batch_size or settings.ARCHIVE_BATCH_SIZE
+
+    moved = {}
+    for model in MODELS:
+        with engine.connect() as connection:
+            tables = all_tables(connection, model)
+        total = 0
+        for table in tables:
+            while True:
+                with engine.begin() as connection:
+                    ids = select(table.c.id).limit(batch_size)
+                    rows = connection.execute(delete(table).where(table.c.id.in_(ids)).returning(*table.c)).all()
+                    if rows:
+                        connection.execute(insert(model.__table__), [dict(row._mapping) for row in rows])
+                total += len(rows)
+                if len(rows) < batch_size:
+                    break
+            with engine.begin() as connection:
+                table.drop(connection)
+            _existing.discard(table.name)
+        moved[model.__tablename__] = total
+
+    with engine.begin() as connection:
+        connection.execute(update(User.__table__).values(archived_before=None, updated_at=User.__table__.c.updated_at))
+    return moved
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Move achievements and todos older than the horizon to cold storage")
+    parser.add_argument("--horizon-days", type=int, default=settings.ARCHIVE_HORIZON_DAYS)
+    parser.add_argument("--batch-size", type=int, default=settings.ARCHIVE_BATCH_SIZE)
+    parser.add_argument("--restore", action="store_true", help="move every archived row back instead")
+    args = parser.parse_args()
+    if args.restore:
+        moved = restore_rows(batch_size=args.batch_size)
+        print(", ".join(f"{table}: {count} restored" for table, count in moved.items()))
+        return
+    moved = archive_rows(horizon_days=args.horizon_days, batch_size=args.batch_size)
+    print(", ".join(f"{table}: {count} archived" for table, count in moved.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Per-user change events for the /api/events feed.
+
+Writes through the ORM unit of work (the single-row todo, achievement and
+user routes) are picked up by Session flush events; the batch endpoints and
+import call ``record_changes`` / ``publish_change`` themselves. Events are
+held on the session until it commits, so rolled-back writes are never
+announced. Rows changed together are sent as one event with several items,
+e.g. {"type": "todo.created", "items": [...]}. Soft deletes are announced
+as deletions and restores as creations.
+"""
+from collections import defaultdict
+from typing import Iterable, Iterator, List, Tuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.plugins import load_plugin
+from app.core.pubsub import Broker, LocalBroker, PubSubHub
+from app.models import Achievement, Todo, User
+from app.schemas import AchievementResponse, TodoResponse, UserResponse
+
+KINDS = {
+    Achievement: ("achievement", AchievementResponse),
+    Todo: ("todo", TodoResponse),
+    User: ("user", UserResponse),
+}
+# Login rehashes and other internal writes do not concern other devices
+USER_FIELDS = ("email", "display_name", "avatar_url", "quote")
+
+
+def create_broker() -> Broker:
+    if settings.EVENTS_BROKER == "local":
+        return LocalBroker()
+    return load_plugin(settings.EVENTS_BROKER)
+
+
+hub = PubSubHub(create_broker(), max_queue=settings.EVENTS_QUEUE_SIZE)
+
+
+def user_channel(user_id: int) -> str:
+    return f"user:{user_id}"
+
+
+def publish_change(user_id: int, kind: str, action: str, items: List[dict]) -> None:
+    """Announce committed changes to the user's subscribers"""
+    if items:
+        hub.publish(user_channel(user_id), {"type": f"{kind}.{action}", "items": items})
+
+
+def record_changes(session: Session, model, user_id: int, action: str, items: Iterable[dict]) -> None:
+    """Queue events to publish when the session commits"""
+    kind, _ = KINDS[model]
+    session.info.setdefault("pending_changes", defaultdict(list))[(user_id, kind, action)].extend(items)
+
+
+def deleted_item(obj) -> dict:
+    return {"id": obj.id, "date": obj.date.isoformat()}
+
+
+def owner(obj) -> int:
+    return obj.id if isinstance(obj, User) else obj.user_id
+
+
+def _user_fields_changed(obj) -> bool:
+    state = inspect(obj)
+    return any(state.attrs[name].history.has_changes() for name in USER_FIELDS)
+
+
+def _update_action(obj) -> str:
+    """"deleted"/"created" when the update soft-deleted/restored the row"""
+    if isinstance(obj, (Achievement, Todo)) and inspect(obj).attrs.deleted_at.history.has_changes():
+        return "created" if obj.deleted_at is None else "deleted"
+    return "updated"
+
+
+def flushed_changes(session: Session) -> Iterator[Tuple[str, object]]:
+    """(action, object) for the rows written by a flush; call from after_flush"""
+    # new/dirty/deleted still describe the flushed objects at this point
+    for obj in session.new:
+        if type(obj) in KINDS:
+            yield "created", obj
+    for obj in session.dirty:
+        if type(obj) not in KINDS or not session.is_modified(obj):
+            continue
+        if isinstance(obj, User) and not _user_fields_changed(obj):
+            continue
+        yield _update_action(obj), obj
+    for obj in session.deleted:
+        if type(obj) in (Achievement, Todo):
+            yield "deleted", obj
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changes(session, flush_context):
+    for action, obj in flushed_changes(session):
+        if action == "deleted":
+            item = deleted_item(obj)
+        else:
+            _, schema = KINDS[type(obj)]
+            item = schema.model_validate(obj).model_dump(mode="json")
+        record_changes(session, type(obj), owner(obj), action, [item])
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_changes(session):
+    for (user_id, kind, action), items in session.info.pop("pending_changes", {}).items():
+        publish_change(user_id, kind, action, items)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changes(session):
+    session.info.pop("pending_changes", None)
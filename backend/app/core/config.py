@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import Dict, List
 
 
 class Settings(BaseSettings):
@@ -7,8 +7,126 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     
+    # Password hashing: bcrypt cost and the bounded worker pool running it
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_PENDING: int = 16
+    
+    # Authenticated-user cache (per process)
+    AUTH_CACHE_TTL_SECONDS: int = 60
+    USER_CACHE_MAX_SIZE: int = 10000
+    TOKEN_CACHE_MAX_SIZE: int = 10000
+    
+    # The operational stats (/api/health/cache, ...) need "Authorization:
+    # Bearer <STATS_TOKEN>"; they answer 404 while it is empty
+    STATS_TOKEN: str = ""
+    
+    # Day view response cache; max size 0 disables it. The backend is "memory"
+    # (per-process LRU) or "module:factory" returning an app.core.cache.CacheBackend
+    DAY_CACHE_BACKEND: str = "memory"
+    DAY_CACHE_MAX_SIZE: int = 10000
+    DAY_CACHE_TTL_SECONDS: int = 300
+    
     DATABASE_URL: str = "sqlite:///./achievement_tracker.db"
     
+    # Read replicas (same driver as DATABASE_URL), used round-robin by GET
+    # handlers that only read. A user's reads stay on the primary for
+    # READ_YOUR_WRITES_SECONDS after each of their writes; the pin store is
+    # "memory" (per process) or "module:factory" returning an
+    # app.core.cache.CacheBackend shared between workers. Replicas failing the
+    # health check, or lagging more than the max on PostgreSQL (keep it below
+    # the read-your-writes window), are skipped
+    READ_DATABASE_URLS: List[str] = []
+    READ_YOUR_WRITES_SECONDS: float = 10
+    READ_PIN_BACKEND: str = "memory"
+    READ_REPLICA_CHECK_SECONDS: float = 5
+    READ_REPLICA_MAX_LAG_SECONDS: float = 5
+    
+    # Connection pool (ignored for in-memory SQLite)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = False
+    
+    # SQLite performance profile, applied to every pooled connection
+    SQLITE_TUNING_ENABLED: bool = True
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024
+    SQLITE_CACHE_SIZE: int = -64000  # negative = KiB, i.e. ~64MB
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_TEMP_STORE: str = "MEMORY"
+    
+    # Longest span accepted by GET /api/days?start=&end=
+    MAX_DAY_RANGE_DAYS: int = 366
+    
+    # Most items accepted by one /batch request
+    MAX_BATCH_SIZE: int = 10000
+    
+    # Rows fetched per server-side cursor round-trip when streaming exports
+    EXPORT_YIELD_PER: int = 1000
+    
+    # Rows validated and committed per transaction by POST /api/import
+    IMPORT_BATCH_SIZE: int = 5000
+    
+    # Request metrics (/api/metrics, Server-Timing). Requests running more SQL
+    # statements than the budget are logged as possible N+1 patterns
+    METRICS_ENABLED: bool = True
+    QUERY_BUDGET: int = 20
+    
+    # Change feed (/api/events). The broker is "local" (single process) or
+    # "module:factory" returning an app.core.pubsub.Broker
+    EVENTS_BROKER: str = "local"
+    EVENTS_QUEUE_SIZE: int = 100  # undelivered events before a subscriber is dropped
+    EVENTS_HEARTBEAT_SECONDS: float = 15
+    
+    # Recurring todos: expanded occurrence dates cached per (rule, version, year).
+    # A COUNT/UNTIL-bounded rule must end within RECURRENCE_MAX_YEARS of its start
+    RECURRENCE_MAX_YEARS: int = 10
+    RECURRENCE_CACHE_MAX_SIZE: int = 50000
+    RECURRENCE_CACHE_TTL_SECONDS: int = 3600
+    
+    # Soft delete. Deleted achievements/todos can be restored for the retention
+    # period; then the purge job (every interval, in batches; 0 disables it
+    # in this process) moves them to the deleted_achievements/deleted_todos tables
+    SOFT_DELETE_RETENTION_DAYS: int = 30
+    TOMBSTONE_PURGE_INTERVAL_SECONDS: float = 3600
+    TOMBSTONE_PURGE_BATCH_SIZE: int = 1000
+    
+    # Cold storage. "python -m app.archive" moves rows dated more than the
+    # horizon ago to per-year archive tables, in batches per transaction
+    ARCHIVE_HORIZON_DAYS: int = 730
+    ARCHIVE_BATCH_SIZE: int = 5000
+    
+    # Startup. SCHEMA_STARTUP is "create" (create_all once per process, for
+    # development), "check" (fail fast unless Alembic created every table) or
+    # "skip" (trust the deploy's "alembic upgrade head"). Boots slower than
+    # STARTUP_BUDGET_MS, from the first app import to ready, are logged
+    SCHEMA_STARTUP: str = "create"
+    STARTUP_BUDGET_MS: int = 3000
+    
+    # Token-bucket rate limits, per user (JWT subject) or per client IP when
+    # anonymous; off unless RATE_LIMIT_ENABLED is set. RATE_LIMITS keys are "[METHOD ]/path/prefix" (longest match
+    # wins) or "default"; RATE_LIMIT_PER_IP caps every client IP on top. The
+    # backend is "memory" (per process) or "module:factory" returning an
+    # app.core.ratelimit.RateLimitStore shared between workers
+    RATE_LIMIT_ENABLED: bool = False
+    RATE_LIMITS: Dict[str, str] = {
+        "default": "120/minute",
+        "POST /api/auth/login": "10/minute",
+        "POST /api/auth/register": "5/minute",
+        "/api/import": "5/minute",
+        "/api/export": "10/minute",
+        "/api/search": "60/minute",
+    }
+    RATE_LIMIT_PER_IP: str = "600/minute"
+    RATE_LIMIT_EXEMPT: List[str] = ["/api/health", "/api/metrics"]
+    RATE_LIMIT_BACKEND: str = "memory"
+    RATE_LIMIT_SHARDS: int = 64
+    RATE_LIMIT_SWEEP_SECONDS: float = 60
+    RATE_LIMIT_TRUST_FORWARDED: bool = False  # client IP from X-Forwarded-For behind a proxy
+    
     CORS_ORIGINS: List[str] = [
         "http://localhost:5173",
         "http://localhost:3000",
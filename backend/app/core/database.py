@@ -1,24 +1,209 @@
-from sqlalchemy import create_engine
+import threading
+import time
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 
 from app.core.config import settings
+from app.core.metrics import record_query
+
+# Async driver -> sync driver used for create_all, Alembic and scripts
+ASYNC_DRIVERS = {
+    "sqlite+aiosqlite": "sqlite",
+    "postgresql+asyncpg": "postgresql",
+}
+
+
+def is_async_url(url: str) -> bool:
+    """Whether the URL names an async driver (aiosqlite / asyncpg)"""
+    return make_url(url).drivername in ASYNC_DRIVERS
+
+
+def to_sync_url(url: str) -> str:
+    """Swap an async driver for its sync counterpart"""
+    parsed = make_url(url)
+    drivername = ASYNC_DRIVERS.get(parsed.drivername, parsed.drivername)
+    return parsed.set(drivername=drivername).render_as_string(hide_password=False)
+
+
+def _connect_args(url: str) -> dict:
+    return {"check_same_thread": False} if "sqlite" in url else {}
+
+
+def _is_memory_sqlite(url: str) -> bool:
+    parsed = make_url(url)
+    return parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:")
+
+
+def _engine_kwargs(url: str, is_async: bool = False) -> dict:
+    """Connection and pool arguments shared by the sync and async engines"""
+    kwargs = {"connect_args": _connect_args(url)}
+    if not _is_memory_sqlite(url):
+        # Explicit pool class: aiosqlite would otherwise default to NullPool
+        kwargs.update(
+            poolclass=AsyncAdaptedQueuePool if is_async else QueuePool,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+            pool_pre_ping=settings.DB_POOL_PRE_PING,
+        )
+    return kwargs
+
+
+def sqlite_pragmas() -> dict:
+    """PRAGMA name -> value of the configured SQLite performance profile"""
+    return {
+        "journal_mode": settings.SQLITE_JOURNAL_MODE,
+        "synchronous": settings.SQLITE_SYNCHRONOUS,
+        "mmap_size": settings.SQLITE_MMAP_SIZE,
+        "cache_size": settings.SQLITE_CACHE_SIZE,
+        "busy_timeout": settings.SQLITE_BUSY_TIMEOUT_MS,
+        "temp_store": settings.SQLITE_TEMP_STORE,
+    }
+
+
+def apply_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """Connect hook: tune each new SQLite connection (WAL, mmap, caches, ...)"""
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in sqlite_pragmas().items():
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    record_query(statement, time.perf_counter() - conn.info["query_started"].pop())
+
+
+def _discard_query_timer(exception_context):
+    started = exception_context.connection.info.get("query_started") if exception_context.connection else None
+    if started:
+        started.pop()
 
-engine = create_engine(
-    settings.DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {}
-)
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def instrument_engine(sync_engine) -> None:
+    """Count statements and DB time against the current request (app.core.metrics)"""
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(sync_engine, "handle_error", _discard_query_timer)
+
+
+def configure_engine(sync_engine) -> None:
+    """Attach per-connection hooks to a (sync or async's underlying) engine"""
+    if sync_engine.dialect.name == "sqlite" and settings.SQLITE_TUNING_ENABLED:
+        event.listen(sync_engine, "connect", apply_sqlite_pragmas)
+    if settings.METRICS_ENABLED:
+        instrument_engine(sync_engine)
+
+
+ASYNC_MODE = is_async_url(settings.DATABASE_URL)
+SYNC_DATABASE_URL = to_sync_url(settings.DATABASE_URL)
+
+# Engines and session factories are built on first use rather than at import,
+# so importing the app (workers, tests, scripts) never touches the database.
+# The old module attributes (engine, SessionLocal, ...) resolve through
+# __getattr__ below.
+_lock = threading.Lock()
+_engine = None
+_session_factory = None
+_async_engine = None
+_async_session_factory = None
+
+
+def make_engine(url: str, is_async: bool = False):
+    """A configured sync or async engine for the URL (the primary or a read replica)"""
+    if is_async:
+        engine = create_async_engine(url, **_engine_kwargs(url, is_async=True))
+        configure_engine(engine.sync_engine)
+    else:
+        engine = create_engine(url, **_engine_kwargs(url))
+        configure_engine(engine)
+    return engine
+
+
+def get_engine():
+    """The sync engine, created on first call"""
+    global _engine, _session_factory
+    if _engine is None:
+        with _lock:
+            if _engine is None:
+                engine = make_engine(SYNC_DATABASE_URL)
+                _session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+                _engine = engine
+    return _engine
+
+
+def get_sessionmaker() -> sessionmaker:
+    get_engine()
+    return _session_factory
+
+
+def get_async_engine():
+    """The async engine, created on first call; only valid when DATABASE_URL selects an async driver"""
+    global _async_engine, _async_session_factory
+    if not ASYNC_MODE:
+        raise RuntimeError(f"DATABASE_URL does not use an async driver: {settings.DATABASE_URL}")
+    if _async_engine is None:
+        with _lock:
+            if _async_engine is None:
+                engine = make_engine(settings.DATABASE_URL, is_async=True)
+                _async_session_factory = async_sessionmaker(
+                    engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+                )
+                _async_engine = engine
+    return _async_engine
+
+
+def get_async_sessionmaker() -> async_sessionmaker:
+    get_async_engine()
+    return _async_session_factory
+
+
+async def dispose_engines() -> None:
+    """Close pooled connections, e.g. at shutdown; the engines reconnect if used again"""
+    if _engine is not None:
+        _engine.dispose()
+    if _async_engine is not None:
+        await _async_engine.dispose()
+
+
+_LAZY_ATTRIBUTES = {
+    "engine": get_engine,
+    "SessionLocal": get_sessionmaker,
+    "async_engine": lambda: get_async_engine() if ASYNC_MODE else None,
+    "AsyncSessionLocal": lambda: get_async_sessionmaker() if ASYNC_MODE else None,
+}
+
+
+def __getattr__(name: str):
+    if name in _LAZY_ATTRIBUTES:
+        return _LAZY_ATTRIBUTES[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 Base = declarative_base()
 
 
 def get_db():
     """Dependency for getting database session"""
-    db = SessionLocal()
+    db = get_sessionmaker()()
     try:
         yield db
     finally:
         db.close()
 
+
+async def get_async_db():
+    """Dependency for getting an async database session"""
+    async with get_async_sessionmaker()() as db:
+        yield db
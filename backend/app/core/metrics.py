@@ -0,0 +1,201 @@
+"""
+Request instrumentation.
+
+MetricsMiddleware times every HTTP request and keeps a RequestStats object
+in a context variable for its duration. The SQLAlchemy cursor hooks in
+app.core.database and the response renderers add their query counts, DB
+time and serialization time to it. The totals are exported at /api/metrics
+in the Prometheus text format and, per response, in a Server-Timing header.
+A request that runs more than QUERY_BUDGET statements is logged with its
+most repeated statement, the usual signature of an N+1 loop.
+"""
+import logging
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Optional, Tuple
+
+from fastapi.responses import ORJSONResponse
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class RequestStats:
+    __slots__ = ("queries", "db_seconds", "serialize_seconds", "statements")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.serialize_seconds = 0.0
+        self.statements: Counter = Counter()
+
+    def server_timing(self, total_seconds: float) -> str:
+        return (
+            f'app;dur={total_seconds * 1000:.2f}, '
+            f'db;dur={self.db_seconds * 1000:.2f};desc="{self.queries} queries", '
+            f'ser;dur={self.serialize_seconds * 1000:.2f}'
+        )
+
+
+_current: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def record_query(statement: str, seconds: float) -> None:
+    """Count one executed statement against the current request, if any"""
+    stats = _current.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_seconds += seconds
+        stats.statements[statement] += 1
+
+
+@contextmanager
+def timed_serialization():
+    stats = _current.get()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if stats is not None:
+            stats.serialize_seconds += time.perf_counter() - start
+
+
+class TimedORJSONResponse(ORJSONResponse):
+    """ORJSONResponse that reports its encoding time as serialization"""
+
+    def render(self, content) -> bytes:
+        with timed_serialization():
+            return super().render(content)
+
+
+class Registry:
+    """Thread-safe counters, gauges and histograms rendered in the Prometheus text format"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[Labels, float]] = defaultdict(lambda: defaultdict(float))
+        self._histograms: Dict[str, Dict[Labels, list]] = defaultdict(dict)
+        self._gauges: Dict[str, Dict[Labels, float]] = defaultdict(dict)
+        self._help: Dict[str, Tuple[str, str]] = {}
+
+    def describe(self, name: str, kind: str, text: str) -> None:
+        self._help[name] = (kind, text)
+
+    def inc(self, name: str, labels: Labels, value: float = 1) -> None:
+        with self._lock:
+            self._counters[name][labels] += value
+
+    def set(self, name: str, labels: Labels, value: float) -> None:
+        with self._lock:
+            self._gauges[name][labels] = value
+
+    def observe(self, name: str, labels: Labels, value: float) -> None:
+        with self._lock:
+            series = self._histograms[name].get(labels)
+            if series is None:
+                # per-bucket counts, then sum and count
+                series = self._histograms[name][labels] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+            self._gauges.clear()
+
+    def render(self) -> str:
+        lines = []
+        with self._lock:
+            for name in sorted(set(self._counters) | set(self._histograms) | set(self._gauges) | set(self._help)):
+                kind, text = self._help.get(name, ("counter", ""))
+                lines.append(f"# HELP {name} {text}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in sorted({**self._counters.get(name, {}), **self._gauges.get(name, {})}.items()):
+                    lines.append(f"{name}{_format(labels)} {value:g}")
+                for labels, series in sorted(self._histograms.get(name, {}).items()):
+                    for bound, count in zip(self.buckets, series):
+                        lines.append(f"{name}_bucket{_format(labels + (('le', f'{bound:g}'),))} {count}")
+                    lines.append(f"{name}_bucket{_format(labels + (('le', '+Inf'),))} {series[-1]}")
+                    lines.append(f"{name}_sum{_format(labels)} {series[-2]:g}")
+                    lines.append(f"{name}_count{_format(labels)} {series[-1]}")
+        return "\n".join(lines) + "\n"
+
+
+def _format(labels: Labels) -> str:
+    if not labels:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace('"', '\\"') for _, value in labels)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(labels, escaped)) + "}"
+
+
+registry = Registry()
+registry.describe("http_requests_total", "counter", "Requests by route and status code")
+registry.describe("http_request_duration_seconds", "histogram", "Request latency by route")
+registry.describe("http_request_db_queries_total", "counter", "SQL statements executed by route")
+registry.describe("http_request_db_seconds_total", "counter", "Time spent in SQL statements by route")
+registry.describe("http_request_serialize_seconds_total", "counter", "Time spent rendering response bodies by route")
+registry.describe("http_query_budget_exceeded_total", "counter", "Requests that ran more than QUERY_BUDGET statements")
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware, so streaming responses pass through untouched"""
+
+    def __init__(self, app, query_budget: Optional[int] = None):
+        self.app = app
+        self.query_budget = settings.QUERY_BUDGET if query_budget is None else query_budget
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _current.set(stats)
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_with_timing(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", stats.server_timing(time.perf_counter() - start).encode()))
+                if stats.queries > self.query_budget:
+                    headers.append((b"x-query-budget-exceeded", str(stats.queries).encode()))
+                message = dict(message, headers=headers)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            self.observe(scope, status_code, time.perf_counter() - start, stats)
+
+    def observe(self, scope, status_code: int, seconds: float, stats: RequestStats) -> None:
+        route = scope.get("route")
+        labels = (("method", scope["method"]), ("route", getattr(route, "path", "unmatched")))
+        registry.inc("http_requests_total", labels + (("status", str(status_code)),))
+        registry.observe("http_request_duration_seconds", labels, seconds)
+        registry.inc("http_request_db_queries_total", labels, stats.queries)
+        registry.inc("http_request_db_seconds_total", labels, stats.db_seconds)
+        registry.inc("http_request_serialize_seconds_total", labels, stats.serialize_seconds)
+        if stats.queries > self.query_budget:
+            registry.inc("http_query_budget_exceeded_total", labels)
+            statement, repeats = stats.statements.most_common(1)[0]
+            logger.warning(
+                "%s %s ran %d SQL statements (budget %d), possible N+1; most repeated (x%d): %s",
+                labels[0][1], labels[1][1], stats.queries, self.query_budget, repeats, " ".join(statement.split()),
+            )
@@ -0,0 +1,18 @@
+"""
+Pluggable backends named by a "module:factory" setting.
+
+DAY_CACHE_BACKEND, READ_PIN_BACKEND, RATE_LIMIT_BACKEND and EVENTS_BROKER
+each take either a built-in name or the import path of a factory; the
+factory is imported and called when the module using it is loaded.
+"""
+import importlib
+from typing import Any
+
+
+def load_plugin(spec: str, **kwargs) -> Any:
+    """Import the factory named by "module:factory" and call it with kwargs"""
+    module_name, sep, factory_name = spec.partition(":")
+    if not sep or not module_name or not factory_name:
+        raise ValueError(f"Expected 'module:factory', got {spec!r}")
+    factory = getattr(importlib.import_module(module_name), factory_name)
+    return factory(**kwargs)
@@ -0,0 +1,135 @@
+"""
+In-process async pub/sub hub with a pluggable broker.
+
+Publishers (request handlers, possibly on worker threads) hand messages
+to the broker; the broker delivers them to every process's hub, which
+fans them out to its local subscribers. Each subscriber has a bounded
+queue on its own event loop. A subscriber whose queue fills up is
+dropped rather than allowed to buffer without limit or slow down
+publishers. It receives DROPPED and is expected to reconnect and refetch.
+"""
+import asyncio
+import threading
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from typing import Callable, Dict, Optional, Set
+
+# Sentinels yielded by Subscription.get
+HEARTBEAT = object()
+DROPPED = object()
+
+
+class Broker(ABC):
+    """Transport between publishers and hubs
+    
+    A cross-process broker (Redis pub/sub, Postgres LISTEN/NOTIFY, ...)
+    forwards publish() to every process and calls the attached deliver
+    callback for each message it receives.
+    """
+
+    @abstractmethod
+    def attach(self, deliver: Callable[[str, dict], None]) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def publish(self, channel: str, message: dict) -> None:
+        raise NotImplementedError
+
+
+class LocalBroker(Broker):
+    """Single-process broker: publish delivers straight to the local hub"""
+
+    def __init__(self):
+        self._deliver: Optional[Callable[[str, dict], None]] = None
+
+    def attach(self, deliver: Callable[[str, dict], None]) -> None:
+        self._deliver = deliver
+
+    def publish(self, channel: str, message: dict) -> None:
+        if self._deliver is not None:
+            self._deliver(channel, message)
+
+
+class Subscription:
+    def __init__(self, hub: "PubSubHub", channel: str, max_queue: int):
+        self.hub = hub
+        self.channel = channel
+        self.loop = asyncio.get_running_loop()
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue + 1)  # +1 for DROPPED
+        self.max_queue = max_queue
+        self.closed = False
+
+    def offer(self, message: dict) -> None:
+        """Enqueue on the subscriber's loop; drop the subscriber when it lags"""
+        if self.closed:
+            return
+        if self.queue.qsize() >= self.max_queue:
+            self.closed = True
+            self.hub.dropped += 1
+            self.hub.unsubscribe(self)
+            # Discard the backlog so the drop notice is read next
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(DROPPED)
+            return
+        self.queue.put_nowait(message)
+
+    async def get(self, timeout: float):
+        """Next message, HEARTBEAT after timeout seconds of silence, or DROPPED"""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return HEARTBEAT
+
+
+class PubSubHub:
+    def __init__(self, broker: Broker, max_queue: int):
+        self.broker = broker
+        self.max_queue = max_queue
+        self._lock = threading.Lock()
+        self._subscribers: Dict[str, Set[Subscription]] = defaultdict(set)
+        self.published = 0
+        self.delivered = 0
+        self.dropped = 0
+        broker.attach(self._deliver)
+
+    def subscribe(self, channel: str) -> Subscription:
+        """Register a subscriber; must be called on the event loop that consumes it"""
+        subscription = Subscription(self, channel, self.max_queue)
+        with self._lock:
+            self._subscribers[channel].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.channel)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.channel]
+
+    def publish(self, channel: str, message: dict) -> None:
+        """Thread-safe; never blocks on subscribers"""
+        self.published += 1
+        self.broker.publish(channel, message)
+
+    def _deliver(self, channel: str, message: dict) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, ()))
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.offer, message)
+                self.delivered += 1
+            except RuntimeError:
+                # The subscriber's loop has shut down
+                self.unsubscribe(subscription)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            subscribers = sum(len(subs) for subs in self._subscribers.values())
+        return {
+            "subscribers": subscribers,
+            "published": self.published,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+        }
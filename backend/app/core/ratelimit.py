@@ -0,0 +1,271 @@
+"""
+Token-bucket rate limiting in front of every endpoint.
+
+RateLimitMiddleware charges each request one token from two buckets:
+- the route's limit, per user (the JWT subject) or per client IP when
+  the request is anonymous
+- RATE_LIMIT_PER_IP, an overall cap per client IP
+Route limits come from Settings.RATE_LIMITS, keyed by path prefix and
+optionally a method ("POST /api/auth/login"); the longest match wins.
+
+Buckets live in a RateLimitStore. The default ShardedMemoryStore keeps
+them in hash-sharded dicts, each behind its own lock, so a check is one
+dict lookup under an uncontended lock. Each shard drops its refilled
+buckets itself every RATE_LIMIT_SWEEP_SECONDS. A full bucket is
+indistinguishable from a missing one, so memory only holds active
+clients. A store shared between workers (Redis, ...) implements the same
+take() and is selected with RATE_LIMIT_BACKEND="module:factory".
+"""
+import threading
+import time
+from abc import ABC, abstractmethod
+from math import ceil
+from typing import Dict, Hashable, List, Optional, Tuple
+
+import orjson
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.metrics import registry
+from app.core.plugins import load_plugin
+from app.core.security import decode_access_token
+
+PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+registry.describe("http_rate_limited_total", "counter", "Requests rejected with 429 by limit")
+
+
+class Limit:
+    """``count`` requests per ``seconds``, refilled continuously, bursting up to ``count``"""
+    __slots__ = ("text", "count", "rate")
+
+    def __init__(self, count: int, seconds: float, text: str = ""):
+        if count < 1 or seconds <= 0:
+            raise ValueError(f"Invalid rate limit {text!r}")
+        self.text = text or f"{count}/{seconds}s"
+        self.count = count
+        self.rate = count / seconds
+
+
+def parse_limit(text: str) -> Limit:
+    """Limit for "N/second", "N/minute", "N/hour" or "N/day" """
+    count, _, period = text.partition("/")
+    try:
+        return Limit(int(count), PERIODS[period.strip().lower()], text)
+    except (KeyError, ValueError):
+        raise ValueError(f"Invalid rate limit {text!r}, expected e.g. '120/minute'")
+
+
+# (allowed, tokens left, seconds until the next token)
+Decision = Tuple[bool, int, float]
+
+
+class RateLimitStore(ABC):
+    """Bucket storage interface; a shared store must make take() atomic"""
+
+    @abstractmethod
+    def take(self, key: Hashable, limit: Limit, now: Optional[float] = None) -> Decision:
+        raise NotImplementedError
+
+    @abstractmethod
+    def clear(self) -> None:
+        raise NotImplementedError
+
+    def stats(self) -> Dict[str, int]:
+        return {}
+
+
+class _Shard:
+    __slots__ = ("lock", "buckets", "swept_at")
+
+    def __init__(self, now: float):
+        self.lock = threading.Lock()
+        # key -> [tokens, updated_at, full_at]
+        self.buckets: Dict[Hashable, list] = {}
+        self.swept_at = now
+
+
+class ShardedMemoryStore(RateLimitStore):
+    def __init__(self, shards: int = 64, sweep_seconds: float = 60):
+        if shards < 1 or shards & (shards - 1):
+            raise ValueError("shards must be a power of two")
+        now = time.monotonic()
+        self._shards = [_Shard(now) for _ in range(shards)]
+        self._mask = shards - 1
+        self.sweep_seconds = sweep_seconds
+        self.allowed = 0
+        self.rejected = 0
+        self.swept = 0
+
+    def take(self, key: Hashable, limit: Limit, now: Optional[float] = None) -> Decision:
+        if now is None:
+            now = time.monotonic()
+        shard = self._shards[hash(key) & self._mask]
+        with shard.lock:
+            bucket = shard.buckets.get(key)
+            if bucket is None:
+                tokens = limit.count
+            else:
+                tokens = min(limit.count, bucket[0] + (now - bucket[1]) * limit.rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            shard.buckets[key] = [tokens, now, now + (limit.count - tokens) / limit.rate]
+            if now - shard.swept_at >= self.sweep_seconds:
+                self._sweep(shard, now)
+        if allowed:
+            self.allowed += 1
+            return True, int(tokens), 0.0
+        self.rejected += 1
+        return False, 0, (1 - tokens) / limit.rate
+
+    def _sweep(self, shard: _Shard, now: float) -> None:
+        """Drop buckets that have refilled; call with the shard lock held"""
+        full = [key for key, bucket in shard.buckets.items() if bucket[2] <= now]
+        for key in full:
+            del shard.buckets[key]
+        shard.swept_at = now
+        self.swept += len(full)
+
+    def sweep(self, now: Optional[float] = None) -> None:
+        now = time.monotonic() if now is None else now
+        for shard in self._shards:
+            with shard.lock:
+                self._sweep(shard, now)
+
+    def clear(self) -> None:
+        for shard in self._shards:
+            with shard.lock:
+                shard.buckets.clear()
+
+    def __len__(self) -> int:
+        return sum(len(shard.buckets) for shard in self._shards)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "buckets": len(self),
+            "shards": len(self._shards),
+            "allowed": self.allowed,
+            "rejected": self.rejected,
+            "swept": self.swept,
+        }
+
+
+def create_store() -> RateLimitStore:
+    """Build the store named by RATE_LIMIT_BACKEND"""
+    if settings.RATE_LIMIT_BACKEND == "memory":
+        return ShardedMemoryStore(shards=settings.RATE_LIMIT_SHARDS, sweep_seconds=settings.RATE_LIMIT_SWEEP_SECONDS)
+    return load_plugin(settings.RATE_LIMIT_BACKEND)
+
+
+rate_limit_store = create_store()
+
+# Verified token -> JWT subject, kept apart from the auth token cache so its
+# hit counters only reflect authentication
+subject_cache = TTLCache(max_size=settings.TOKEN_CACHE_MAX_SIZE, ttl_seconds=settings.AUTH_CACHE_TTL_SECONDS)
+
+
+def token_subject(token: str) -> Optional[str]:
+    subject = subject_cache.get(token)
+    if subject is None:
+        payload = decode_access_token(token)
+        if not payload or not payload.get("sub"):
+            return None
+        subject = payload["sub"]
+        subject_cache.set(token, subject, ttl_seconds=payload.get("exp", 0) - time.time())
+    return subject
+
+
+def _header(scope, name: bytes) -> Optional[bytes]:
+    for key, value in scope["headers"]:
+        if key == name:
+            return value
+    return None
+
+
+class RateLimitMiddleware:
+    """Pure ASGI middleware; rejected requests never reach routing or the database"""
+
+    def __init__(self, app, store: Optional[RateLimitStore] = None, limits: Optional[Dict[str, str]] = None,
+                 per_ip: Optional[str] = None, exempt: Optional[List[str]] = None):
+        self.app = app
+        self.store = rate_limit_store if store is None else store
+        limits = settings.RATE_LIMITS if limits is None else limits
+        self.default = parse_limit(limits.get("default", settings.RATE_LIMIT_PER_IP))
+        # (method or None, prefix, limit), longest prefix first
+        self.routes = []
+        for pattern, text in limits.items():
+            if pattern == "default":
+                continue
+            method, _, prefix = pattern.rpartition(" ")
+            self.routes.append((method.upper() or None, prefix, parse_limit(text)))
+        self.routes.sort(key=lambda route: (len(route[1]), route[0] is not None), reverse=True)
+        self.per_ip = parse_limit(settings.RATE_LIMIT_PER_IP if per_ip is None else per_ip)
+        self.exempt = tuple(settings.RATE_LIMIT_EXEMPT if exempt is None else exempt)
+
+    def limit_for(self, method: str, path: str) -> Tuple[str, Limit]:
+        for route_method, prefix, limit in self.routes:
+            if path.startswith(prefix) and (route_method is None or route_method == method):
+                return prefix, limit
+        return "default", self.default
+
+    def client_ip(self, scope) -> str:
+        if settings.RATE_LIMIT_TRUST_FORWARDED:
+            forwarded = _header(scope, b"x-forwarded-for")
+            if forwarded:
+                return forwarded.split(b",", 1)[0].strip().decode("latin-1")
+        client = scope.get("client")
+        return client[0] if client else "unknown"
+
+    def identity(self, scope, ip: str) -> str:
+        """The JWT subject for a valid bearer token, else the client IP"""
+        authorization = _header(scope, b"authorization")
+        if authorization and authorization[:7].lower() == b"bearer ":
+            subject = token_subject(authorization[7:].decode("latin-1"))
+            if subject:
+                return f"user:{subject}"
+        return f"ip:{ip}"
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"].startswith(self.exempt):
+            await self.app(scope, receive, send)
+            return
+
+        ip = self.client_ip(scope)
+        allowed, _, retry_after = self.store.take(("ip", ip), self.per_ip)
+        name, limit = "ip", self.per_ip
+        remaining = None
+        if allowed:
+            name, limit = self.limit_for(scope["method"], scope["path"])
+            allowed, remaining, retry_after = self.store.take((name, self.identity(scope, ip)), limit)
+        if not allowed:
+            registry.inc("http_rate_limited_total", (("limit", name),))
+            await self.reject(send, limit, retry_after)
+            return
+
+        limit_headers = [
+            (b"x-ratelimit-limit", limit.text.encode()),
+            (b"x-ratelimit-remaining", str(remaining).encode()),
+        ]
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                message = dict(message, headers=list(message.get("headers", [])) + limit_headers)
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+    async def reject(self, send, limit: Limit, retry_after: float) -> None:
+        body = orjson.dumps({"detail": "Too many requests, please retry later"})
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(max(1, ceil(retry_after))).encode()),
+                (b"x-ratelimit-limit", limit.text.encode()),
+                (b"x-ratelimit-remaining", b"0"),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
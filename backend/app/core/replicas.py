@@ -0,0 +1,287 @@
+"""
+Read replicas.
+
+With READ_DATABASE_URLS set, GET handlers that only read (day views, the
+profile, lists, search, stats, export) and the user lookup of their auth
+take the session of ``get_read_db`` (``get_async_read_db`` for the async
+routers), which picks a replica round-robin. Everything else keeps the
+primary session of ``get_db``, and so do the reads of a user for
+READ_YOUR_WRITES_SECONDS after any write request of theirs: when such a
+request starts, ``get_read_db`` (which ``get_current_user`` depends on)
+pins its token subject in ``pinned_writers``. A user just registered may be
+missing on a lagging replica, so the auth lookup falls back to the primary
+(``primary_session``).
+
+A replica leaves the rotation when a query on it fails with an operational
+error or when the health check (a read of the users table and, on
+PostgreSQL, the replay lag against READ_REPLICA_MAX_LAG_SECONDS) fails. The
+app lifespan checks every replica before serving and then every
+READ_REPLICA_CHECK_SECONDS; a passing check brings it back. With no healthy
+replica, reads go to the primary. Without READ_DATABASE_URLS both
+dependencies return the ``get_db`` session, so nothing changes.
+"""
+import asyncio
+import itertools
+import logging
+import threading
+from typing import Iterable, List, Optional
+
+from fastapi import Depends, Request
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import event, exc, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.cache import CacheBackend, TTLCache
+from app.core.config import settings
+from app.core.database import ASYNC_MODE, get_async_db, get_db, make_engine, to_sync_url
+from app.core.plugins import load_plugin
+from app.core.ratelimit import token_subject
+
+logger = logging.getLogger(__name__)
+
+READ_METHODS = frozenset({"GET", "HEAD"})
+
+HEALTH_CHECK = text("SELECT 1 FROM users LIMIT 1")
+# Seconds since the last replayed transaction, 0 while the replica has replayed all it received
+POSTGRES_LAG = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+
+
+class Replica:
+    """One read replica: its engine, session factory and health"""
+
+    def __init__(self, url: str, is_async: bool = False):
+        self.url = make_url(url).render_as_string(hide_password=True)
+        self.engine = make_engine(url, is_async)
+        if is_async:
+            self.sessions = async_sessionmaker(
+                self.engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+            )
+            event.listen(self.engine.sync_engine, "handle_error", self._on_error)
+        else:
+            self.sessions = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+            event.listen(self.engine, "handle_error", self._on_error)
+        self.healthy = True
+        self.reads = 0
+        self.failures = 0
+        self.lag_seconds: Optional[float] = None
+        self.error: Optional[str] = None
+
+    def _on_error(self, context) -> None:
+        # Operational errors mean the replica is unreachable, broken or not a copy
+        if isinstance(context.sqlalchemy_exception, exc.OperationalError):
+            self.mark_down(context.original_exception)
+
+    def mark_down(self, error: BaseException) -> None:
+        """Leave the rotation until a health check passes; failures counts the times"""
+        if self.healthy:
+            logger.warning("Read replica %s is down: %s", self.url, error)
+            self.failures += 1
+        self.healthy = False
+        self.error = str(error)
+
+    def _probe(self, connection) -> None:
+        connection.execute(HEALTH_CHECK)
+        if connection.dialect.name == "postgresql":
+            self.lag_seconds = float(connection.execute(POSTGRES_LAG).scalar() or 0)
+            if self.lag_seconds > settings.READ_REPLICA_MAX_LAG_SECONDS:
+                raise RuntimeError(f"replication lag {self.lag_seconds:.1f}s")
+
+    def _passed(self) -> bool:
+        if not self.healthy:
+            logger.info("Read replica %s is back", self.url)
+        self.healthy = True
+        self.error = None
+        return True
+
+    def check(self) -> bool:
+        """Probe the replica (blocking); whether it is healthy"""
+        try:
+            with self.engine.connect() as connection:
+                self._probe(connection)
+        except Exception as error:
+            self.mark_down(error)
+            return False
+        return self._passed()
+
+    async def check_async(self) -> bool:
+        """Probe an async replica; whether it is healthy"""
+        try:
+            async with self.engine.connect() as connection:
+                await connection.run_sync(self._probe)
+        except Exception as error:
+            self.mark_down(error)
+            return False
+        return self._passed()
+
+    def stats(self) -> dict:
+        return {
+            "url": self.url,
+            "healthy": self.healthy,
+            "reads": self.reads,
+            "failures": self.failures,
+            "lag_seconds": self.lag_seconds,
+            "error": self.error,
+        }
+
+
+class ReplicaSet:
+    """Round-robin over the healthy replicas"""
+
+    def __init__(self, replicas: Iterable[Replica], is_async: bool = False):
+        self.replicas: List[Replica] = list(replicas)
+        self.is_async = is_async
+        self._turns = itertools.count()
+
+    def choose(self) -> Optional[Replica]:
+        """The next healthy replica, or None when all are down"""
+        count = len(self.replicas)
+        start = next(self._turns)
+        for offset in range(count):
+            replica = self.replicas[(start + offset) % count]
+            if replica.healthy:
+                replica.reads += 1
+                return replica
+        return None
+
+    async def check(self) -> int:
+        """Probe every replica; how many are healthy"""
+        if self.is_async:
+            results = await asyncio.gather(*(replica.check_async() for replica in self.replicas))
+        else:
+            results = [await run_in_threadpool(replica.check) for replica in self.replicas]
+        return sum(results)
+
+    async def dispose(self) -> None:
+        for replica in self.replicas:
+            if self.is_async:
+                await replica.engine.dispose()
+            else:
+                replica.engine.dispose()
+
+    def stats(self) -> List[dict]:
+        return [replica.stats() for replica in self.replicas]
+
+
+def create_pin_store() -> CacheBackend:
+    """Build the store named by READ_PIN_BACKEND"""
+    # One entry per user writing within the window, so sized like the user cache
+    if settings.READ_PIN_BACKEND == "memory":
+        return TTLCache(max_size=settings.USER_CACHE_MAX_SIZE, ttl_seconds=settings.READ_YOUR_WRITES_SECONDS)
+    return load_plugin(
+        settings.READ_PIN_BACKEND, max_size=settings.USER_CACHE_MAX_SIZE, ttl_seconds=settings.READ_YOUR_WRITES_SECONDS
+    )
+
+
+pinned_writers = create_pin_store()
+
+# Built from READ_DATABASE_URLS on first use, like the primary engines
+_lock = threading.Lock()
+_replicas: Optional[ReplicaSet] = None
+_async_replicas: Optional[ReplicaSet] = None
+
+
+def get_read_replicas() -> ReplicaSet:
+    """Sync engines of the replicas, for the sync routers (in both modes)"""
+    global _replicas
+    if _replicas is None:
+        with _lock:
+            if _replicas is None:
+                _replicas = ReplicaSet(Replica(to_sync_url(url)) for url in settings.READ_DATABASE_URLS)
+    return _replicas
+
+
+def get_async_read_replicas() -> ReplicaSet:
+    """Async engines of the replicas, for the async routers"""
+    global _async_replicas
+    if _async_replicas is None:
+        with _lock:
+            if _async_replicas is None:
+                _async_replicas = ReplicaSet(
+                    (Replica(url, is_async=True) for url in settings.READ_DATABASE_URLS), is_async=True
+                )
+    return _async_replicas
+
+
+def _replica_sets() -> List[ReplicaSet]:
+    if not settings.READ_DATABASE_URLS:
+        return []
+    return [get_read_replicas()] + ([get_async_read_replicas()] if ASYNC_MODE else [])
+
+
+async def check_replicas() -> None:
+    for replicas in _replica_sets():
+        await replicas.check()
+
+
+async def check_replicas_periodically(interval_seconds: float) -> None:
+    """Background loop started by the app lifespan; cancelled on shutdown"""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            await check_replicas()
+        except Exception:
+            logger.exception("Checking read replicas failed")
+
+
+async def dispose_replicas() -> None:
+    """Close the replica engines; they are rebuilt from the settings if used again"""
+    global _replicas, _async_replicas
+    for replicas in (_replicas, _async_replicas):
+        if replicas is not None:
+            await replicas.dispose()
+    _replicas = _async_replicas = None
+
+
+def replica_stats() -> dict:
+    return {
+        "replicas": [replica for replicas in _replica_sets() for replica in replicas.stats()],
+        "pinned_writers": pinned_writers.stats(),
+    }
+
+
+def _reads_replica(request: Request) -> bool:
+    """Whether the request may read from a replica; pins the subject of writes"""
+    if not settings.READ_DATABASE_URLS:
+        return False
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    subject = token_subject(token) if scheme.lower() == "bearer" and token else None
+    if request.method not in READ_METHODS:
+        if subject is not None:
+            pinned_writers.set(subject, True)
+        return False
+    return subject is None or pinned_writers.get(subject) is None
+
+
+def primary_session(db):
+    """The primary session behind a replica session (the session itself otherwise)"""
+    return db.info.get("primary", db)
+
+
+def get_read_db(request: Request, db: Session = Depends(get_db)):
+    """Dependency for a session of the next healthy replica, or the primary one"""
+    replica = get_read_replicas().choose() if _reads_replica(request) else None
+    if replica is None:
+        yield db
+        return
+    
+    replica_db = replica.sessions(info={"primary": db})
+    try:
+        yield replica_db
+    finally:
+        replica_db.close()
+
+
+async def get_async_read_db(request: Request, db: AsyncSession = Depends(get_async_db)):
+    """Dependency for an async session of the next healthy replica, or the primary one"""
+    replica = get_async_read_replicas().choose() if _reads_replica(request) else None
+    if replica is None:
+        yield db
+        return
+
+    async with replica.sessions(info={"primary": db}) as replica_db:
+        yield replica_db
@@ -1,10 +1,21 @@
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Callable, Optional
 from jose import JWTError, jwt
+import asyncio
 import bcrypt
+import threading
+import time
 
+from app.core.cache import TTLCache
 from app.core.config import settings
 
+# Already-verified tokens, so repeat requests skip signature verification
+token_cache = TTLCache(
+    max_size=settings.TOKEN_CACHE_MAX_SIZE,
+    ttl_seconds=settings.AUTH_CACHE_TTL_SECONDS,
+)
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash"""
@@ -25,12 +36,66 @@ def get_password_hash(password: str) -> str:
     if isinstance(password, str):
         password = password.encode('utf-8')
     # Generate salt and hash
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS)
     hashed = bcrypt.hashpw(password, salt)
     # Return as string for database storage
     return hashed.decode('utf-8')
 
 
+def needs_rehash(hashed_password: str) -> bool:
+    """Whether a stored hash was made with a different bcrypt cost than configured"""
+    try:
+        # Format: $2b$<cost>$<salt+hash>
+        return int(hashed_password.split("$")[2]) != settings.BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return True
+
+
+class PasswordHashPoolFull(Exception):
+    """Raised when too many password hashes are already queued"""
+
+
+class PasswordHashPool:
+    """Size-limited executor for bcrypt work with a bounded queue
+    
+    bcrypt releases the GIL, so threads are enough to run hashes in parallel
+    while keeping them off the request threadpool. Submissions beyond
+    ``max_pending`` (running + queued) are rejected instead of piling up.
+    """
+
+    def __init__(self, max_workers: int, max_pending: int):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bcrypt")
+        self._slots = threading.BoundedSemaphore(max_pending)
+
+    def submit(self, fn: Callable, *args) -> Future:
+        if not self._slots.acquire(blocking=False):
+            raise PasswordHashPoolFull()
+        try:
+            future = self._executor.submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def run(self, fn: Callable, *args):
+        """Run fn in the pool and wait for the result"""
+        return self.submit(fn, *args).result()
+
+    async def run_async(self, fn: Callable, *args):
+        """Run fn in the pool without blocking the event loop"""
+        return await asyncio.wrap_future(self.submit(fn, *args))
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+password_pool = PasswordHashPool(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token"""
     to_encode = data.copy()
@@ -52,3 +117,18 @@ def decode_access_token(token: str) -> Optional[dict]:
     except JWTError:
         return None
 
+
+def decode_access_token_cached(token: str) -> Optional[dict]:
+    """Decode a JWT token, reusing the result of a previous verification"""
+    payload = token_cache.get(token)
+    if payload is not None:
+        if payload.get("exp", 0) > time.time():
+            return payload
+        token_cache.delete(token)
+        return None
+    
+    payload = decode_access_token(token)
+    if payload is not None:
+        # Never keep a token around longer than it is valid
+        token_cache.set(token, payload, ttl_seconds=payload.get("exp", 0) - time.time())
+    return payload
@@ -0,0 +1,95 @@
+"""
+Server-side cache of rendered day view JSON keyed by (user_id, date).
+
+Entries are stored together with the day version they were built
+from. The day route reads that version anyway (for its ETag), so an entry
+is only served while the version still matches; this keeps processes with
+their own in-memory cache, or a write racing a reload, from ever serving
+stale data. Writes also evict their days eagerly: app.summaries records
+the days each transaction touches on the connection and they are dropped
+when it commits, which covers the single-row routes, the batch endpoints
+and import alike.
+"""
+from datetime import date
+from typing import Awaitable, Callable, Iterable, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.cache import CacheBackend, SingleFlight, TTLCache
+from app.core.config import settings
+from app.core.plugins import load_plugin
+
+DayKey = Tuple[int, date]
+DayVersion = Tuple[int, int, Optional[date]]  # see app.api.etag.day_version_statement
+
+
+def create_backend() -> CacheBackend:
+    """Build the store named by DAY_CACHE_BACKEND"""
+    if settings.DAY_CACHE_BACKEND == "memory":
+        return TTLCache(max_size=settings.DAY_CACHE_MAX_SIZE, ttl_seconds=settings.DAY_CACHE_TTL_SECONDS)
+    return load_plugin(
+        settings.DAY_CACHE_BACKEND, max_size=settings.DAY_CACHE_MAX_SIZE, ttl_seconds=settings.DAY_CACHE_TTL_SECONDS
+    )
+
+
+day_cache = create_backend()
+_loads = SingleFlight()
+
+
+def _cached(key: DayKey, version: DayVersion):
+    entry = day_cache.get(key)
+    if entry is not None and entry[0] == version:
+        return entry[1]
+    return None
+
+
+def get_day_view(user_id: int, day: date, version: DayVersion,
+                 load: Callable[[], bytes]) -> bytes:
+    """Cached day view, loading it once for concurrent misses"""
+    key = (user_id, day)
+    view = _cached(key, version)
+    if view is not None:
+        return view
+    
+    def load_and_store():
+        view = load()
+        day_cache.set(key, (version, view))
+        return view
+    
+    return _loads.do((user_id, day, version), load_and_store)
+
+
+async def get_day_view_async(user_id: int, day: date, version: DayVersion,
+                             load: Callable[[], Awaitable[bytes]]) -> bytes:
+    key = (user_id, day)
+    view = _cached(key, version)
+    if view is not None:
+        return view
+    
+    async def load_and_store():
+        view = await load()
+        day_cache.set(key, (version, view))
+        return view
+    
+    return await _loads.do_async((user_id, day, version), load_and_store)
+
+
+def invalidate_days(keys: Iterable[DayKey]) -> None:
+    for key in keys:
+        day_cache.delete(key)
+
+
+def day_cache_stats() -> dict:
+    """Store counters plus how many misses were coalesced by the stampede guard"""
+    return {**day_cache.stats(), **_loads.stats()}
+
+
+@event.listens_for(Engine, "commit")
+def _evict_written_days(connection):
+    invalidate_days(connection.info.pop("written_days", ()))
+
+
+@event.listens_for(Engine, "rollback")
+def _forget_written_days(connection):
+    connection.info.pop("written_days", None)
@@ -1,19 +1,56 @@
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager
+
+from fastapi import Depends, FastAPI, Request, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
 
 from app.core.config import settings
-from app.core.database import engine, Base
-from app.api import auth, user, days, achievements, todos
+from app.core.database import ASYNC_MODE, dispose_engines
+from app.core.metrics import MetricsMiddleware, TimedORJSONResponse, registry
+from app.core.ratelimit import RateLimitMiddleware, rate_limit_store, subject_cache
+from app.core.replicas import check_replicas, check_replicas_periodically, dispose_replicas, replica_stats
+from app.core.security import PasswordHashPoolFull
+from app.api import export, imports, stats, search, events, sync, recurring
+from app.api.dependencies import auth_cache_stats, require_stats_token
+from app.day_cache import day_cache_stats
+from app.recurrence import recurrence_cache_stats
+from app.changes import hub
+from app import startup, tombstones
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Prepare the schema and check the read replicas before serving; close pooled connections on shutdown"""
+    await run_in_threadpool(startup.prepare_schema)
+    tasks = []
+    if settings.READ_DATABASE_URLS:
+        # Replicas failing the first check only serve once a later one passes
+        await check_replicas()
+        tasks.append(asyncio.create_task(check_replicas_periodically(settings.READ_REPLICA_CHECK_SECONDS)))
+    startup.mark_ready()
+    if settings.TOMBSTONE_PURGE_INTERVAL_SECONDS > 0:
+        tasks.append(asyncio.create_task(tombstones.purge_periodically(settings.TOMBSTONE_PURGE_INTERVAL_SECONDS)))
+    yield
+    for task in tasks:
+        task.cancel()
+    await dispose_replicas()
+    await dispose_engines()
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
 
 app = FastAPI(
     title="Achievement Tracker API",
     description="Backend API for Achievement Tracker",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=TimedORJSONResponse,
+    lifespan=lifespan,
 )
 
+# Innermost, so CORS headers are added to 429 responses too
+if settings.RATE_LIMIT_ENABLED:
+    app.add_middleware(RateLimitMiddleware)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -21,14 +58,34 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "Server-Timing"],
 )
 
-# Include routers
-app.include_router(auth.router)
-app.include_router(user.router)
-app.include_router(days.router)
-app.include_router(achievements.router)
-app.include_router(todos.router)
+# Outermost, so the timings include every other middleware
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+# Include routers (async handlers when DATABASE_URL selects an async driver).
+# Only the selected variant is imported: building routes dominates boot time
+if ASYNC_MODE:
+    from app.api.aio import auth, user, days, achievements, todos
+else:
+    from app.api import auth, user, days, achievements, todos
+api_modules = [auth, user, days, achievements, todos]
+# Routers without an async variant use the sync engine in both modes
+api_modules += [export, imports, stats, search, events, sync, recurring]
+for module in api_modules:
+    app.include_router(module.router)
+
+
+@app.exception_handler(PasswordHashPoolFull)
+def password_hash_pool_full(request: Request, exc: PasswordHashPoolFull):
+    """Shed password hashing load instead of queueing unboundedly"""
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Server is busy, please retry shortly"},
+        headers={"Retry-After": "1"},
+    )
 
 
 @app.get("/api/health")
@@ -36,3 +93,41 @@ def health_check():
     """Health check endpoint"""
     return {"status": "ok", "environment": settings.ENVIRONMENT}
 
+
+@app.get("/api/health/cache", dependencies=[Depends(require_stats_token)])
+def cache_stats():
+    """Hit/miss/eviction counters of the auth, day view and recurrence expansion caches"""
+    return {**auth_cache_stats(), "days": day_cache_stats(), "recurrence": recurrence_cache_stats()}
+
+
+@app.get("/api/health/ratelimit", dependencies=[Depends(require_stats_token)])
+def rate_limit_stats():
+    """Bucket count and allowed/rejected counters of the rate limit store"""
+    return {**rate_limit_store.stats(), "subjects": subject_cache.stats()}
+
+
+@app.get("/api/health/replicas", dependencies=[Depends(require_stats_token)])
+def replica_health():
+    """Health and read counters of the read replicas, and the read-your-writes pins"""
+    return replica_stats()
+
+
+@app.get("/api/health/events", dependencies=[Depends(require_stats_token)])
+def event_stats():
+    """Subscriber and delivery counters of the change feed hub"""
+    return hub.stats()
+
+
+@app.get("/api/health/startup", dependencies=[Depends(require_stats_token)])
+def startup_stats():
+    """Cold start duration by phase against STARTUP_BUDGET_MS"""
+    return startup.startup_report()
+
+
+@app.get("/api/metrics", response_class=PlainTextResponse, dependencies=[Depends(require_stats_token)])
+def metrics():
+    """Request, SQL and serialization metrics in the Prometheus text format"""
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
+
+startup.mark_imported()
@@ -1,9 +1,16 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey, Date
+from sqlalchemy import (
+    Column, Integer, String, Boolean, DateTime, Text, ForeignKey, Date, Index, PrimaryKeyConstraint, text
+)
 from sqlalchemy.orm import relationship
-from datetime import datetime, date
+from datetime import datetime
 
 from app.core.database import Base
 
+# Soft-deleted rows keep deleted_at; the hot indexes leave them out, so
+# queries must repeat this exact predicate (app.tombstones.live) to use them
+LIVE = text("deleted_at IS NULL")
+TOMBSTONE = text("deleted_at IS NOT NULL")
+
 
 class User(Base):
     __tablename__ = "users"
@@ -16,13 +23,25 @@ class User(Base):
     quote = Column(Text, nullable=True, default="")
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Bumped by every change to the user's recurrence rules; part of the day view ETags
+    recurrence_version = Column(Integer, nullable=False, default=0)
+    # Rows dated before this were moved to the per-year archive tables (app.archive)
+    archived_before = Column(Date, nullable=True)
     
     achievements = relationship("Achievement", back_populates="user", cascade="all, delete-orphan")
     todos = relationship("Todo", back_populates="user", cascade="all, delete-orphan")
+    recurrence_rules = relationship("RecurrenceRule", back_populates="user", cascade="all, delete-orphan")
 
 
 class Achievement(Base):
     __tablename__ = "achievements"
+    __table_args__ = (
+        # Every day/list query filters on the owner first, then the date
+        Index("ix_achievements_user_id_date", "user_id", "date", sqlite_where=LIVE, postgresql_where=LIVE),
+        Index("ix_achievements_user_id_completed_date", "user_id", "completed", "date",
+              sqlite_where=LIVE, postgresql_where=LIVE),
+        Index("ix_achievements_deleted_at", "deleted_at", sqlite_where=TOMBSTONE, postgresql_where=TOMBSTONE),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -32,12 +51,19 @@ class Achievement(Base):
     completed = Column(Boolean, default=False)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    deleted_at = Column(DateTime, nullable=True)  # set by a (restorable) delete
     
     user = relationship("User", back_populates="achievements")
 
 
 class Todo(Base):
     __tablename__ = "todos"
+    __table_args__ = (
+        Index("ix_todos_user_id_date", "user_id", "date", sqlite_where=LIVE, postgresql_where=LIVE),
+        Index("ix_todos_user_id_completed_date", "user_id", "completed", "date",
+              sqlite_where=LIVE, postgresql_where=LIVE),
+        Index("ix_todos_deleted_at", "deleted_at", sqlite_where=TOMBSTONE, postgresql_where=TOMBSTONE),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -49,6 +75,133 @@ class Todo(Base):
     due_time = Column(String, nullable=True)  # Optional time string like "14:30"
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    deleted_at = Column(DateTime, nullable=True)
     
     user = relationship("User", back_populates="todos")
 
+
+class DeletedAchievement(Base):
+    """Achievements deleted longer than the retention ago, moved here by app.tombstones"""
+    __tablename__ = "deleted_achievements"
+    __table_args__ = (
+        Index("ix_deleted_achievements_user_id_date", "user_id", "date"),
+    )
+    
+    # Rows keep their original id; the archive has its own key
+    archive_id = Column(Integer, primary_key=True)
+    id = Column(Integer, nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    title = Column(String, nullable=False)
+    notes = Column(Text, nullable=True)
+    date = Column(Date, nullable=False)
+    completed = Column(Boolean, default=False)
+    created_at = Column(DateTime)
+    updated_at = Column(DateTime)
+    deleted_at = Column(DateTime, nullable=False)
+    archived_at = Column(DateTime, nullable=False)
+
+
+class DeletedTodo(Base):
+    """Todos deleted longer than the retention ago, moved here by app.tombstones"""
+    __tablename__ = "deleted_todos"
+    __table_args__ = (
+        Index("ix_deleted_todos_user_id_date", "user_id", "date"),
+    )
+    
+    archive_id = Column(Integer, primary_key=True)
+    id = Column(Integer, nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    title = Column(String, nullable=False)
+    notes = Column(Text, nullable=True)
+    date = Column(Date, nullable=False)
+    completed = Column(Boolean, default=False)
+    priority = Column(String)
+    due_time = Column(String, nullable=True)
+    created_at = Column(DateTime)
+    updated_at = Column(DateTime)
+    deleted_at = Column(DateTime, nullable=False)
+    archived_at = Column(DateTime, nullable=False)
+
+
+class DailySummary(Base):
+    """Per user/day counters, kept current by app.summaries on every write"""
+    __tablename__ = "daily_summaries"
+    __table_args__ = (
+        PrimaryKeyConstraint("user_id", "date"),
+    )
+    
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    date = Column(Date, nullable=False)
+    achievements = Column(Integer, nullable=False, default=0, server_default="0")
+    achievements_completed = Column(Integer, nullable=False, default=0, server_default="0")
+    todos = Column(Integer, nullable=False, default=0, server_default="0")
+    todos_completed = Column(Integer, nullable=False, default=0, server_default="0")
+    todos_low = Column(Integer, nullable=False, default=0, server_default="0")
+    todos_medium = Column(Integer, nullable=False, default=0, server_default="0")
+    todos_high = Column(Integer, nullable=False, default=0, server_default="0")
+    # Bumped by every write to the day's rows; the basis of the day view ETags
+    version = Column(Integer, nullable=False, default=0, server_default="0")
+
+
+class SyncChange(Base):
+    """Latest change of each achievement/todo/user row, maintained by app.sync"""
+    __tablename__ = "sync_changes"
+    __table_args__ = (
+        Index("ix_sync_changes_user_id_seq", "user_id", "seq"),
+        Index("ix_sync_changes_kind_row_id", "kind", "row_id"),
+        # Never reuse a deleted seq, or clients could skip a change
+        {"sqlite_autoincrement": True},
+    )
+    
+    seq = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    kind = Column(String, nullable=False)  # achievement, todo, user
+    row_id = Column(Integer, nullable=False)
+    deleted = Column(Boolean, nullable=False, default=False)
+
+
+class RecurrenceRule(Base):
+    """A repeating todo; occurrences are expanded on read by app.recurrence"""
+    __tablename__ = "recurrence_rules"
+    __table_args__ = (
+        Index("ix_recurrence_rules_user_id_dtstart", "user_id", "dtstart"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    title = Column(String, nullable=False)
+    notes = Column(Text, nullable=True)
+    priority = Column(String, default="medium")
+    due_time = Column(String, nullable=True)
+    rrule = Column(String, nullable=False)  # RFC 5545 RRULE, e.g. "FREQ=WEEKLY;BYDAY=MO,WE"
+    dtstart = Column(Date, nullable=False)
+    until = Column(Date, nullable=True)  # last occurrence of a bounded rule, for range filtering
+    # Bumped on every edit; keys the expansion cache
+    version = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    user = relationship("User", back_populates="recurrence_rules")
+    overrides = relationship("RecurrenceOverride", back_populates="rule", cascade="all, delete-orphan")
+
+
+class RecurrenceOverride(Base):
+    """Sparse per-occurrence changes; NULL fields fall back to the rule"""
+    __tablename__ = "recurrence_overrides"
+    __table_args__ = (
+        PrimaryKeyConstraint("rule_id", "date"),
+        Index("ix_recurrence_overrides_user_id_date", "user_id", "date"),
+    )
+    
+    rule_id = Column(Integer, ForeignKey("recurrence_rules.id"), nullable=False)
+    date = Column(Date, nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    completed = Column(Boolean, nullable=True)
+    title = Column(String, nullable=True)
+    notes = Column(Text, nullable=True)
+    priority = Column(String, nullable=True)
+    due_time = Column(String, nullable=True)
+    cancelled = Column(Boolean, nullable=False, default=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    rule = relationship("RecurrenceRule", back_populates="overrides")
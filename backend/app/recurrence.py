@@ -0,0 +1,263 @@
+"""
+Recurring todos: lazy occurrence expansion with sparse overrides.
+
+A RecurrenceRule stores an RFC 5545 RRULE and a start date instead of one
+Todo row per occurrence. Day and range views expand only the rules that
+overlap the requested dates, and a RecurrenceOverride row exists only for
+an occurrence that was completed, edited or cancelled. Expanded dates are
+cached per (rule, version, year), so a year view walks each rule once
+until the rule changes. Rules are walked a whole number of 400-year
+calendar cycles later than their dates (see ``_dates_between``), which
+bounds the search past the requested range.
+
+Flush events keep the day view versions honest: changing a rule bumps
+User.recurrence_version (every day of the user may change), while
+overriding one occurrence bumps only that day's DailySummary version.
+"""
+import re
+from collections import Counter
+from datetime import MAXYEAR, date, datetime, time
+from typing import Iterable, List, Optional, Tuple
+
+from dateutil.relativedelta import relativedelta
+from dateutil.rrule import rrule, rrulestr
+from sqlalchemy import event, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models import User, RecurrenceRule, RecurrenceOverride
+from app.summaries import apply_deltas, new_deltas
+
+# Occurrences are whole days; sub-daily frequencies would repeat a date
+FREQUENCIES = ("DAILY", "WEEKLY", "MONTHLY", "YEARLY")
+RULE_FIELDS = ("id", "title", "notes", "priority", "due_time", "rrule", "dtstart", "until", "version")
+OVERRIDE_FIELDS = ("rule_id", "date", "cancelled", "completed", "title", "notes", "priority", "due_time")
+OVERRIDABLE_FIELDS = ("completed", "title", "notes", "priority", "due_time")
+# Leap years and weekdays repeat every 400 years
+CALENDAR_CYCLE_YEARS = 400
+RECURRENCE_MODELS = (RecurrenceRule, RecurrenceOverride)
+
+expansion_cache = TTLCache(
+    max_size=settings.RECURRENCE_CACHE_MAX_SIZE, ttl_seconds=settings.RECURRENCE_CACHE_TTL_SECONDS
+)
+
+
+class NoOccurrences(ValueError):
+    """A valid rule with no occurrence within RECURRENCE_MAX_YEARS of dtstart"""
+
+
+def _rule_parts(text: str) -> dict:
+    parts = {}
+    for part in text.upper().split(";"):
+        name, sep, value = part.partition("=")
+        if not sep:
+            raise ValueError(f"Invalid RRULE part {part!r}")
+        parts[name] = value
+    return parts
+
+
+def _bare(text: str) -> str:
+    text = text.strip()
+    if text.upper().startswith("RRULE:"):
+        text = text[len("RRULE:"):]
+    return text
+
+
+def parse_rule(text: str, dtstart: date) -> rrule:
+    """dateutil rrule for a bare RRULE value; ValueError when invalid"""
+    text = _bare(text)
+    parts = _rule_parts(text)
+    if parts.get("FREQ") not in FREQUENCIES:
+        raise ValueError(f"FREQ must be one of {', '.join(FREQUENCIES)}")
+    if "DTSTART" in parts:
+        raise ValueError("Give the start as dtstart, not inside the RRULE")
+    # Easter dates do not repeat with the calendar cycle
+    if "BYEASTER" in parts:
+        raise ValueError("BYEASTER is not supported")
+    if "UNTIL" in parts and not re.fullmatch(r"\d{8}(T\d{6}Z?)?", parts["UNTIL"]):
+        raise ValueError("UNTIL must be a date such as 20241231")
+    try:
+        return rrulestr(text, dtstart=datetime.combine(dtstart, time()))
+    except (ValueError, TypeError) as exc:
+        raise ValueError(f"Invalid RRULE: {exc}")
+
+
+def _moved(text: str, years: int) -> str:
+    """The RRULE with its UNTIL moved by whole years, dropped past MAXYEAR"""
+    parts = []
+    for part in _bare(text).split(";"):
+        name, _, value = part.partition("=")
+        if name.upper() == "UNTIL":
+            year = int(value[:4]) + years
+            if year > MAXYEAR:
+                continue
+            part = f"{name}={year:04d}{value[4:]}"
+        parts.append(part)
+    return ";".join(parts)
+
+
+def _dates_between(text: str, dtstart: date, start: date, end: date) -> List[date]:
+    """Occurrence dates of the rule from start to end
+
+    dateutil keeps looking for the next occurrence up to year 9999, seconds
+    of work once a rule has stopped matching (or for one that never does).
+    The rule is walked whole calendar cycles later, as close to year 9999 as
+    end allows, so that search ends less than a cycle after end. Without
+    COUNT, the walk also starts less than a cycle of intervals before start.
+    """
+    if end < start:
+        return []
+    parts = _rule_parts(_bare(text))
+    if "COUNT" not in parts:
+        step = CALENDAR_CYCLE_YEARS * int(parts.get("INTERVAL", "1"))
+        dtstart = dtstart.replace(year=dtstart.year + max(0, start.year - dtstart.year - 1) // step * step)
+    shift = (MAXYEAR - end.year) // CALENDAR_CYCLE_YEARS * CALENDAR_CYCLE_YEARS
+    rule = parse_rule(_moved(text, shift), dtstart.replace(year=dtstart.year + shift))
+    last = end.replace(year=end.year + shift)
+    dates = []
+    for occurrence in rule.xafter(datetime.combine(start.replace(year=start.year + shift), time()), inc=True):
+        day = occurrence.date()
+        if day > last:
+            break
+        dates.append(day.replace(year=day.year - shift))
+    return dates
+
+
+def last_occurrence(text: str, dtstart: date) -> Optional[date]:
+    """Final date of a COUNT/UNTIL-bounded rule, None for an endless one
+
+    Raises NoOccurrences for a rule with no occurrence within
+    RECURRENCE_MAX_YEARS of dtstart, and ValueError for a bounded rule that
+    goes on past that horizon.
+    """
+    parse_rule(text, dtstart)
+    parts = _rule_parts(_bare(text))
+    try:
+        horizon = dtstart + relativedelta(years=settings.RECURRENCE_MAX_YEARS)
+    except (ValueError, OverflowError):
+        horizon = date.max
+    dates = _dates_between(text, dtstart, dtstart, horizon)
+    if not dates:
+        raise NoOccurrences(
+            f"The rule has no occurrences within {settings.RECURRENCE_MAX_YEARS} years of dtstart"
+        )
+    if "COUNT" in parts:
+        ends_in_time = len(dates) >= int(parts["COUNT"])
+    elif "UNTIL" in parts:
+        ends_in_time = datetime.strptime(parts["UNTIL"][:8], "%Y%m%d").date() <= horizon
+    else:
+        return None
+    if not ends_in_time:
+        raise ValueError(f"A bounded rule must end within {settings.RECURRENCE_MAX_YEARS} years of dtstart")
+    return dates[-1]
+
+
+def _year_dates(rule, year: int) -> Tuple[date, ...]:
+    key = (rule.id, rule.version, year)
+    dates = expansion_cache.get(key)
+    if dates is None:
+        dates = tuple(_dates_between(rule.rrule, rule.dtstart, date(year, 1, 1), date(year, 12, 31)))
+        expansion_cache.set(key, dates)
+    return dates
+
+
+def occurrence_dates(rule, start: date, end: date) -> List[date]:
+    """Dates of the rule between start and end, expanded a cached year at a time"""
+    first = max(start, rule.dtstart)
+    last = min(end, rule.until) if rule.until else end
+    dates = []
+    for year in range(first.year, last.year + 1):
+        dates.extend(day for day in _year_dates(rule, year) if first <= day <= last)
+    return dates
+
+
+def rules_statement(user_id: int, start: date, end: date):
+    """The owner's rules that can have occurrences in the range"""
+    return select(*(getattr(RecurrenceRule, name) for name in RULE_FIELDS)).where(
+        RecurrenceRule.user_id == user_id,
+        RecurrenceRule.dtstart <= end,
+        or_(RecurrenceRule.until.is_(None), RecurrenceRule.until >= start)
+    ).order_by(RecurrenceRule.id)
+
+
+def overrides_statement(user_id: int, start: date, end: date):
+    return select(*(getattr(RecurrenceOverride, name) for name in OVERRIDE_FIELDS)).where(
+        RecurrenceOverride.user_id == user_id,
+        RecurrenceOverride.date >= start,
+        RecurrenceOverride.date <= end
+    )
+
+
+def occurrence(rule, day: date, override=None) -> dict:
+    """OccurrenceResponse dict: the rule's fields with the override's non-NULL ones on top"""
+    item = {
+        "rule_id": rule.id,
+        "date": day,
+        "title": rule.title,
+        "notes": rule.notes,
+        "completed": False,
+        "priority": rule.priority or "medium",
+        "due_time": rule.due_time,
+    }
+    if override is not None:
+        for name in OVERRIDABLE_FIELDS:
+            value = getattr(override, name)
+            if value is not None:
+                item[name] = value
+    return item
+
+
+def expand(rules: Iterable, overrides: Iterable, start: date, end: date) -> List[dict]:
+    """Occurrences of the rules in the range, in (date, rule_id) order"""
+    overrides = {(override.rule_id, override.date): override for override in overrides}
+    occurrences = []
+    for rule in rules:
+        for day in occurrence_dates(rule, start, end):
+            override = overrides.get((rule.id, day))
+            if override is None or not override.cancelled:
+                occurrences.append(occurrence(rule, day, override))
+    occurrences.sort(key=lambda item: (item["date"], item["rule_id"]))
+    return occurrences
+
+
+def load_occurrences(db: Session, user_id: int, start: date, end: date, rules_version: int) -> List[dict]:
+    """Expanded occurrences; no queries for users who never had a rule"""
+    if not rules_version:
+        return []
+    rules = db.execute(rules_statement(user_id, start, end)).all()
+    if not rules:
+        return []
+    overrides = db.execute(overrides_statement(user_id, start, end)).all()
+    return expand(rules, overrides, start, end)
+
+
+def recurrence_cache_stats() -> dict:
+    return expansion_cache.stats()
+
+
+@event.listens_for(Session, "before_flush")
+def _bump_rule_versions(session, flush_context, instances):
+    for obj in session.dirty:
+        if isinstance(obj, RecurrenceRule) and session.is_modified(obj):
+            obj.version = (obj.version or 0) + 1
+
+
+@event.listens_for(Session, "after_flush")
+def _bump_view_versions(session, flush_context):
+    owners = set()
+    deltas = new_deltas()
+    dirty = [obj for obj in session.dirty if isinstance(obj, RECURRENCE_MODELS) and session.is_modified(obj)]
+    for obj in list(session.new) + dirty + list(session.deleted):
+        if isinstance(obj, RecurrenceRule):
+            owners.add(obj.user_id)
+        elif isinstance(obj, RecurrenceOverride):
+            deltas[(obj.user_id, obj.date)] = Counter(version=1)
+    if deltas:
+        apply_deltas(session.connection(), deltas)
+    for user_id in owners:
+        # updated_at is left alone: the profile itself did not change
+        session.connection().execute(
+            update(User).where(User.id == user_id)
+            .values(recurrence_version=User.recurrence_version + 1, updated_at=User.updated_at)
+        )
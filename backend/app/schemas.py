@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr
-from typing import Optional, List
+from typing import Optional, List, Dict
 from datetime import date, datetime
 
 
@@ -63,6 +63,10 @@ class AchievementUpdate(BaseModel):
     completed: Optional[bool] = None
 
 
+class AchievementBatchUpdate(AchievementUpdate):
+    id: int
+
+
 class AchievementResponse(AchievementBase):
     id: int
     user_id: int
@@ -95,6 +99,10 @@ class TodoUpdate(BaseModel):
     due_time: Optional[str] = None
 
 
+class TodoBatchUpdate(TodoUpdate):
+    id: int
+
+
 class TodoResponse(TodoBase):
     id: int
     user_id: int
@@ -105,9 +113,154 @@ class TodoResponse(TodoBase):
         from_attributes = True
 
 
+# List Schemas
+class AchievementListResponse(BaseModel):
+    items: List[AchievementResponse]
+    next_cursor: Optional[str] = None
+
+
+class TodoListResponse(BaseModel):
+    items: List[TodoResponse]
+    next_cursor: Optional[str] = None
+
+
+# Batch Schemas
+class BatchDeleteResponse(BaseModel):
+    deleted: int
+
+
+# Search Schemas
+class SearchHit(BaseModel):
+    type: str
+    id: int
+    date: date
+    title: str
+    notes: Optional[str] = None
+    completed: bool
+    title_highlight: str
+    notes_snippet: Optional[str] = None
+    score: float
+
+
+class SearchResponse(BaseModel):
+    items: List[SearchHit]
+    next_cursor: Optional[str] = None
+
+
+# Import Schemas
+class ImportResponse(BaseModel):
+    achievements: int
+    todos: int
+    chunks: int
+
+
+# Recurrence Schemas
+class RecurrenceRuleBase(BaseModel):
+    title: str
+    notes: Optional[str] = None
+    priority: str = "medium"
+    due_time: Optional[str] = None
+    rrule: str
+    dtstart: date
+
+
+class RecurrenceRuleCreate(RecurrenceRuleBase):
+    pass
+
+
+class RecurrenceRuleUpdate(BaseModel):
+    title: Optional[str] = None
+    notes: Optional[str] = None
+    priority: Optional[str] = None
+    due_time: Optional[str] = None
+    rrule: Optional[str] = None
+    dtstart: Optional[date] = None
+
+
+class RecurrenceRuleResponse(RecurrenceRuleBase):
+    id: int
+    user_id: int
+    until: Optional[date] = None
+    created_at: datetime
+    updated_at: datetime
+    
+    class Config:
+        from_attributes = True
+
+
+class OccurrenceUpdate(BaseModel):
+    completed: Optional[bool] = None
+    title: Optional[str] = None
+    notes: Optional[str] = None
+    priority: Optional[str] = None
+    due_time: Optional[str] = None
+    cancelled: Optional[bool] = None
+
+
+class OccurrenceResponse(BaseModel):
+    rule_id: int
+    date: date
+    title: str
+    notes: Optional[str] = None
+    completed: bool = False
+    priority: str = "medium"
+    due_time: Optional[str] = None
+
+
 # Day View Schemas
 class DayViewResponse(BaseModel):
     date: date
     achievements: List[AchievementResponse]
     todos: List[TodoResponse]
+    recurring: List[OccurrenceResponse] = []
+
 
+class DayRangeResponse(BaseModel):
+    start: date
+    end: date
+    days: Dict[date, DayViewResponse]
+
+
+# Statistics Schemas
+class StreakResponse(BaseModel):
+    current: int
+    longest: int
+    last_active: Optional[date] = None
+
+
+class DailySummaryResponse(BaseModel):
+    date: date
+    achievements: int
+    achievements_completed: int
+    todos: int
+    todos_completed: int
+    todos_low: int
+    todos_medium: int
+    todos_high: int
+    
+    class Config:
+        from_attributes = True
+
+
+class PeriodSummaryResponse(BaseModel):
+    period: str
+    start: date
+    end: date
+    achievements: int
+    achievements_completed: int
+    todos: int
+    todos_completed: int
+    todos_by_priority: Dict[str, int]
+    active_days: int
+    days: List[DailySummaryResponse]
+
+
+# Sync Schemas
+class SyncResponse(BaseModel):
+    achievements: List[AchievementResponse]
+    todos: List[TodoResponse]
+    user: Optional[UserResponse] = None
+    deleted_achievements: List[int]
+    deleted_todos: List[int]
+    cursor: str
+    has_more: bool
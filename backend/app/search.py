@@ -0,0 +1,189 @@
+"""
+Full-text search over achievement and todo titles/notes.
+
+SQLite: one external-content FTS5 table per source table (``<table>_fts``,
+rowid = source id) kept in sync by triggers, so bulk statements are indexed
+too. ``user_id`` is an indexed FTS column, letting the owner filter be part
+of the MATCH instead of a post-filter.
+
+PostgreSQL: a generated, weighted ``search_vector`` tsvector column with a
+GIN index on each source table.
+
+Results from both tables are ranked together (lower score is better) and
+paginated with a (score, type, id) keyset cursor. Soft-deleted rows stay in
+the index and are filtered out on the source table. The highlighted title
+and notes snippet are HTML: the database marks the matches with control
+characters, and the text is escaped before they become <mark> tags.
+"""
+import html
+import re
+from typing import List, Optional, Sequence, Tuple
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import Connection
+
+from app.core.database import Base
+from app.api.listing import decode_cursor
+
+SEARCH_TABLES = {"achievement": "achievements", "todo": "todos"}
+# Other databases get no index; the endpoint answers 501 there
+DIALECTS = ("sqlite", "postgresql")
+HIGHLIGHT_OPEN = "<mark>"
+HIGHLIGHT_CLOSE = "</mark>"
+# What the database puts around matches, replaced after escaping
+MATCH_OPEN = "\x02"
+MATCH_CLOSE = "\x03"
+MAX_TERMS = 8
+
+# Title matches count ten times as much as notes matches
+TITLE_WEIGHT = 10.0
+NOTES_WEIGHT = 1.0
+
+
+def _sqlite_ddl(table: str) -> List[str]:
+    fts = f"{table}_fts"
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+        f"title, notes, user_id, content='{table}', content_rowid='id', prefix='2 3')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts}(rowid, title, notes, user_id) VALUES (new.id, new.title, new.notes, new.user_id); "
+        f"END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, title, notes, user_id) "
+        f"VALUES ('delete', old.id, old.title, old.notes, old.user_id); "
+        f"END",
+        # Only text changes touch the index; toggling "completed" does not
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF title, notes, user_id ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, title, notes, user_id) "
+        f"VALUES ('delete', old.id, old.title, old.notes, old.user_id); "
+        f"INSERT INTO {fts}(rowid, title, notes, user_id) VALUES (new.id, new.title, new.notes, new.user_id); "
+        f"END",
+    ]
+
+
+def _postgres_ddl(table: str) -> List[str]:
+    return [
+        f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS ("
+        f"setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+        f"setweight(to_tsvector('simple', coalesce(notes, '')), 'B')) STORED",
+        f"CREATE INDEX IF NOT EXISTS ix_{table}_search_vector ON {table} USING GIN (search_vector)",
+    ]
+
+
+def install(connection: Connection) -> None:
+    """Create the search index structures for the connection's dialect"""
+    dialect = connection.dialect.name
+    for table in SEARCH_TABLES.values():
+        if dialect == "sqlite":
+            statements = _sqlite_ddl(table)
+        elif dialect == "postgresql":
+            statements = _postgres_ddl(table)
+        else:
+            return
+        for statement in statements:
+            connection.execute(text(statement))
+
+
+def rebuild(connection: Connection) -> None:
+    """Re-index every existing row (after install on a populated database)"""
+    if connection.dialect.name == "sqlite":
+        for table in SEARCH_TABLES.values():
+            connection.execute(text(f"INSERT INTO {table}_fts({table}_fts) VALUES ('rebuild')"))
+
+
+def uninstall(connection: Connection) -> None:
+    dialect = connection.dialect.name
+    for table in SEARCH_TABLES.values():
+        if dialect == "sqlite":
+            for suffix in ("ai", "ad", "au"):
+                connection.execute(text(f"DROP TRIGGER IF EXISTS {table}_fts_{suffix}"))
+            connection.execute(text(f"DROP TABLE IF EXISTS {table}_fts"))
+        elif dialect == "postgresql":
+            connection.execute(text(f"DROP INDEX IF EXISTS ix_{table}_search_vector"))
+            connection.execute(text(f"ALTER TABLE {table} DROP COLUMN IF EXISTS search_vector"))
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _install_after_create(target, connection, **kw):
+    install(connection)
+
+
+@event.listens_for(Base.metadata, "before_drop")
+def _uninstall_before_drop(target, connection, **kw):
+    uninstall(connection)
+
+
+def is_supported(dialect: str) -> bool:
+    return dialect in DIALECTS
+
+
+def search_terms(query: str) -> List[str]:
+    """Lower-cased word tokens of a user query (punctuation/operators dropped)"""
+    return re.findall(r"\w+", query.lower())[:MAX_TERMS]
+
+
+def decode_search_cursor(cursor: str) -> Tuple[float, str, int]:
+    score, kind, item_id = decode_cursor(cursor)
+    return float(score), str(kind), int(item_id)
+
+
+def _sqlite_select(kind: str, table: str) -> str:
+    fts = f"{table}_fts"
+    return (
+        f"SELECT '{kind}' AS kind, src.id AS id, "
+        f"bm25({fts}, {TITLE_WEIGHT}, {NOTES_WEIGHT}, 0.0) AS score, "
+        f"src.title AS title, src.notes AS notes, src.date AS date, src.completed AS completed, "
+        f"highlight({fts}, 0, :open, :close) AS title_highlight, "
+        f"snippet({fts}, 1, :open, :close, '…', 16) AS notes_snippet "
+        f"FROM {fts} JOIN {table} AS src ON src.id = {fts}.rowid "
+        f"WHERE {fts} MATCH :match AND src.deleted_at IS NULL"
+    )
+
+
+def _postgres_select(kind: str, table: str) -> str:
+    options = f"StartSel={MATCH_OPEN}, StopSel={MATCH_CLOSE}"
+    return (
+        f"SELECT '{kind}' AS kind, src.id AS id, "
+        f"-ts_rank(src.search_vector, q)::float8 AS score, "
+        f"src.title AS title, src.notes AS notes, src.date AS date, src.completed AS completed, "
+        f"ts_headline('simple', src.title, q, '{options}, HighlightAll=true') AS title_highlight, "
+        f"ts_headline('simple', coalesce(src.notes, ''), q, '{options}, MaxWords=16, MinWords=5') "
+        f"AS notes_snippet "
+        f"FROM {table} AS src, to_tsquery('simple', :match) AS q "
+        f"WHERE src.user_id = :user_id AND src.deleted_at IS NULL AND src.search_vector @@ q"
+    )
+
+
+def search(connection: Connection, user_id: int, terms: Sequence[str], kinds: Sequence[str],
+           limit: int, after: Optional[Tuple[float, str, int]] = None) -> list:
+    """One page of ranked hits; every term is matched as a prefix"""
+    dialect = connection.dialect.name
+    if dialect == "sqlite":
+        build = _sqlite_select
+        words = " ".join(f'"{term}"*' for term in terms)
+        match = f"user_id:{int(user_id)} AND {{title notes}}: ({words})"
+    elif dialect == "postgresql":
+        build = _postgres_select
+        match = " & ".join(f"{term}:*" for term in terms)
+    else:
+        raise NotImplementedError(f"Search is not supported on {dialect}")
+    
+    union = " UNION ALL ".join(build(kind, SEARCH_TABLES[kind]) for kind in kinds)
+    params = {"match": match, "user_id": user_id, "open": MATCH_OPEN, "close": MATCH_CLOSE, "limit": limit}
+    where = ""
+    if after is not None:
+        where = "WHERE (score, kind, id) > (:after_score, :after_kind, :after_id) "
+        params.update(after_score=after[0], after_kind=after[1], after_id=after[2])
+    
+    stmt = text(f"SELECT * FROM ({union}) AS hits {where}ORDER BY score, kind, id LIMIT :limit")
+    return [
+        {**row, "title_highlight": markup(row["title_highlight"]), "notes_snippet": markup(row["notes_snippet"])}
+        for row in connection.execute(stmt, params).mappings()
+    ]
+
+
+def markup(value: Optional[str]) -> Optional[str]:
+    """Escape user text for HTML, then turn the match markers into <mark> tags"""
+    if value is None:
+        return None
+    return html.escape(value).replace(MATCH_OPEN, HIGHLIGHT_OPEN).replace(MATCH_CLOSE, HIGHLIGHT_CLOSE)
@@ -5,16 +5,17 @@ Run with: python -m app.seed
 from datetime import date, datetime, timedelta
 from sqlalchemy.orm import Session
 
-from app.core.database import SessionLocal, engine, Base
+from app.core.database import get_sessionmaker
 from app.core.security import get_password_hash
 from app.models import User, Achievement, Todo
-
-# Create tables
-Base.metadata.create_all(bind=engine)
+from app.startup import prepare_schema
+import app.summaries  # noqa: F401  keeps DailySummary in sync with seeded rows
+import app.sync  # noqa: F401  logs seeded rows for GET /api/sync
 
 
 def seed_database():
-    db: Session = SessionLocal()
+    prepare_schema()
+    db: Session = get_sessionmaker()()
     
     try:
         # Check if demo user exists
@@ -0,0 +1,154 @@
+"""
+Incremental maintenance of the DailySummary aggregate table.
+
+Single-row writes through the ORM are picked up by Session flush events;
+bulk statements (batch endpoints, import) bypass the unit of work and call
+``apply_rows`` / ``apply_deltas`` themselves. Deltas are applied with an
+atomic ``count = count + delta`` upsert, so concurrent writers never lose
+increments. Soft-deleted rows (deleted_at set) are not counted, so setting
+deleted_at subtracts a row and clearing it adds the row back.
+"""
+from collections import Counter, defaultdict
+from datetime import date
+from typing import Dict, Iterable, Mapping, Tuple
+
+from sqlalchemy import event, inspect, update
+from sqlalchemy.orm import Session
+
+from app.models import Achievement, Todo, DailySummary
+
+COUNTER_COLUMNS = [
+    "achievements", "achievements_completed",
+    "todos", "todos_completed", "todos_low", "todos_medium", "todos_high",
+]
+# Counters plus the per-day write version (never decremented)
+SUMMARY_COLUMNS = COUNTER_COLUMNS + ["version"]
+TRACKED_FIELDS = ("user_id", "date", "completed", "priority", "deleted_at")
+
+Deltas = Dict[Tuple[int, date], Counter]
+
+
+def row_counters(model, values: Mapping) -> Counter:
+    """Counter contribution of one achievement/todo row"""
+    completed = bool(values.get("completed"))
+    if model is Achievement:
+        return Counter(achievements=1, achievements_completed=int(completed))
+    counters = Counter(todos=1, todos_completed=int(completed))
+    priority = values.get("priority") or "medium"
+    if f"todos_{priority}" in COUNTER_COLUMNS:
+        counters[f"todos_{priority}"] = 1
+    return counters
+
+
+def add_row(deltas: Deltas, model, values: Mapping, sign: int = 1) -> None:
+    if values.get("deleted_at") is not None:
+        return
+    key = (values["user_id"], values["date"])
+    for column, count in row_counters(model, values).items():
+        deltas[key][column] += sign * count
+    deltas[key]["version"] += 1
+
+
+def new_deltas() -> Deltas:
+    return defaultdict(Counter)
+
+
+def _upsert(dialect_name: str):
+    if dialect_name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    elif dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        return None
+    stmt = insert(DailySummary.__table__)
+    return stmt.on_conflict_do_update(
+        index_elements=["user_id", "date"],
+        set_={column: DailySummary.__table__.c[column] + stmt.excluded[column] for column in SUMMARY_COLUMNS},
+    )
+
+
+def apply_deltas(connection, deltas: Deltas) -> None:
+    """Add the deltas to the stored counters (creating missing days)"""
+    # Days written in this transaction; app.day_cache evicts them on commit
+    connection.info.setdefault("written_days", set()).update(deltas.keys())
+    
+    params = [
+        dict({column: counters.get(column, 0) for column in SUMMARY_COLUMNS}, user_id=user_id, date=day)
+        for (user_id, day), counters in deltas.items()
+        if any(counters.values())
+    ]
+    if not params:
+        return
+    
+    stmt = _upsert(connection.dialect.name)
+    if stmt is not None:
+        connection.execute(stmt, params)
+        return
+    
+    # Portable fallback: UPDATE, then INSERT the days that did not exist yet
+    table = DailySummary.__table__
+    for row in params:
+        result = connection.execute(
+            update(table)
+            .where(table.c.user_id == row["user_id"], table.c.date == row["date"])
+            .values({column: table.c[column] + row[column] for column in SUMMARY_COLUMNS})
+        )
+        if result.rowcount == 0:
+            connection.execute(table.insert(), row)
+
+
+def apply_rows(db: Session, model, rows: Iterable[Mapping], sign: int = 1) -> None:
+    """Record bulk-inserted (sign=1) or bulk-deleted (sign=-1) rows"""
+    deltas = new_deltas()
+    for row in rows:
+        add_row(deltas, model, row, sign)
+    apply_deltas(db.connection(), deltas)
+
+
+def _values(obj) -> dict:
+    return {name: getattr(obj, name, None) for name in TRACKED_FIELDS}
+
+
+def _committed_values(obj) -> dict:
+    """Tracked fields as they were before the pending changes"""
+    state = inspect(obj)
+    values = {}
+    for name in TRACKED_FIELDS:
+        if name not in state.attrs:
+            continue
+        history = state.attrs[name].history
+        if history.deleted:
+            values[name] = history.deleted[0]
+        elif history.unchanged:
+            values[name] = history.unchanged[0]
+        else:
+            values[name] = getattr(obj, name)
+    return values
+
+
+@event.listens_for(Session, "before_flush")
+def _collect_deltas(session, flush_context, instances):
+    deltas = new_deltas()
+    for obj in session.new:
+        if isinstance(obj, (Achievement, Todo)):
+            add_row(deltas, type(obj), _values(obj))
+    for obj in session.deleted:
+        if isinstance(obj, (Achievement, Todo)):
+            add_row(deltas, type(obj), _committed_values(obj), sign=-1)
+    for obj in session.dirty:
+        if isinstance(obj, (Achievement, Todo)) and session.is_modified(obj):
+            add_row(deltas, type(obj), _committed_values(obj), sign=-1)
+            add_row(deltas, type(obj), _values(obj))
+    if deltas:
+        session.info.setdefault("summary_deltas", []).append(deltas)
+
+
+@event.listens_for(Session, "after_flush")
+def _apply_collected_deltas(session, flush_context):
+    for deltas in session.info.pop("summary_deltas", []):
+        apply_deltas(session.connection(), deltas)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_deltas(session):
+    session.info.pop("summary_deltas", None)
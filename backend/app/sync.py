@@ -0,0 +1,55 @@
+"""
+Change log behind GET /api/sync.
+
+Every insert, update and delete of an achievement, todo or user profile
+adds a SyncChange with a new, strictly increasing seq and removes the
+row's previous entry. The log therefore holds one entry per live row plus
+one tombstone per deleted row, and "everything since seq N" is a single
+(user_id, seq) index range. ORM writes are logged from a Session flush
+event; the batch endpoints and import call ``log_rows`` themselves.
+
+On PostgreSQL, seqs come from a sequence and are handed out in statement
+order, not commit order. Two concurrent transactions of the *same* user
+could therefore commit out of order. One user's writes are rarely
+concurrent, so this is accepted rather than serialized.
+"""
+from typing import Iterable, Sequence, Tuple
+
+from sqlalchemy import delete, event, insert
+from sqlalchemy.orm import Session
+
+from app.changes import KINDS, flushed_changes, owner
+from app.models import SyncChange
+
+# (user_id, kind, row_id, deleted)
+Entry = Tuple[int, str, int, bool]
+
+
+def log_changes(connection, entries: Iterable[Entry]) -> None:
+    """Record the entries, replacing the previous entry of each row"""
+    latest = {(kind, row_id): (user_id, deleted) for user_id, kind, row_id, deleted in entries}
+    if not latest:
+        return
+    
+    table = SyncChange.__table__
+    for kind in {kind for kind, _ in latest}:
+        row_ids = [row_id for entry_kind, row_id in latest if entry_kind == kind]
+        connection.execute(delete(table).where(table.c.kind == kind, table.c.row_id.in_(row_ids)))
+    connection.execute(insert(table), [
+        {"user_id": user_id, "kind": kind, "row_id": row_id, "deleted": deleted}
+        for (kind, row_id), (user_id, deleted) in latest.items()
+    ])
+
+
+def log_rows(connection, model, user_id: int, ids: Sequence[int], deleted: bool = False) -> None:
+    """Log bulk-written rows of one model"""
+    kind, _ = KINDS[model]
+    log_changes(connection, [(user_id, kind, row_id, deleted) for row_id in ids])
+
+
+@event.listens_for(Session, "after_flush")
+def _log_flushed_changes(session, flush_context):
+    log_changes(session.connection(), [
+        (owner(obj), KINDS[type(obj)][0], obj.id, action == "deleted")
+        for action, obj in flushed_changes(session)
+    ])
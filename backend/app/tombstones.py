@@ -0,0 +1,115 @@
+"""
+Soft delete for achievements and todos.
+
+Deleting a row sets its deleted_at instead of removing it, so it can be
+restored (POST /api/todos/{id}/restore, /api/achievements/{id}/restore).
+To the rest of the app a tombstone is gone: it leaves DailySummary, the
+change feed reports it deleted and sync sends its id as deleted, exactly
+as for a hard delete.
+
+The (user_id, date) and (user_id, completed, date) indexes are partial,
+WHERE deleted_at IS NULL, so tombstones never bloat them. A query only uses
+a partial index when it repeats the index predicate, which is why every
+read of live rows filters on ``live(model)``; day views then keep the same
+index range scans as before. Tombstones have their own partial index on
+deleted_at.
+
+``purge_tombstones`` moves tombstones older than SOFT_DELETE_RETENTION_DAYS
+to the deleted_achievements / deleted_todos tables, one batch per
+transaction. The app runs it every TOMBSTONE_PURGE_INTERVAL_SECONDS in the
+background; ``python -m app.tombstones`` runs it once.
+"""
+import argparse
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.core.database import get_engine
+from app.models import Achievement, Todo, DeletedAchievement, DeletedTodo
+
+logger = logging.getLogger(__name__)
+
+ARCHIVES = {Achievement: DeletedAchievement, Todo: DeletedTodo}
+
+
+def live(model):
+    """The predicate of the partial indexes: not soft-deleted"""
+    return model.deleted_at.is_(None)
+
+
+def deleted(model):
+    return model.deleted_at.is_not(None)
+
+
+def below_max_id(table):
+    """Rows other than the newest; SQLite hands out max(id) + 1 again once that row is gone"""
+    return table.c.id < select(func.max(table.c.id)).scalar_subquery()
+
+
+def _archive_batch(connection, model, cutoff: datetime, batch_size: int) -> int:
+    """Move up to batch_size of the oldest expired tombstones; returns how many"""
+    table = model.__table__
+    oldest = select(table.c.id).where(
+        table.c.deleted_at < cutoff,
+        below_max_id(table)
+    ).order_by(table.c.deleted_at).limit(batch_size)
+    # DELETE ... RETURNING first, so concurrent purges never archive a row twice
+    rows = connection.execute(delete(table).where(table.c.id.in_(oldest)).returning(*table.c)).mappings().all()
+    if rows:
+        archived_at = datetime.utcnow()
+        connection.execute(insert(ARCHIVES[model].__table__), [dict(row, archived_at=archived_at) for row in rows])
+    return len(rows)
+
+
+def purge_tombstones(engine: Optional[Engine] = None, retention_days: Optional[int] = None,
+                     batch_size: Optional[int] = None, now: Optional[datetime] = None) -> Dict[str, int]:
+    """Archive every tombstone older than the retention; rows moved per table"""
+    engine = get_engine() if engine is None else engine
+    retention_days = settings.SOFT_DELETE_RETENTION_DAYS if retention_days is None else retention_days
+    batch_size = batch_size or settings.TOMBSTONE_PURGE_BATCH_SIZE
+    cutoff = (now or datetime.utcnow()) - timedelta(days=retention_days)
+
+    moved = {}
+    for model in ARCHIVES:
+        total = 0
+        while True:
+            # Short transactions keep writers waiting for at most one batch
+            with engine.begin() as connection:
+                count = _archive_batch(connection, model, cutoff, batch_size)
+            total += count
+            if count < batch_size:
+                break
+        moved[model.__tablename__] = total
+    return moved
+
+
+async def purge_periodically(interval_seconds: float) -> None:
+    """Background loop started by the app lifespan; cancelled on shutdown"""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            moved = await run_in_threadpool(purge_tombstones)
+        except Exception:
+            logger.exception("Purging deleted rows failed")
+            continue
+        if any(moved.values()):
+            logger.info("Archived deleted rows: %s", moved)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Archive soft-deleted rows older than the retention period")
+    parser.add_argument("--retention-days", type=int, default=settings.SOFT_DELETE_RETENTION_DAYS)
+    parser.add_argument("--batch-size", type=int, default=settings.TOMBSTONE_PURGE_BATCH_SIZE)
+    args = parser.parse_args()
+    moved = purge_tombstones(retention_days=args.retention_days, batch_size=args.batch_size)
+    print(", ".join(f"{table}: {count} archived" for table, count in moved.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Query latency with and without the composite (user_id, date) indexes
+Run with: python -m benchmarks.bench_indexes [--users 500 --days 365 --per-day 3]
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import create_engine, insert, select, func, text
+
+from app.core.database import Base
+from app.models import User, Achievement, Todo
+
+COMPOSITE_INDEXES = [
+    index
+    for table in (Achievement.__table__, Todo.__table__)
+    for index in table.indexes
+    if index.name.startswith(("ix_achievements_user_id", "ix_todos_user_id"))
+]
+
+
+def populate(engine, users: int, days: int, per_day: int) -> date:
+    """Bulk insert users x days x per_day achievements and todos"""
+    start = date(2020, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [
+            {"email": f"user{i}@example.com", "hashed_password": "x", "display_name": f"User {i}"}
+            for i in range(1, users + 1)
+        ])
+        for user_id in range(1, users + 1):
+            rows = [
+                {
+                    "user_id": user_id,
+                    "title": f"Item {n}",
+                    "date": start + timedelta(days=d),
+                    "completed": n % 2 == 0,
+                }
+                for d in range(days)
+                for n in range(per_day)
+            ]
+            conn.execute(insert(Achievement), rows)
+            conn.execute(insert(Todo), [dict(row, priority="medium") for row in rows])
+    return start
+
+
+def time_queries(engine, users: int, start: date, days: int, samples: int) -> dict:
+    rng = random.Random(42)
+    queries = {
+        "day": lambda uid, d: select(Todo).where(Todo.user_id == uid, Todo.date == d),
+        "month": lambda uid, d: select(Achievement).where(
+            Achievement.user_id == uid, Achievement.date >= d, Achievement.date < d + timedelta(days=31)
+        ),
+        "completed_count": lambda uid, d: select(func.count()).select_from(Todo).where(
+            Todo.user_id == uid, Todo.completed.is_(True), Todo.date >= d
+        ),
+    }
+    results = {}
+    with engine.connect() as conn:
+        for name, build in queries.items():
+            timings = []
+            for _ in range(samples):
+                stmt = build(rng.randint(1, users), start + timedelta(days=rng.randrange(days)))
+                t0 = time.perf_counter()
+                conn.execute(stmt).all()
+                timings.append((time.perf_counter() - t0) * 1000)
+            timings.sort()
+            results[name] = (statistics.median(timings), timings[int(len(timings) * 0.95) - 1])
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--per-day", type=int, default=3)
+    parser.add_argument("--samples", type=int, default=200)
+    args = parser.parse_args()
+
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    engine = create_engine(f"sqlite:///{path}")
+    try:
+        Base.metadata.create_all(bind=engine)
+        t0 = time.perf_counter()
+        start = populate(engine, args.users, args.days, args.per_day)
+        rows = args.users * args.days * args.per_day
+        print(f"Inserted {rows:,} achievements and {rows:,} todos in {time.perf_counter() - t0:.1f}s")
+
+        with engine.begin() as conn:
+            for index in COMPOSITE_INDEXES:
+                index.drop(conn)
+            conn.execute(text("ANALYZE"))
+        before = time_queries(engine, args.users, start, args.days, args.samples)
+
+        with engine.begin() as conn:
+            for index in COMPOSITE_INDEXES:
+                index.create(conn)
+            conn.execute(text("ANALYZE"))
+        after = time_queries(engine, args.users, start, args.days, args.samples)
+
+        print(f"{'query':<16}{'before p50':>12}{'before p95':>12}{'after p50':>12}{'after p95':>12}")
+        for name in before:
+            print(f"{name:<16}" + "".join(f"{v:>10.3f}ms" for v in (*before[name], *after[name])))
+    finally:
+        engine.dispose()
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
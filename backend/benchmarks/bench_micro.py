@@ -0,0 +1,124 @@
+"""
+Micro benchmarks for security, serialization and queries on generated data
+Run with: python -m benchmarks.bench_micro [--users 20 --days 365 --items 5 --repeat 500 --only query
+          --save NAME --compare NAME]
+
+Each benchmark is one call timed repeat times after a short warmup; the
+table reports p50/p95/p99 latency and calls per second. Queries run against
+a temporary SQLite file filled by benchmarks.datagen, as the first user.
+"""
+import argparse
+import os
+import random
+import tempfile
+from datetime import date, timedelta
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app import search as search_index
+from app.api.days import ACHIEVEMENT_FIELDS, TODO_FIELDS, load_day, render_range, rows_statement
+from app.api.etag import day_version_statement
+from app.api.listing import SortOrder, list_statement
+from app.api.stats import Period, get_streak, get_summary
+from app.core import security
+from app.models import User, Achievement, Todo
+from app.schemas import AchievementResponse, TodoResponse, DayRangeResponse, DayViewResponse
+from benchmarks.datagen import PASSWORD, START, generate, vocabulary
+from benchmarks.harness import add_baseline_arguments, measure, report
+
+
+def security_benchmarks(repeat: int) -> dict:
+    hashed = security.get_password_hash(PASSWORD)
+    token = security.create_access_token({"sub": "user1@bench.example"})
+    # bcrypt is deliberately slow; a handful of calls is enough for stable percentiles
+    slow = max(3, repeat // 100)
+    return {
+        "security.hash_password": (lambda: security.get_password_hash(PASSWORD), slow),
+        "security.verify_password": (lambda: security.verify_password(PASSWORD, hashed), slow),
+        "security.create_token": (lambda: security.create_access_token({"sub": "user1@bench.example"}), repeat),
+        "security.decode_token": (lambda: security.decode_access_token(token), repeat),
+        "security.decode_token_cached": (lambda: security.decode_access_token_cached(token), repeat),
+    }
+
+
+def pydantic_range(start: date, end: date, achievements, todos) -> bytes:
+    days = {}
+    for row in achievements:
+        days.setdefault(row.date, DayViewResponse(date=row.date, achievements=[], todos=[]))
+        days[row.date].achievements.append(AchievementResponse(**row._mapping))
+    for row in todos:
+        days.setdefault(row.date, DayViewResponse(date=row.date, achievements=[], todos=[]))
+        days[row.date].todos.append(TodoResponse(**row._mapping))
+    return DayRangeResponse(start=start, end=end, days=days).model_dump_json().encode()
+
+
+def serialization_benchmarks(db: Session, user_id: int, repeat: int) -> dict:
+    start, end = START, START + timedelta(days=29)
+    achievements = db.execute(rows_statement(Achievement, ACHIEVEMENT_FIELDS, user_id, start, end)).all()
+    todos = db.execute(rows_statement(Todo, TODO_FIELDS, user_id, start, end)).all()
+    return {
+        "serialization.range_30d_orjson": (lambda: render_range(start, end, achievements, todos), repeat),
+        "serialization.range_30d_pydantic": (lambda: pydantic_range(start, end, achievements, todos), repeat),
+    }
+
+
+def query_benchmarks(db: Session, user: User, words: list, repeat: int) -> dict:
+    rng = random.Random(0)
+    day = START + timedelta(days=10)
+    end = START + timedelta(days=29)
+    as_of = START + timedelta(days=400)
+
+    def range_30d():
+        db.execute(rows_statement(Achievement, ACHIEVEMENT_FIELDS, user.id, START, end)).all()
+        db.execute(rows_statement(Todo, TODO_FIELDS, user.id, START, end)).all()
+
+    def search():
+        search_index.search(db.connection(), user.id, [rng.choice(words)], list(search_index.SEARCH_TABLES), 21)
+
+    return {
+        "query.day_version": (lambda: db.execute(day_version_statement(user.id, day, day)).one(), repeat),
+        "query.day_view": (lambda: load_day(db, user.id, day, rules_version=0), repeat),
+        "query.range_30d": (range_30d, repeat),
+        "query.list_page": (lambda: db.scalars(list_statement(Todo, user.id, 50, SortOrder.desc)).all(), repeat),
+        "query.search": (search, repeat),
+        "query.streak": (lambda: get_streak(as_of=as_of, current_user=user, db=db), repeat),
+        "query.summary_month": (lambda: get_summary(period=Period.month, day=day, current_user=user, db=db), repeat),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--items", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=500)
+    parser.add_argument("--only", help="run only benchmarks whose name starts with this prefix")
+    add_baseline_arguments(parser)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        generate(engine, args.users, args.days, args.items, args.seed)
+        words = vocabulary(random.Random(args.seed))
+
+        with Session(engine) as db:
+            user = db.query(User).order_by(User.id).first()
+            benchmarks = {
+                **security_benchmarks(args.repeat),
+                **serialization_benchmarks(db, user.id, args.repeat),
+                **query_benchmarks(db, user, words, args.repeat),
+            }
+            results = {
+                name: measure(fn, repeat)
+                for name, (fn, repeat) in benchmarks.items()
+                if not args.only or name.startswith(args.only)
+            }
+        engine.dispose()
+
+    report(args, results)
+
+
+if __name__ == "__main__":
+    main()
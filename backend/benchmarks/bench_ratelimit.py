@@ -0,0 +1,123 @@
+"""
+Rate limiter overhead: the bucket store alone and the middleware per request
+Run with: python -m benchmarks.bench_ratelimit [--repeat 20000 --clients 10000 --threads 8 --budget-us 50
+          --save NAME --compare NAME]
+
+The middleware benchmarks call RateLimitMiddleware around a no-op ASGI app
+directly, without routing or a server, and subtract the same call on the
+bare app, so the reported overhead is what rate limiting adds to every
+request. Requests rotate over --clients distinct IPs and users so buckets
+are looked up in populated shards. Exits 1 when the p50 overhead of any
+middleware case exceeds --budget-us microseconds.
+"""
+import argparse
+import sys
+import threading
+import time
+
+from app.core.ratelimit import RateLimitMiddleware, ShardedMemoryStore, parse_limit
+from app.core.security import create_access_token
+from benchmarks.harness import add_baseline_arguments, measure, report, summarize
+
+# High enough that no benchmark request is rejected
+LIMITS = {"default": "1000000/second", "POST /api/auth/login": "1000000/second"}
+PER_IP = "1000000/second"
+
+
+async def bare_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b""})
+
+
+async def sink(message):
+    pass
+
+
+def call(app, scope) -> None:
+    """Run an ASGI call that never suspends without an event loop"""
+    try:
+        app(scope, None, sink).send(None)
+    except StopIteration:
+        pass
+
+
+def scope_for(n: int, token: bytes = None) -> dict:
+    headers = [(b"host", b"testserver"), (b"accept", b"application/json")]
+    if token:
+        headers.append((b"authorization", b"Bearer " + token))
+    return {
+        "type": "http", "method": "GET", "path": f"/api/days/2024-03-{n % 28 + 1:02d}",
+        "headers": headers, "client": (f"10.{n >> 16 & 255}.{n >> 8 & 255}.{n & 255}", 50000),
+    }
+
+
+def rotating(fn, items: list):
+    state = {"i": 0}
+
+    def next_call():
+        state["i"] = (state["i"] + 1) % len(items)
+        fn(items[state["i"]])
+    return next_call
+
+
+def threaded_take(store: ShardedMemoryStore, threads: int, per_thread: int) -> dict:
+    """Throughput of concurrent take() calls; each thread has its own keys"""
+    limit = parse_limit(PER_IP)
+    timings = [[] for _ in range(threads)]
+
+    def worker(index: int):
+        series = timings[index]
+        for n in range(per_thread):
+            t0 = time.perf_counter()
+            store.take(("bench", index, n % 1000), limit)
+            series.append(time.perf_counter() - t0)
+
+    pool = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    t0 = time.perf_counter()
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    return summarize([t for series in timings for t in series], time.perf_counter() - t0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=20000)
+    parser.add_argument("--clients", type=int, default=10000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--budget-us", type=float, default=50)
+    add_baseline_arguments(parser)
+    args = parser.parse_args()
+
+    store = ShardedMemoryStore()
+    limit = parse_limit(PER_IP)
+    middleware = RateLimitMiddleware(bare_app, store=store, limits=LIMITS, per_ip=PER_IP, exempt=["/api/health"])
+    tokens = [create_access_token({"sub": f"user{n}@bench.example"}).encode() for n in range(min(args.clients, 1000))]
+    anonymous = [scope_for(n) for n in range(args.clients)]
+    authenticated = [scope_for(n, tokens[n % len(tokens)]) for n in range(args.clients)]
+    for scope in anonymous + authenticated:
+        call(middleware, scope)
+
+    results = {
+        "store.take": measure(rotating(lambda key: store.take(key, limit), list(range(args.clients))), args.repeat),
+        "asgi.bare": measure(rotating(lambda scope: call(bare_app, scope), anonymous), args.repeat),
+        "asgi.ratelimit_anonymous": measure(rotating(lambda scope: call(middleware, scope), anonymous), args.repeat),
+        "asgi.ratelimit_bearer": measure(rotating(lambda scope: call(middleware, scope), authenticated), args.repeat),
+        f"store.take_{args.threads}_threads": threaded_take(store, args.threads, args.repeat // args.threads),
+    }
+    report(args, results)
+
+    print(f"\nStore: {store.stats()}")
+    over = []
+    for name in ("asgi.ratelimit_anonymous", "asgi.ratelimit_bearer"):
+        overhead_us = (results[name]["p50_ms"] - results["asgi.bare"]["p50_ms"]) * 1000
+        print(f"{name}: +{overhead_us:.1f}us p50 per request (budget {args.budget_us:.0f}us)")
+        if overhead_us > args.budget_us:
+            over.append(name)
+    if over:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Full-text search latency vs a LIKE '%q%' scan
+Run with: python -m benchmarks.bench_search [--rows 1000000 --users 10]
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import create_engine, insert, or_, select
+
+from app import search
+from app.core.database import Base
+from app.models import User, Todo
+
+SYLLABLES = ["ka", "lo", "mi", "ne", "ru", "sa", "ti", "vo", "ze", "pa", "qu", "do"]
+
+
+def vocabulary(rng: random.Random, size: int = 5000) -> list:
+    return sorted({"".join(rng.choices(SYLLABLES, k=rng.randint(2, 4))) for _ in range(size)})
+
+
+def populate(engine, rows: int, users: int, words: list, rng: random.Random) -> None:
+    with engine.begin() as conn:
+        conn.execute(insert(User), [
+            {"email": f"user{i}@example.com", "hashed_password": "x", "display_name": f"User {i}"}
+            for i in range(1, users + 1)
+        ])
+        batch = []
+        for n in range(rows):
+            batch.append({
+                "user_id": rng.randint(1, users),
+                "title": " ".join(rng.choices(words, k=4)),
+                "notes": " ".join(rng.choices(words, k=12)),
+                "date": date(2020, 1, 1) + timedelta(days=n % 1500),
+                "priority": "medium",
+            })
+            if len(batch) == 10000:
+                conn.execute(insert(Todo), batch)
+                batch = []
+        if batch:
+            conn.execute(insert(Todo), batch)
+
+
+def percentiles(timings: list) -> tuple:
+    timings = sorted(timings)
+    return statistics.median(timings), timings[int(len(timings) * 0.95) - 1]
+
+
+def run_queries(conn, rng: random.Random, words: list, users: int, samples: int, prefix: bool) -> dict:
+    fts, like = [], []
+    for _ in range(samples):
+        user_id = rng.randint(1, users)
+        term = rng.choice(words)
+        if prefix:
+            term = term[:3]
+
+        t0 = time.perf_counter()
+        search.search(conn, user_id, [term], ["todo"], limit=20)
+        fts.append((time.perf_counter() - t0) * 1000)
+
+        # LIKE cannot rank, so it must visit every one of the user's rows
+        t0 = time.perf_counter()
+        conn.execute(
+            select(Todo).where(
+                Todo.user_id == user_id,
+                or_(Todo.title.like(f"%{term}%"), Todo.notes.like(f"%{term}%"))
+            )
+        ).all()
+        like.append((time.perf_counter() - t0) * 1000)
+    return {"fts5": fts, "like": like}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--samples", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    words = vocabulary(rng)
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    engine = create_engine(f"sqlite:///{path}")
+    try:
+        Base.metadata.create_all(bind=engine)  # installs FTS tables and triggers
+        t0 = time.perf_counter()
+        populate(engine, args.rows, args.users, words, rng)
+        print(f"Inserted and indexed {args.rows:,} todos in {time.perf_counter() - t0:.1f}s")
+
+        results = {}
+        with engine.connect() as conn:
+            for mode in ("word", "prefix"):
+                results[mode] = run_queries(conn, rng, words, args.users, args.samples, prefix=mode == "prefix")
+
+        print(f"{'query':<8}{'method':<8}{'p50':>10}{'p95':>10}")
+        for mode, timings in results.items():
+            for name in ("fts5", "like"):
+                p50, p95 = percentiles(timings[name])
+                print(f"{mode:<8}{name:<8}{p50:>8.2f}ms{p95:>8.2f}ms")
+    finally:
+        engine.dispose()
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Per-row cost of the day view: ORM + Pydantic + response_model vs column tuples + orjson
+Run with: python -m benchmarks.bench_serialization [--items 1000 --repeat 200]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import date
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from app.api.days import ACHIEVEMENT_FIELDS, TODO_FIELDS, rows_statement, render_day
+from app.core.database import Base
+from app.models import User, Achievement, Todo
+from app.schemas import DayViewResponse, AchievementResponse, TodoResponse
+
+DAY = date(2024, 3, 1)
+
+
+def populate(engine, items: int) -> None:
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{"email": "bench@example.com", "hashed_password": "x"}])
+        conn.execute(insert(Achievement), [
+            {"user_id": 1, "title": f"Achievement {n}", "notes": "Some notes", "date": DAY, "completed": n % 2 == 0}
+            for n in range(items // 2)
+        ])
+        conn.execute(insert(Todo), [
+            {"user_id": 1, "title": f"Todo {n}", "notes": None, "date": DAY, "priority": "high", "due_time": "09:00"}
+            for n in range(items - items // 2)
+        ])
+
+
+def pydantic_path(db: Session, field) -> bytes:
+    """The previous get_day: hydrate, model_validate per row, then FastAPI's response_model pass"""
+    achievements = db.query(Achievement).filter(Achievement.user_id == 1, Achievement.date == DAY).all()
+    todos = db.query(Todo).filter(Todo.user_id == 1, Todo.date == DAY).all()
+    view = DayViewResponse(
+        date=DAY,
+        achievements=[AchievementResponse.model_validate(a) for a in achievements],
+        todos=[TodoResponse.model_validate(t) for t in todos]
+    )
+    content = asyncio.run(serialize_response(field=field, response_content=view, is_coroutine=False))
+    db.expunge_all()
+    return JSONResponse(content).body
+
+
+def fast_path(db: Session) -> bytes:
+    achievements = db.execute(rows_statement(Achievement, ACHIEVEMENT_FIELDS, 1, DAY, DAY)).all()
+    todos = db.execute(rows_statement(Todo, TODO_FIELDS, 1, DAY, DAY)).all()
+    return render_day(DAY, achievements, todos)
+
+
+def measure(fn, repeat: int) -> list:
+    fn()  # warm up statement caches
+    timings = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - t0)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    populate(engine, args.items)
+    field = create_response_field(name="Response_get_day", type_=DayViewResponse)
+
+    with Session(engine) as db:
+        results = {
+            "orm + pydantic": measure(lambda: pydantic_path(db, field), args.repeat),
+            "tuples + orjson": measure(lambda: fast_path(db), args.repeat),
+        }
+
+    print(f"Day with {args.items:,} items, {args.repeat} runs each")
+    print(f"{'path':<18}{'p50':>10}{'per row':>12}")
+    for name, timings in results.items():
+        p50 = statistics.median(timings)
+        print(f"{name:<18}{p50 * 1000:>8.2f}ms{p50 / args.items * 1e6:>10.2f}us")
+    baseline, fast = (statistics.median(t) for t in results.values())
+    print(f"speedup: {baseline / fast:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Concurrent write/read throughput with and without the SQLite performance profile
+Run with: python -m benchmarks.bench_sqlite_contention [--writers 8 --readers 8 --seconds 5]
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+from datetime import date
+
+from sqlalchemy import create_engine, event, insert, select
+from sqlalchemy.exc import OperationalError
+
+from app.core.database import Base, apply_sqlite_pragmas
+from app.models import User, Todo
+
+
+def run(path: str, tuned: bool, writers: int, readers: int, seconds: float) -> dict:
+    engine = create_engine(
+        f"sqlite:///{path}",
+        connect_args={"check_same_thread": False},
+        pool_size=writers + readers,
+    )
+    if tuned:
+        event.listen(engine, "connect", apply_sqlite_pragmas)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{"email": "bench@example.com", "hashed_password": "x", "display_name": "Bench"}])
+
+    counts = {"writes": 0, "reads": 0, "errors": 0}
+    lock = threading.Lock()
+    stop = time.perf_counter() + seconds
+
+    def writer():
+        while time.perf_counter() < stop:
+            try:
+                # One row per transaction, like create_todo
+                with engine.begin() as conn:
+                    conn.execute(insert(Todo).values(user_id=1, title="Bench", date=date.today()))
+                key = "writes"
+            except OperationalError:
+                key = "errors"
+            with lock:
+                counts[key] += 1
+
+    def reader():
+        stmt = select(Todo).where(Todo.user_id == 1, Todo.date == date.today()).limit(50)
+        while time.perf_counter() < stop:
+            try:
+                with engine.connect() as conn:
+                    conn.execute(stmt).all()
+                key = "reads"
+            except OperationalError:
+                key = "errors"
+            with lock:
+                counts[key] += 1
+
+    threads = [threading.Thread(target=writer) for _ in range(writers)]
+    threads += [threading.Thread(target=reader) for _ in range(readers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    engine.dispose()
+    return {key: value / seconds for key, value in counts.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    print(f"{'profile':<10}{'writes/s':>12}{'reads/s':>12}{'errors/s':>12}")
+    for tuned in (False, True):
+        fd, path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        try:
+            result = run(path, tuned, args.writers, args.readers, args.seconds)
+        finally:
+            for suffix in ("", "-wal", "-shm"):
+                if os.path.exists(path + suffix):
+                    os.remove(path + suffix)
+        name = "tuned" if tuned else "default"
+        print(f"{name:<10}{result['writes']:>12.0f}{result['reads']:>12.0f}{result['errors']:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Cold start of a worker: interpreter + app import + lifespan + first request
+Run with: python -m benchmarks.bench_startup [--runs 10 --schema skip --save NAME --compare NAME]
+
+Every run is a fresh interpreter, as when the autoscaler adds a worker. The
+child reports the app.startup phases and the latency of its first request;
+the parent adds the wall time including interpreter start. Exits non-zero
+when the median ready time exceeds STARTUP_BUDGET_MS.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.harness import add_baseline_arguments, report, summarize
+
+CHILD = """
+import json, time
+from fastapi.testclient import TestClient
+from app.main import app
+from app.startup import timings
+with TestClient(app) as client:
+    start = time.perf_counter()
+    client.get("/api/health")
+    first_request = time.perf_counter() - start
+print(json.dumps({**timings, "first_request": first_request}))
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--schema", choices=["create", "check", "skip"], default="create",
+                        help="SCHEMA_STARTUP for the workers "
+                             "(create runs against an existing schema after the first run)")
+    add_baseline_arguments(parser)
+    args = parser.parse_args()
+
+    phases = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {
+            **os.environ,
+            "DATABASE_URL": f"sqlite:///{os.path.join(tmp, 'startup.db')}",
+            "SCHEMA_STARTUP": args.schema,
+        }
+        backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            output = subprocess.run([sys.executable, "-c", CHILD], cwd=backend_dir, env=env,
+                                    capture_output=True, text=True, check=True).stdout
+            wall = time.perf_counter() - start
+            for phase, seconds in {**json.loads(output.splitlines()[-1]), "process_wall": wall}.items():
+                phases.setdefault(phase, []).append(seconds)
+
+    results = {f"startup.{phase}": summarize(timings) for phase, timings in phases.items()}
+    from app.core.config import settings
+    budget_ms = settings.STARTUP_BUDGET_MS
+    ready_ms = results["startup.ready"]["p50_ms"]
+    print(f"Median ready {ready_ms:.0f} ms, budget {budget_ms} ms\n")
+    report(args, results)
+    if ready_ms > budget_ms:
+        print(f"\nOver the cold-start budget by {ready_ms - budget_ms:.0f} ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Deterministic synthetic data: N users x M days x K items per day
+Run with: python -m benchmarks.datagen [--users 100 --days 365 --items 5 --seed 1 --database-url sqlite:///./bench.db]
+
+Rows are bulk inserted one user at a time, and the derived tables are kept
+consistent the way the batch endpoints do it: DailySummary deltas, sync log
+entries, and the full-text index (through its triggers). The same seed
+always produces the same rows.
+"""
+import argparse
+import random
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import create_engine, insert
+
+import app.search  # noqa: F401  creates the full-text index with the tables
+from app.core.database import Base
+from app.core.security import get_password_hash
+from app.models import User, Achievement, Todo
+from app.summaries import add_row, apply_deltas, new_deltas
+from app.sync import log_rows
+
+START = date(2024, 1, 1)
+PASSWORD = "bench-password"
+PRIORITIES = ["low", "medium", "medium", "high"]
+SYLLABLES = ["ka", "lo", "mi", "ne", "ru", "sa", "ti", "vo", "ze", "pa", "qu", "do"]
+
+
+def vocabulary(rng: random.Random, size: int = 2000) -> list:
+    return sorted({"".join(rng.choices(SYLLABLES, k=rng.randint(2, 4))) for _ in range(size)})
+
+
+def user_email(n: int) -> str:
+    return f"user{n}@bench.example"
+
+
+def _rows(rng: random.Random, words: list, user_id: int, days: int, items: int, start: date):
+    achievements, todos = [], []
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        for _ in range(items):
+            row = {
+                "user_id": user_id,
+                "title": " ".join(rng.choices(words, k=3)),
+                "notes": " ".join(rng.choices(words, k=8)) if rng.random() < 0.5 else None,
+                "date": day,
+                "completed": rng.random() < 0.6,
+            }
+            if rng.random() < 0.4:
+                achievements.append(row)
+            else:
+                row["priority"] = rng.choice(PRIORITIES)
+                row["due_time"] = f"{rng.randint(7, 20):02d}:{rng.choice(['00', '30'])}" if rng.random() < 0.3 else None
+                todos.append(row)
+    return achievements, todos
+
+
+def generate(engine, users: int, days: int, items: int, seed: int = 1, start: date = START) -> dict:
+    """Create the schema if needed and insert the users and their rows"""
+    Base.metadata.create_all(bind=engine)
+    rng = random.Random(seed)
+    words = vocabulary(rng)
+    # One bcrypt hash shared by every user; hashing is not what is measured here
+    hashed_password = get_password_hash(PASSWORD)
+    counts = {"users": 0, "achievements": 0, "todos": 0}
+
+    with engine.connect() as conn:
+        user_ids = conn.scalars(insert(User).returning(User.id), [
+            {"email": user_email(n), "hashed_password": hashed_password, "display_name": f"User {n}"}
+            for n in range(1, users + 1)
+        ]).all()
+        conn.commit()
+        counts["users"] = len(user_ids)
+
+        for user_id in user_ids:
+            log_rows(conn, User, user_id, [user_id])
+            deltas = new_deltas()
+            for model, rows in zip((Achievement, Todo), _rows(rng, words, user_id, days, items, start)):
+                if not rows:
+                    continue
+                ids = conn.scalars(insert(model).returning(model.id), rows).all()
+                log_rows(conn, model, user_id, ids)
+                for row in rows:
+                    add_row(deltas, model, row)
+                counts[f"{model.__tablename__}"] += len(ids)
+            apply_deltas(conn, deltas)
+            conn.commit()
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--items", type=int, default=5, help="items per user per day")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--database-url", default="sqlite:///./bench.db")
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url)
+    t0 = time.perf_counter()
+    counts = generate(engine, args.users, args.days, args.items, args.seed)
+    elapsed = time.perf_counter() - t0
+    rows = counts["achievements"] + counts["todos"]
+    print(f"Generated {counts['users']:,} users, {counts['achievements']:,} achievements and "
+          f"{counts['todos']:,} todos in {elapsed:.1f}s ({rows / elapsed:,.0f} rows/s)")
+    print(f"Every user's password is {PASSWORD!r}")
+
+
+if __name__ == "__main__":
+    main()
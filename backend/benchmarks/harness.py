@@ -0,0 +1,123 @@
+"""
+Shared timing, reporting and baseline helpers for bench_micro and load
+
+A result is a dict of latency percentiles in milliseconds plus throughput.
+Baselines are saved as JSON under benchmarks/baselines/<name>.json; comparing
+against one flags every benchmark whose p50 or p95 got slower by more than
+the tolerance (20% by default) and exits non-zero, so a CI job can gate on it.
+"""
+import json
+import platform
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+BASELINE_DIR = Path(__file__).parent / "baselines"
+COMPARED = ("p50_ms", "p95_ms")
+
+Results = Dict[str, dict]
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize(timings: List[float], elapsed: float = None) -> dict:
+    """Percentiles (ms) of per-call timings in seconds; throughput over elapsed wall time"""
+    ordered = sorted(timings)
+    elapsed = sum(timings) if elapsed is None else elapsed
+    return {
+        "n": len(ordered),
+        "mean_ms": statistics.fmean(ordered) * 1000,
+        "p50_ms": percentile(ordered, 0.50) * 1000,
+        "p95_ms": percentile(ordered, 0.95) * 1000,
+        "p99_ms": percentile(ordered, 0.99) * 1000,
+        "ops_per_sec": len(ordered) / elapsed if elapsed else 0.0,
+    }
+
+
+def measure(fn: Callable[[], object], repeat: int, warmup: int = 3) -> dict:
+    """Call fn warmup + repeat times and summarize the timed calls"""
+    for _ in range(warmup):
+        fn()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return summarize(timings)
+
+
+def print_table(results: Results, baseline: Results = None) -> None:
+    width = max([len(name) for name in results] + [9])
+    header = f"{'benchmark':<{width}} {'n':>7} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10} {'ops/s':>11}"
+    if baseline:
+        header += f" {'p50 vs base':>12}"
+    print(header)
+    print("-" * len(header))
+    for name, r in results.items():
+        line = (f"{name:<{width}} {r['n']:>7} {r['p50_ms']:>10.3f} {r['p95_ms']:>10.3f} "
+                f"{r['p99_ms']:>10.3f} {r['ops_per_sec']:>11,.0f}")
+        if baseline and name in baseline:
+            line += f" {r['p50_ms'] / baseline[name]['p50_ms'] - 1:>+11.0%}"
+        print(line)
+
+
+def baseline_path(name: str) -> Path:
+    return BASELINE_DIR / f"{name}.json"
+
+
+def save_baseline(name: str, results: Results) -> Path:
+    path = baseline_path(name)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }, indent=2, sort_keys=True))
+    return path
+
+
+def load_baseline(name: str) -> Results:
+    return json.loads(baseline_path(name).read_text())["results"]
+
+
+def regressions(results: Results, baseline: Results, tolerance: float) -> List[str]:
+    """Benchmarks whose p50 or p95 exceed the baseline by more than tolerance"""
+    found = []
+    for name, r in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        for key in COMPARED:
+            if base[key] > 0 and r[key] > base[key] * (1 + tolerance):
+                found.append(f"{name}: {key} {base[key]:.3f} -> {r[key]:.3f} ms (+{r[key] / base[key] - 1:.0%})")
+    return found
+
+
+def add_baseline_arguments(parser) -> None:
+    parser.add_argument("--save", metavar="NAME", help="save the results as baselines/NAME.json")
+    parser.add_argument("--compare", metavar="NAME", help="compare against baselines/NAME.json")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="allowed slowdown before a benchmark counts as regressed (default 0.2 = 20%%)")
+
+
+def report(args, results: Results) -> None:
+    """Print the results, save and/or compare them as requested; exits 1 on regression"""
+    baseline = load_baseline(args.compare) if args.compare else None
+    print_table(results, baseline)
+    if args.save:
+        print(f"\nSaved baseline {save_baseline(args.save, results)}")
+    if baseline is not None:
+        found = regressions(results, baseline, args.tolerance)
+        if found:
+            print(f"\n{len(found)} regression(s) beyond {args.tolerance:.0%}:")
+            for line in found:
+                print(f"  {line}")
+            sys.exit(1)
+        print(f"\nNo regressions beyond {args.tolerance:.0%} against {args.compare}")
@@ -0,0 +1,134 @@
+"""
+In-process HTTP load driver against the FastAPI app on generated data
+Run with: python -m benchmarks.load [--users 50 --days 365 --items 5 --requests 5000 --concurrency 16
+          --save NAME --compare NAME]
+
+Requests go through httpx.ASGITransport, i.e. the full middleware, routing,
+dependency and serialization stack without sockets, so the numbers isolate
+the application from the network and the ASGI server. Virtual clients pick
+endpoints from a weighted mix modelled on the web client (mostly day views),
+each as a random generated user. Latency percentiles and throughput are
+reported per endpoint. Runs on a temporary SQLite file unless --database-url
+is given (which must point at an empty database).
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+
+from benchmarks.harness import add_baseline_arguments, report, summarize
+
+# app modules are imported inside main(), after DATABASE_URL points at the benchmark database
+
+# (name, weight); see request_for for what each one sends
+MIX = [
+    ("GET /api/days/{day}", 40),
+    ("GET /api/days?start&end", 15),
+    ("GET /api/todos", 10),
+    ("GET /api/search", 10),
+    ("GET /api/stats/streak", 5),
+    ("GET /api/stats/summary", 5),
+    ("GET /api/sync", 5),
+    ("POST /api/todos/{day}", 10),
+]
+
+
+def request_for(name: str, rng: random.Random, start: date, days: int, words: list):
+    """(method, url, json body) for one request of the given endpoint"""
+    day = start + timedelta(days=rng.randrange(days))
+    if name == "GET /api/days/{day}":
+        return "GET", f"/api/days/{day}", None
+    if name == "GET /api/days?start&end":
+        return "GET", f"/api/days?start={day}&end={day + timedelta(days=6)}", None
+    if name == "GET /api/todos":
+        return "GET", f"/api/todos?limit=50&order=desc&start={day}", None
+    if name == "GET /api/search":
+        return "GET", f"/api/search?q={rng.choice(words)}", None
+    if name == "GET /api/stats/streak":
+        return "GET", f"/api/stats/streak?as_of={start + timedelta(days=days)}", None
+    if name == "GET /api/stats/summary":
+        return "GET", f"/api/stats/summary?period=month&date={day}", None
+    if name == "GET /api/sync":
+        return "GET", "/api/sync?limit=100", None
+    body = {"title": " ".join(rng.choices(words, k=3)), "date": str(day), "priority": "high"}
+    return "POST", f"/api/todos/{day}", body
+
+
+async def drive(app, tokens: list, args, start: date, words: list):
+    import httpx
+
+    rng = random.Random(args.seed)
+    names, weights = zip(*MIX)
+    plan = [
+        (rng.choice(tokens), request_for(name, rng, start, args.days, words), name)
+        for name in rng.choices(names, weights, k=args.requests)
+    ]
+    timings = defaultdict(list)
+    errors = defaultdict(int)
+    queue = iter(plan)
+
+    async def client_loop(client):
+        for token, (method, url, body), name in queue:
+            t0 = time.perf_counter()
+            response = await client.request(method, url, json=body, headers={"Authorization": f"Bearer {token}"})
+            timings[name].append(time.perf_counter() - t0)
+            if response.status_code >= 400:
+                errors[name] += 1
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        t0 = time.perf_counter()
+        await asyncio.gather(*(client_loop(client) for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - t0
+    return timings, errors, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--items", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--database-url", help="empty database to populate (default: a temporary SQLite file)")
+    parser.add_argument("--rate-limit", action="store_true",
+                        help="turn rate limiting on (every virtual client shares one IP, "
+                             "so it would mostly measure 429s)")
+    add_baseline_arguments(parser)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = args.database_url or f"sqlite:///{os.path.join(tmp, 'load.db')}"
+        os.environ["RATE_LIMIT_ENABLED"] = "true" if args.rate_limit else "false"
+
+        from app.core.database import get_engine
+        from app.core.security import create_access_token
+        from app.main import app
+        from benchmarks.datagen import START, generate, user_email, vocabulary
+
+        t0 = time.perf_counter()
+        counts = generate(get_engine(), args.users, args.days, args.items, args.seed)
+        print(f"Generated {counts['achievements'] + counts['todos']:,} rows for {counts['users']} users "
+              f"in {time.perf_counter() - t0:.1f}s")
+        # Tokens are minted directly: login is bcrypt-bound and measured in bench_micro
+        tokens = [create_access_token({"sub": user_email(n)}) for n in range(1, args.users + 1)]
+        words = vocabulary(random.Random(args.seed))
+
+        timings, errors, elapsed = asyncio.run(drive(app, tokens, args, START, words))
+        get_engine().dispose()
+
+    results = {name: summarize(timings[name], elapsed) for name, _ in MIX if timings[name]}
+    results["all"] = summarize([t for series in timings.values() for t in series], elapsed)
+    print(f"\n{args.requests:,} requests, concurrency {args.concurrency}, {elapsed:.1f}s wall\n")
+    if errors:
+        print(f"Error responses: {dict(errors)}\n")
+    report(args, results)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,7 +3,13 @@ from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
-from app.core.database import Base, get_db
+from app.core.config import settings
+from app.core.database import Base, get_db, instrument_engine
+from app.core.security import token_cache
+from app.api.dependencies import user_cache
+from app.day_cache import day_cache
+from app.core.ratelimit import rate_limit_store, subject_cache
+from app.core.replicas import pinned_writers
 from app.main import app
 from app.models import User
 from app.core.security import get_password_hash
@@ -13,6 +19,7 @@ SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
 )
+instrument_engine(engine)
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
@@ -36,6 +43,12 @@ def client(db):
             pass
 
     app.dependency_overrides[get_db] = override_get_db
+    token_cache.clear()
+    user_cache.clear()
+    day_cache.clear()
+    rate_limit_store.clear()
+    subject_cache.clear()
+    pinned_writers.clear()
     with TestClient(app) as test_client:
         yield test_client
     app.dependency_overrides.clear()
@@ -54,3 +67,17 @@ def test_user(db):
     db.refresh(user)
     return user
 
+
+@pytest.fixture
+def auth_headers(client, test_user):
+    login_response = client.post(
+        "/api/auth/login",
+        json={"email": "test@example.com", "password": "testpass123"}
+    )
+    return {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+
+
+@pytest.fixture
+def stats_headers(monkeypatch):
+    monkeypatch.setattr(settings, "STATS_TOKEN", "test-stats-token")
+    return {"Authorization": "Bearer test-stats-token"}
@@ -0,0 +1,85 @@
+import json
+import pytest
+from datetime import date
+from sqlalchemy import inspect
+
+from app.archive import archive_rows, restore_rows
+from app.models import Todo
+
+TODAY = date(2024, 6, 1)
+
+
+@pytest.fixture
+def todos(client, db, auth_headers):
+    """Two old todos and, created last, a recent one"""
+    created = {}
+    for day in ("2020-03-01", "2021-06-01", "2024-05-30"):
+        created[day] = client.post(f"/api/todos/{day}", headers=auth_headers,
+                                   json={"title": f"Todo {day}", "date": day}).json()
+    yield created
+    # Archive tables are not part of the models, so drop_all would leave them behind
+    restore_rows(db.get_bind())
+
+
+def day_titles(client, auth_headers, day):
+    return [todo["title"] for todo in client.get(f"/api/days/{day}", headers=auth_headers).json()["todos"]]
+
+
+def test_old_rows_move_to_per_year_tables(client, db, auth_headers, todos):
+    before = client.get("/api/days/2020-03-01", headers=auth_headers)
+
+    moved = archive_rows(db.get_bind(), horizon_days=365, today=TODAY)
+    assert moved == {"achievements": 0, "todos": 2}
+    tables = inspect(db.get_bind()).get_table_names()
+    assert {"todos_archive_2020", "todos_archive_2021"} <= set(tables)
+    db.expire_all()
+    assert [todo.title for todo in db.query(Todo).all()] == ["Todo 2024-05-30"]
+
+    after = client.get("/api/days/2020-03-01", headers=auth_headers)
+    assert after.json() == before.json()
+    days = client.get("/api/days", headers=auth_headers,
+                      params={"start": "2021-05-01", "end": "2021-06-30"}).json()["days"]
+    assert [todo["title"] for todo in days["2021-06-01"]["todos"]] == ["Todo 2021-06-01"]
+    assert day_titles(client, auth_headers, "2024-05-30") == ["Todo 2024-05-30"]
+
+    # A second run has nothing left to move
+    assert archive_rows(db.get_bind(), horizon_days=365, today=TODAY) == {"achievements": 0, "todos": 0}
+
+
+def test_old_days_merge_hot_and_archived_rows(client, db, auth_headers, todos):
+    archive_rows(db.get_bind(), horizon_days=365, today=TODAY)
+    client.post("/api/todos/2020-03-01", headers=auth_headers, json={"title": "Late entry", "date": "2020-03-01"})
+    assert day_titles(client, auth_headers, "2020-03-01") == ["Todo 2020-03-01", "Late entry"]
+
+
+def test_writes_thaw_archived_rows(client, db, auth_headers, todos):
+    archive_rows(db.get_bind(), horizon_days=365, today=TODAY)
+    old = todos["2020-03-01"]
+
+    response = client.patch(f"/api/todos/{old['id']}", headers=auth_headers, json={"completed": True})
+    assert response.status_code == 200
+    assert db.get(Todo, old["id"]).completed is True
+    assert [todo["completed"] for todo in client.get(
+        "/api/days/2020-03-01", headers=auth_headers).json()["todos"]] == [True]
+
+    assert client.delete(f"/api/todos/{todos['2021-06-01']['id']}", headers=auth_headers).status_code == 204
+    assert day_titles(client, auth_headers, "2021-06-01") == []
+
+
+def test_sync_and_export_include_archived_rows(client, db, auth_headers, todos):
+    archive_rows(db.get_bind(), horizon_days=365, today=TODAY)
+
+    full = client.get("/api/sync", headers=auth_headers).json()
+    assert sorted(todo["title"] for todo in full["todos"]) == sorted(f"Todo {day}" for day in todos)
+
+    lines = client.get("/api/export", headers=auth_headers, params={"format": "ndjson"}).text.splitlines()
+    assert [json.loads(line)["date"] for line in lines] == ["2020-03-01", "2021-06-01", "2024-05-30"]
+
+
+def test_restore_moves_everything_back(client, db, auth_headers, todos):
+    archive_rows(db.get_bind(), horizon_days=365, today=TODAY)
+    assert restore_rows(db.get_bind()) == {"achievements": 0, "todos": 2}
+    assert not [name for name in inspect(db.get_bind()).get_table_names() if "_archive_" in name]
+    db.expire_all()
+    assert db.query(Todo).count() == 3
+    assert day_titles(client, auth_headers, "2020-03-01") == ["Todo 2020-03-01"]
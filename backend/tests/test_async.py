@@ -0,0 +1,141 @@
+import pytest
+from datetime import date
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.core.database import get_async_db
+from app.api.aio import auth, user, days, achievements, todos
+from app.api.dependencies import user_cache
+from app.core.security import token_cache
+from app.day_cache import day_cache
+
+# Same file as the sync fixtures in conftest.py, through the aiosqlite driver
+async_engine = create_async_engine("sqlite+aiosqlite:///./test.db", poolclass=NullPool)
+AsyncTestingSessionLocal = async_sessionmaker(
+    async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
+
+@pytest.fixture
+def async_client(db):
+    async def override_get_async_db():
+        async with AsyncTestingSessionLocal() as session:
+            yield session
+
+    app = FastAPI()
+    for module in (auth, user, days, achievements, todos):
+        app.include_router(module.router)
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    token_cache.clear()
+    user_cache.clear()
+    day_cache.clear()
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def headers(async_client, test_user):
+    login_response = async_client.post(
+        "/api/auth/login",
+        json={"email": "test@example.com", "password": "testpass123"}
+    )
+    return {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+
+
+def test_async_todo_lifecycle(async_client, headers):
+    today = date.today().isoformat()
+    create_response = async_client.post(
+        f"/api/todos/{today}",
+        headers=headers,
+        json={"title": "Async todo", "date": today, "priority": "high"}
+    )
+    assert create_response.status_code == 201
+    todo_id = create_response.json()["id"]
+
+    response = async_client.patch(
+        f"/api/todos/{todo_id}", headers=headers, json={"completed": True}
+    )
+    assert response.json()["completed"] is True
+
+    day = async_client.get(f"/api/days/{today}", headers=headers).json()
+    assert [t["title"] for t in day["todos"]] == ["Async todo"]
+
+    assert async_client.delete(f"/api/todos/{todo_id}", headers=headers).status_code == 204
+    assert async_client.delete(f"/api/todos/{todo_id}", headers=headers).status_code == 404
+
+
+def test_async_achievements_and_profile(async_client, headers):
+    response = async_client.post(
+        "/api/achievements/2024-05-01",
+        headers=headers,
+        json={"title": "Async achievement", "date": "2024-05-01"}
+    )
+    assert response.status_code == 201
+
+    days = async_client.get(
+        "/api/days", headers=headers, params={"start": "2024-05-01", "end": "2024-05-02"}
+    ).json()["days"]
+    assert days["2024-05-01"]["achievements"][0]["title"] == "Async achievement"
+
+    response = async_client.patch("/api/user/me", headers=headers, json={"quote": "Async quote"})
+    assert response.json()["quote"] == "Async quote"
+    assert async_client.get("/api/user/me", headers=headers).json()["quote"] == "Async quote"
+
+
+def test_async_register(async_client, db):
+    response = async_client.post(
+        "/api/auth/register",
+        json={"email": "new@example.com", "password": "secret", "display_name": "New"}
+    )
+    assert response.status_code == 200
+    assert response.json()["email"] == "new@example.com"
+
+
+def test_async_batch_endpoints(async_client, headers):
+    items = [{"title": f"Batch {i}", "date": "2024-06-01"} for i in range(5)]
+    created = async_client.post("/api/todos/batch", headers=headers, json=items).json()
+    assert len(created) == 5
+
+    updates = [{"id": t["id"], "completed": True} for t in created]
+    response = async_client.patch("/api/todos/batch", headers=headers, json=updates)
+    assert all(t["completed"] for t in response.json())
+
+    ids = [t["id"] for t in created]
+    response = async_client.request("DELETE", "/api/todos/batch", headers=headers, json=ids)
+    assert response.json() == {"deleted": 5}
+
+
+def test_async_writes_maintain_daily_summary(async_client, db, test_user, headers):
+    from app.models import DailySummary
+
+    todo = async_client.post(
+        "/api/todos/2024-04-12", headers=headers,
+        json={"title": "Async", "date": "2024-04-12", "priority": "high"}
+    ).json()
+    async_client.patch(f"/api/todos/{todo['id']}", headers=headers, json={"completed": True})
+
+    summary = db.query(DailySummary).filter_by(user_id=test_user.id, date=date(2024, 4, 12)).one()
+    assert (summary.todos, summary.todos_completed, summary.todos_high) == (1, 1, 1)
+
+
+def test_async_list_todos(async_client, headers):
+    items = [{"title": f"Listed {i}", "date": f"2024-03-0{i + 1}"} for i in range(3)]
+    async_client.post("/api/todos/batch", headers=headers, json=items)
+
+    first = async_client.get("/api/todos", headers=headers, params={"limit": 2}).json()
+    second = async_client.get(
+        "/api/todos", headers=headers, params={"limit": 2, "cursor": first["next_cursor"]}
+    ).json()
+    assert [t["title"] for t in first["items"] + second["items"]] == ["Listed 0", "Listed 1", "Listed 2"]
+    assert second["next_cursor"] is None
+
+
+def test_async_day_view_etag(async_client, headers):
+    etag = async_client.get("/api/days/2024-03-01", headers=headers).headers["etag"]
+    
+    cached = async_client.get("/api/days/2024-03-01", headers={**headers, "If-None-Match": etag})
+    assert cached.status_code == 304
+    async_client.post("/api/todos/batch", headers=headers, json=[{"title": "New", "date": "2024-03-01"}])
+    assert async_client.get("/api/days/2024-03-01", headers={**headers, "If-None-Match": etag}).status_code == 200
@@ -1,6 +1,7 @@
 import pytest
 from datetime import date
 
+from app.core.config import settings
 from app.models import User
 
 
@@ -62,3 +63,52 @@ def test_update_user_quote(client, test_user):
     assert response.status_code == 200
     assert response.json()["quote"] == "New quote"
 
+
+def test_repeat_requests_hit_auth_cache(client, test_user, stats_headers):
+    login_response = client.post(
+        "/api/auth/login",
+        json={"email": "test@example.com", "password": "testpass123"}
+    )
+    token = login_response.json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    client.get("/api/user/me", headers=headers)
+    client.get("/api/user/me", headers=headers)
+
+    stats = client.get("/api/health/cache", headers=stats_headers).json()
+    assert stats["tokens"]["hits"] == 1
+    assert stats["users"]["hits"] == 1
+
+
+def test_update_user_invalidates_cache(client, test_user):
+    login_response = client.post(
+        "/api/auth/login",
+        json={"email": "test@example.com", "password": "testpass123"}
+    )
+    token = login_response.json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    client.get("/api/user/me", headers=headers)
+    client.patch("/api/user/me", headers=headers, json={"display_name": "Renamed"})
+
+    response = client.get("/api/user/me", headers=headers)
+    assert response.json()["display_name"] == "Renamed"
+
+
+def test_invalid_token_rejected(client):
+    response = client.get(
+        "/api/user/me",
+        headers={"Authorization": "Bearer not-a-token"}
+    )
+    assert response.status_code == 401
+
+
+def test_cache_stats_require_the_stats_token(client, monkeypatch):
+    assert client.get("/api/health/cache").status_code == 404
+
+    monkeypatch.setattr(settings, "STATS_TOKEN", "stats-secret")
+    assert client.get("/api/health/cache").status_code == 401
+    response = client.get("/api/health/cache", headers={"Authorization": "Bearer wrong"})
+    assert response.status_code == 401
+    response = client.get("/api/health/cache", headers={"Authorization": "Bearer stats-secret"})
+    assert response.status_code == 200
@@ -0,0 +1,62 @@
+from datetime import date
+
+from app.models import User, Todo
+
+
+def test_todo_batch_lifecycle(client, auth_headers):
+    items = [
+        {"title": f"Todo {i}", "date": "2024-06-01", "priority": "low"}
+        for i in range(50)
+    ]
+    response = client.post("/api/todos/batch", headers=auth_headers, json=items)
+    assert response.status_code == 201
+    created = response.json()
+    assert [t["title"] for t in created] == [f"Todo {i}" for i in range(50)]
+
+    updates = [{"id": t["id"], "completed": True} for t in created[:10]]
+    updates.append({"id": created[10]["id"], "title": "Renamed", "priority": "high"})
+    response = client.patch("/api/todos/batch", headers=auth_headers, json=updates)
+    assert response.status_code == 200
+    assert all(t["completed"] for t in response.json()[:10])
+    assert response.json()[10]["title"] == "Renamed"
+    assert response.json()[10]["completed"] is False
+
+    ids = [t["id"] for t in created[:20]]
+    response = client.request("DELETE", "/api/todos/batch", headers=auth_headers, json=ids)
+    assert response.json() == {"deleted": 20}
+
+    day = client.get("/api/days/2024-06-01", headers=auth_headers).json()
+    assert len(day["todos"]) == 30
+
+
+def test_achievement_batch_create(client, auth_headers):
+    items = [{"title": "Shipped", "date": "2024-06-02", "completed": True}] * 3
+    response = client.post("/api/achievements/batch", headers=auth_headers, json=items)
+    assert response.status_code == 201
+    assert len(response.json()) == 3
+
+
+def test_batch_update_rejects_foreign_ids(client, db, auth_headers):
+    other = User(email="other@example.com", hashed_password="x", display_name="Other")
+    db.add(other)
+    db.commit()
+    foreign = Todo(user_id=other.id, title="Not yours", date=date(2024, 6, 1))
+    db.add(foreign)
+    db.commit()
+
+    response = client.patch(
+        "/api/todos/batch", headers=auth_headers, json=[{"id": foreign.id, "completed": True}]
+    )
+    assert response.status_code == 404
+    response = client.request("DELETE", "/api/todos/batch", headers=auth_headers, json=[foreign.id])
+    assert response.status_code == 404
+    db.refresh(foreign)
+    assert foreign.completed is False
+
+
+def test_batch_size_limit(client, auth_headers, monkeypatch):
+    from app.core.config import settings
+    monkeypatch.setattr(settings, "MAX_BATCH_SIZE", 2)
+    items = [{"title": "Too many", "date": "2024-06-01"}] * 3
+    response = client.post("/api/todos/batch", headers=auth_headers, json=items)
+    assert response.status_code == 413
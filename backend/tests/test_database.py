@@ -0,0 +1,20 @@
+from sqlalchemy import create_engine, text
+
+from app.core.database import configure_engine, is_async_url, to_sync_url
+
+
+def test_async_url_maps_to_sync_driver():
+    assert is_async_url("sqlite+aiosqlite:///./app.db")
+    assert not is_async_url("sqlite:///./app.db")
+    assert to_sync_url("postgresql+asyncpg://u:p@host/db") == "postgresql://u:p@host/db"
+
+
+def test_sqlite_profile_applied_to_new_connections(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'tuned.db'}")
+    configure_engine(engine)
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+        assert conn.execute(text("PRAGMA busy_timeout")).scalar() == 5000
+        assert conn.execute(text("PRAGMA temp_store")).scalar() == 2  # MEMORY
+    engine.dispose()
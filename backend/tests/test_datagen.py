@@ -0,0 +1,42 @@
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.pool import StaticPool
+
+from app.models import Achievement, Todo, DailySummary, SyncChange
+from benchmarks.datagen import generate
+
+
+def memory_engine():
+    return create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+
+
+def rows(engine, model):
+    with engine.connect() as conn:
+        return conn.execute(
+            select(model.user_id, model.date, model.title, model.completed).order_by(model.id)
+        ).all()
+
+
+def test_generate_is_deterministic():
+    first, second = memory_engine(), memory_engine()
+    counts = generate(first, users=3, days=10, items=4, seed=7)
+    assert generate(second, users=3, days=10, items=4, seed=7) == counts
+    assert counts["users"] == 3
+    assert counts["achievements"] + counts["todos"] == 3 * 10 * 4
+    for model in (Achievement, Todo):
+        assert rows(first, model) == rows(second, model)
+
+    other = memory_engine()
+    generate(other, users=3, days=10, items=4, seed=8)
+    assert rows(other, Todo) != rows(first, Todo)
+
+
+def test_generate_maintains_summaries_and_sync_log():
+    engine = memory_engine()
+    counts = generate(engine, users=2, days=5, items=3, seed=1)
+    with engine.connect() as conn:
+        totals = conn.execute(
+            select(func.sum(DailySummary.achievements), func.sum(DailySummary.todos))
+        ).one()
+        assert tuple(totals) == (counts["achievements"], counts["todos"])
+        logged = conn.scalar(select(func.count()).select_from(SyncChange))
+        assert logged == counts["users"] + counts["achievements"] + counts["todos"]
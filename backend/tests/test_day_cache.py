@@ -0,0 +1,104 @@
+import threading
+import time
+from datetime import date
+
+import pytest
+
+from app.core.cache import CacheBackend, SingleFlight
+from app.core.config import settings
+from app.day_cache import create_backend, day_cache, day_cache_stats
+from app.models import Todo
+
+
+class DictBackend(CacheBackend):
+    """Shared-backend stand-in with no eviction policy of its own"""
+    
+    def __init__(self, max_size, ttl_seconds):
+        self.data = {}
+    
+    def get(self, key):
+        return self.data.get(key)
+    
+    def set(self, key, value, ttl_seconds=None):
+        self.data[key] = value
+    
+    def delete(self, key):
+        self.data.pop(key, None)
+    
+    def clear(self):
+        self.data.clear()
+
+
+def test_day_view_served_from_cache_until_written(client, db, test_user, auth_headers):
+    db.add(Todo(user_id=test_user.id, title="Cached", date=date(2024, 3, 1)))
+    db.commit()
+    
+    first = client.get("/api/days/2024-03-01", headers=auth_headers).json()
+    second = client.get("/api/days/2024-03-01", headers=auth_headers).json()
+    assert first == second
+    assert day_cache_stats()["hits"] == 1
+    assert day_cache.get((test_user.id, date(2024, 3, 1))) is not None
+    
+    client.post("/api/todos/2024-03-01", headers=auth_headers, json={"title": "Fresh", "date": "2024-03-01"})
+    assert day_cache.get((test_user.id, date(2024, 3, 1))) is None
+    titles = [t["title"] for t in client.get("/api/days/2024-03-01", headers=auth_headers).json()["todos"]]
+    assert titles == ["Cached", "Fresh"]
+
+
+def test_update_and_delete_evict_the_day(client, test_user, auth_headers):
+    key = (test_user.id, date(2024, 3, 1))
+    todo = client.post("/api/todos/2024-03-01", headers=auth_headers,
+                       json={"title": "Edit me", "date": "2024-03-01"}).json()
+    
+    client.get("/api/days/2024-03-01", headers=auth_headers)
+    client.patch(f"/api/todos/{todo['id']}", headers=auth_headers, json={"title": "Edited"})
+    assert day_cache.get(key) is None
+    assert client.get("/api/days/2024-03-01", headers=auth_headers).json()["todos"][0]["title"] == "Edited"
+    
+    client.delete(f"/api/todos/{todo['id']}", headers=auth_headers)
+    assert day_cache.get(key) is None
+    assert client.get("/api/days/2024-03-01", headers=auth_headers).json()["todos"] == []
+
+
+def test_stale_version_is_not_served(client, test_user, auth_headers):
+    client.get("/api/days/2024-03-01", headers=auth_headers)
+    key = (test_user.id, date(2024, 3, 1))
+    version, body = day_cache.get(key)
+    day_cache.set(key, ((version[0] - 1, version[1]), b'{"todos": ["bogus"]}'))
+    
+    assert client.get("/api/days/2024-03-01", headers=auth_headers).json()["todos"] == []
+
+
+def test_single_flight_coalesces_concurrent_loads():
+    flight = SingleFlight()
+    calls = []
+    
+    def load():
+        calls.append(1)
+        time.sleep(0.1)
+        return "view"
+    
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(flight.do("key", load))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert results == ["view"] * 8
+    assert len(calls) == 1
+    assert flight.stats() == {"loads": 1, "coalesced": 7}
+
+
+def test_custom_backend_factory(monkeypatch):
+    monkeypatch.setattr(settings, "DAY_CACHE_BACKEND", "tests.test_day_cache:DictBackend")
+    assert isinstance(create_backend(), DictBackend)
+
+
+def test_backends_must_implement_the_store_methods():
+    class ReadOnly(CacheBackend):
+        def get(self, key):
+            return None
+
+    with pytest.raises(TypeError):
+        ReadOnly()
@@ -0,0 +1,71 @@
+import pytest
+from datetime import date, timedelta
+
+from app.models import User, Achievement, Todo
+
+
+def test_get_day_range(client, db, test_user):
+    # Login first
+    login_response = client.post(
+        "/api/auth/login",
+        json={"email": "test@example.com", "password": "testpass123"}
+    )
+    token = login_response.json()["access_token"]
+
+    start = date(2024, 3, 1)
+    db.add(Achievement(user_id=test_user.id, title="Day one", date=start))
+    db.add(Todo(user_id=test_user.id, title="Day three", date=start + timedelta(days=2)))
+    db.add(Todo(user_id=test_user.id, title="Out of range", date=start + timedelta(days=10)))
+    db.commit()
+
+    response = client.get(
+        "/api/days",
+        params={"start": start.isoformat(), "end": (start + timedelta(days=6)).isoformat()},
+        headers={"Authorization": f"Bearer {token}"}
+    )
+    assert response.status_code == 200
+    days = response.json()["days"]
+    assert len(days) == 7
+    assert days["2024-03-01"]["achievements"][0]["title"] == "Day one"
+    assert days["2024-03-02"] == {"date": "2024-03-02", "achievements": [], "todos": [], "recurring": []}
+    assert days["2024-03-03"]["todos"][0]["title"] == "Day three"
+
+
+def test_get_day_range_rejects_inverted_range(client, test_user):
+    # Login first
+    login_response = client.post(
+        "/api/auth/login",
+        json={"email": "test@example.com", "password": "testpass123"}
+    )
+    token = login_response.json()["access_token"]
+
+    response = client.get(
+        "/api/days",
+        params={"start": "2024-03-10", "end": "2024-03-01"},
+        headers={"Authorization": f"Bearer {token}"}
+    )
+    assert response.status_code == 400
+
+
+def test_day_view_matches_pydantic_serialization(client, db, test_user):
+    from app.schemas import DayViewResponse
+
+    login_response = client.post(
+        "/api/auth/login",
+        json={"email": "test@example.com", "password": "testpass123"}
+    )
+    token = login_response.json()["access_token"]
+
+    day = date(2024, 3, 1)
+    db.add(Achievement(user_id=test_user.id, title="Shipped", notes="v1", date=day, completed=True))
+    db.add(Todo(user_id=test_user.id, title="Review", date=day, priority="high", due_time="14:30"))
+    db.commit()
+
+    response = client.get("/api/days/2024-03-01", headers={"Authorization": f"Bearer {token}"})
+    expected = DayViewResponse(
+        date=day,
+        achievements=db.query(Achievement).all(),
+        todos=db.query(Todo).all()
+    )
+    assert response.headers["content-type"] == "application/json"
+    assert response.json() == expected.model_dump(mode="json")
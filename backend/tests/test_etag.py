@@ -0,0 +1,57 @@
+from datetime import date
+
+from app.models import Achievement, Todo
+
+
+def test_day_view_not_modified_until_changed(client, db, test_user, auth_headers):
+    db.add(Todo(user_id=test_user.id, title="Poll me", date=date(2024, 3, 1)))
+    db.commit()
+    
+    first = client.get("/api/days/2024-03-01", headers=auth_headers)
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+    
+    cached = client.get("/api/days/2024-03-01", headers={**auth_headers, "If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.headers["etag"] == etag
+    assert cached.content == b""
+    
+    todo_id = first.json()["todos"][0]["id"]
+    client.patch(f"/api/todos/{todo_id}", headers=auth_headers, json={"completed": True})
+    changed = client.get("/api/days/2024-03-01", headers={**auth_headers, "If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+    assert changed.json()["todos"][0]["completed"] is True
+
+
+def test_day_etag_changes_on_create_and_delete(client, db, test_user, auth_headers):
+    db.add(Achievement(user_id=test_user.id, title="Existing", date=date(2024, 3, 1)))
+    db.commit()
+    
+    def etag():
+        return client.get("/api/days/2024-03-01", headers=auth_headers).headers["etag"]
+    
+    before = etag()
+    created = client.post("/api/achievements/batch", headers=auth_headers,
+                          json=[{"title": "New", "date": "2024-03-01"}]).json()
+    after_create = etag()
+    client.request("DELETE", "/api/achievements/batch", headers=auth_headers,
+                   json=[created[0]["id"]])
+    after_delete = etag()
+    
+    assert len({before, after_create, after_delete}) == 3
+
+
+def test_day_range_and_profile_etags(client, test_user, auth_headers):
+    params = {"start": "2024-03-01", "end": "2024-03-07"}
+    first = client.get("/api/days", params=params, headers=auth_headers)
+    cached = client.get("/api/days", params=params,
+                        headers={**auth_headers, "If-None-Match": f'W/{first.headers["etag"]}'})
+    assert cached.status_code == 304
+    
+    me = client.get("/api/user/me", headers=auth_headers)
+    assert client.get("/api/user/me", headers={**auth_headers, "If-None-Match": me.headers["etag"]}).status_code == 304
+    client.patch("/api/user/me", headers=auth_headers, json={"quote": "Changed"})
+    refreshed = client.get("/api/user/me", headers={**auth_headers, "If-None-Match": me.headers["etag"]})
+    assert refreshed.status_code == 200
+    assert refreshed.json()["quote"] == "Changed"
@@ -0,0 +1,114 @@
+import asyncio
+import json
+
+import pytest
+from starlette.websockets import WebSocketDisconnect
+
+from app.api.events import event_stream
+from app.changes import hub, publish_change, user_channel
+from app.core.config import settings
+from app.core.pubsub import DROPPED, Broker, LocalBroker, PubSubHub
+
+
+@pytest.fixture
+def token(client, test_user):
+    login_response = client.post(
+        "/api/auth/login",
+        json={"email": "test@example.com", "password": "testpass123"}
+    )
+    return login_response.json()["access_token"]
+
+
+def receive_event(websocket) -> dict:
+    while True:
+        message = json.loads(websocket.receive_text())
+        if message["type"] != "heartbeat":
+            return message
+
+
+def test_websocket_receives_route_events(client, test_user, token, monkeypatch):
+    monkeypatch.setattr(settings, "EVENTS_HEARTBEAT_SECONDS", 0.5)
+    headers = {"Authorization": f"Bearer {token}"}
+    
+    with client.websocket_connect(f"/api/events/ws?token={token}") as websocket:
+        todo = client.post("/api/todos/2024-03-01", headers=headers,
+                           json={"title": "Live", "date": "2024-03-01"}).json()
+        created = receive_event(websocket)
+        assert created["type"] == "todo.created"
+        assert created["items"][0]["title"] == "Live"
+        
+        client.patch(f"/api/todos/{todo['id']}", headers=headers, json={"completed": True})
+        updated = receive_event(websocket)
+        assert updated["type"] == "todo.updated"
+        assert updated["items"][0]["completed"] is True
+        
+        client.delete(f"/api/todos/{todo['id']}", headers=headers)
+        assert receive_event(websocket) == {
+            "type": "todo.deleted", "items": [{"id": todo["id"], "date": "2024-03-01"}]
+        }
+        
+        client.post("/api/achievements/batch", headers=headers,
+                    json=[{"title": f"Batch {i}", "date": "2024-03-02"} for i in range(3)])
+        batch = receive_event(websocket)
+        assert batch["type"] == "achievement.created"
+        assert len(batch["items"]) == 3
+        
+        client.patch("/api/user/me", headers=headers, json={"quote": "Streaming"})
+        profile = receive_event(websocket)
+        assert profile["type"] == "user.updated"
+        assert profile["items"][0]["quote"] == "Streaming"
+        assert "hashed_password" not in profile["items"][0]
+
+
+def test_websocket_rejects_invalid_token(client):
+    with pytest.raises(WebSocketDisconnect):
+        with client.websocket_connect("/api/events/ws?token=nope") as websocket:
+            websocket.receive_text()
+
+
+def test_sse_stream_heartbeat_and_events():
+    async def scenario():
+        subscription = hub.subscribe(user_channel(42))
+        stream = event_stream(subscription, heartbeat=0.01)
+        assert await stream.__anext__() == b"retry: 3000\n\n"
+        assert await stream.__anext__() == b": heartbeat\n\n"
+        
+        publish_change(42, "todo", "created", [{"id": 1}])
+        frame = await stream.__anext__()
+        await stream.aclose()
+        return frame
+    
+    frame = asyncio.run(scenario())
+    assert frame == b'event: todo.created\ndata: {"type":"todo.created","items":[{"id":1}]}\n\n'
+    assert hub.stats()["subscribers"] == 0
+
+
+def test_slow_consumer_is_dropped():
+    local_hub = PubSubHub(LocalBroker(), max_queue=3)
+    
+    async def scenario():
+        slow = local_hub.subscribe("user:1")
+        fast = local_hub.subscribe("user:1")
+        for n in range(3):
+            local_hub.publish("user:1", {"type": "todo.created", "items": [{"id": n}]})
+        await asyncio.sleep(0)
+        assert (await fast.get(1))["items"] == [{"id": 0}]
+        
+        local_hub.publish("user:1", {"type": "todo.created", "items": [{"id": 3}]})
+        await asyncio.sleep(0)
+        return await slow.get(1), await fast.get(1)
+    
+    slow_message, fast_message = asyncio.run(scenario())
+    assert slow_message is DROPPED
+    assert fast_message["items"] == [{"id": 1}]
+    assert local_hub.stats()["dropped"] == 1
+    assert local_hub.stats()["subscribers"] == 1
+
+
+def test_brokers_must_implement_attach_and_publish():
+    class PublishOnly(Broker):
+        def publish(self, channel, message):
+            pass
+
+    with pytest.raises(TypeError):
+        PublishOnly()
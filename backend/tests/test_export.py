@@ -0,0 +1,52 @@
+import csv
+import gzip
+import io
+import json
+import pytest
+from datetime import date
+
+from app.models import Achievement, Todo
+
+
+@pytest.fixture
+def history(db, test_user):
+    db.add_all([
+        Achievement(user_id=test_user.id, title="Old win", date=date(2023, 1, 1), completed=True),
+        Achievement(user_id=test_user.id, title="New win", date=date(2024, 1, 1)),
+        Todo(user_id=test_user.id, title="Chore, with comma", date=date(2024, 1, 2), priority="high"),
+    ])
+    db.commit()
+
+
+def test_export_ndjson(client, auth_headers, history):
+    response = client.get("/api/export", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert [(r["type"], r["title"]) for r in records] == [
+        ("achievement", "Old win"), ("achievement", "New win"), ("todo", "Chore, with comma")
+    ]
+    assert records[2]["priority"] == "high"
+
+
+def test_export_csv_with_date_range(client, auth_headers, history):
+    response = client.get(
+        "/api/export", headers=auth_headers, params={"format": "csv", "start": "2024-01-01"}
+    )
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["title"] for row in rows] == ["New win", "Chore, with comma"]
+    assert rows[0]["priority"] == ""
+
+
+def test_export_json(client, auth_headers, history):
+    response = client.get("/api/export", headers=auth_headers, params={"format": "json"})
+    body = response.json()
+    assert len(body["achievements"]) == 2
+    assert body["todos"][0]["title"] == "Chore, with comma"
+
+
+def test_export_gzip(client, auth_headers, history):
+    with client.stream("GET", "/api/export", headers=auth_headers, params={"gzip": True}) as response:
+        assert response.headers["content-encoding"] == "gzip"
+        raw = b"".join(response.iter_raw())
+    assert len(gzip.decompress(raw).decode().splitlines()) == 3
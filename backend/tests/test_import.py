@@ -0,0 +1,46 @@
+import json
+
+from app.core.config import settings
+
+
+def test_import_ndjson_in_chunks(client, auth_headers, monkeypatch):
+    monkeypatch.setattr(settings, "IMPORT_BATCH_SIZE", 4)
+    records = [{"type": "todo", "title": f"Todo {i}", "date": "2024-02-01"} for i in range(7)]
+    records.append({"type": "achievement", "title": "Imported", "date": "2024-02-01", "completed": True})
+    body = "\n".join(json.dumps(r) for r in records) + "\n"
+
+    response = client.post("/api/import", headers=auth_headers, content=body.encode())
+    assert response.status_code == 200
+    assert response.json() == {"achievements": 1, "todos": 7, "chunks": 2}
+
+    day = client.get("/api/days/2024-02-01", headers=auth_headers).json()
+    assert len(day["todos"]) == 7
+    assert day["achievements"][0]["completed"] is True
+
+
+def test_import_csv_roundtrips_export(client, auth_headers):
+    body = (
+        "type,id,date,title,notes,completed,priority,due_time,created_at,updated_at\n"
+        'todo,9,2024-02-02,"Multi\nline, title",,False,high,09:00,,\n'
+        "achievement,3,2024-02-02,Win,Some notes,True,,,,\n"
+    )
+    response = client.post(
+        "/api/import", headers=auth_headers, params={"format": "csv"}, content=body.encode()
+    )
+    assert response.json() == {"achievements": 1, "todos": 1, "chunks": 1}
+
+    exported = client.get("/api/export", headers=auth_headers, params={"format": "csv"}).text
+    assert '"Multi\nline, title"' in exported
+
+
+def test_import_stops_at_invalid_record(client, auth_headers, monkeypatch):
+    monkeypatch.setattr(settings, "IMPORT_BATCH_SIZE", 1)
+    body = (
+        json.dumps({"type": "todo", "title": "Good", "date": "2024-02-03"}) + "\n"
+        + json.dumps({"type": "todo", "date": "2024-02-03"}) + "\n"
+    )
+    response = client.post("/api/import", headers=auth_headers, content=body.encode())
+    assert response.status_code == 422
+    detail = response.json()["detail"]
+    assert detail["record"] == 2
+    assert detail["imported"] == {"achievement": 0, "todo": 1}
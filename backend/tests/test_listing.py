@@ -0,0 +1,72 @@
+import pytest
+from datetime import date, timedelta
+
+from sqlalchemy import text
+
+from app.api.listing import SortOrder, encode_cursor, list_statement
+from app.models import Todo, Achievement
+
+
+@pytest.fixture
+def many_todos(db, test_user):
+    # Several todos share each date, so the id tie-breaker matters
+    todos = [
+        Todo(
+            user_id=test_user.id, title=f"Todo {n}", date=date(2024, 1, 1) + timedelta(days=n // 3),
+            completed=n % 2 == 0, priority="high" if n % 5 == 0 else "medium"
+        )
+        for n in range(25)
+    ]
+    db.add_all(todos)
+    db.commit()
+    return todos
+
+
+def fetch_all(client, url, headers, **params):
+    titles = []
+    while True:
+        body = client.get(url, headers=headers, params=params).json()
+        titles += [item["title"] for item in body["items"]]
+        if not body["next_cursor"]:
+            return titles
+        params["cursor"] = body["next_cursor"]
+
+
+def test_list_todos_pages_through_everything(client, auth_headers, many_todos):
+    titles = fetch_all(client, "/api/todos", auth_headers, limit=4)
+    assert titles == [f"Todo {n}" for n in range(25)]
+
+    titles = fetch_all(client, "/api/todos", auth_headers, limit=4, order="desc")
+    assert titles == [f"Todo {n}" for n in reversed(range(25))]
+
+
+def test_list_todos_filters(client, auth_headers, many_todos):
+    titles = fetch_all(
+        client, "/api/todos", auth_headers, limit=3,
+        completed=True, start="2024-01-02", end="2024-01-06"
+    )
+    assert titles == [f"Todo {n}" for n in range(3, 18) if n % 2 == 0]
+
+    titles = fetch_all(client, "/api/todos", auth_headers, priority="high")
+    assert titles == ["Todo 0", "Todo 5", "Todo 10", "Todo 15", "Todo 20"]
+
+
+def test_list_achievements(client, db, test_user, auth_headers):
+    db.add_all([Achievement(user_id=test_user.id, title=f"Win {n}", date=date(2024, 2, n + 1)) for n in range(3)])
+    db.commit()
+    body = client.get("/api/achievements", headers=auth_headers, params={"limit": 2}).json()
+    assert [item["title"] for item in body["items"]] == ["Win 0", "Win 1"]
+    assert body["next_cursor"]
+
+
+def test_list_rejects_invalid_cursor(client, auth_headers):
+    response = client.get("/api/todos", headers=auth_headers, params={"cursor": "garbage"})
+    assert response.status_code == 400
+
+
+def test_deep_pages_use_index_range_scan(db):
+    stmt = list_statement(Todo, 1, 50, SortOrder.asc, encode_cursor("2024-01-01", 500000))
+    sql = str(stmt.compile(db.get_bind(), compile_kwargs={"literal_binds": True}))
+    plan = " ".join(row[3] for row in db.execute(text(f"EXPLAIN QUERY PLAN {sql}")))
+    assert "ix_todos_user_id_date" in plan
+    assert "TEMP B-TREE" not in plan
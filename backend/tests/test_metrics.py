@@ -0,0 +1,58 @@
+import logging
+
+import pytest
+
+from app.core.metrics import MetricsMiddleware, registry
+from app.main import app
+
+
+@pytest.fixture
+def auth_headers(client, auth_headers):
+    # Warm the auth caches so requests run only their own queries
+    client.get("/api/user/me", headers=auth_headers)
+    return auth_headers
+
+
+def server_timing(response) -> dict:
+    timings = {}
+    for metric in response.headers["server-timing"].split(", "):
+        name, *params = metric.split(";")
+        timings[name] = dict(param.split("=", 1) for param in params)
+    return timings
+
+
+def test_server_timing_counts_queries(client, auth_headers):
+    response = client.get("/api/days/2024-03-01", headers=auth_headers)
+    timings = server_timing(response)
+    assert set(timings) == {"app", "db", "ser"}
+    # version lookup + achievements + todos (the user comes from the auth cache)
+    assert timings["db"]["desc"] == '"3 queries"'
+    assert float(timings["ser"]["dur"]) > 0
+
+
+def test_metrics_endpoint_exposes_route_histograms(client, auth_headers, stats_headers):
+    registry.clear()
+    client.get("/api/days/2024-03-01", headers=auth_headers)
+    client.get("/api/days/2024-03-02", headers=auth_headers)
+    
+    body = client.get("/api/metrics", headers=stats_headers).text
+    labels = 'method="GET",route="/api/days/{day_date}"'
+    assert f'http_requests_total{{{labels},status="200"}} 2' in body
+    assert f'http_request_duration_seconds_count{{{labels}}} 2' in body
+    assert f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} 2' in body
+    assert f'http_request_db_queries_total{{{labels}}} 6' in body
+
+
+def test_query_budget_flags_n_plus_one(client, auth_headers, caplog, monkeypatch):
+    middleware = next(m for m in app.user_middleware if m.cls is MetricsMiddleware)
+    monkeypatch.setitem(middleware.options, "query_budget", 2)
+    app.middleware_stack = app.build_middleware_stack()
+    try:
+        with caplog.at_level(logging.WARNING, logger="app.core.metrics"):
+            response = client.get("/api/days/2024-03-01", headers=auth_headers)
+    finally:
+        monkeypatch.undo()
+        app.middleware_stack = app.build_middleware_stack()
+    
+    assert response.headers["x-query-budget-exceeded"] == "3"
+    assert "possible N+1" in caplog.text
@@ -0,0 +1,62 @@
+import os
+import subprocess
+import sys
+from datetime import date
+
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.orm import Session
+
+from app.core.database import Base
+from app.models import Achievement, Todo, User
+from app.startup import missing_tables
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def alembic(db_path, *args):
+    env = {**os.environ, "DATABASE_URL": f"sqlite:///{db_path}"}
+    result = subprocess.run([sys.executable, "-m", "alembic", *args], cwd=BACKEND_DIR, env=env,
+                            capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    return result
+
+
+def test_upgrade_head_builds_the_schema_from_an_empty_database(tmp_path):
+    db_path = tmp_path / "empty.db"
+    alembic(db_path, "upgrade", "head")
+
+    engine = create_engine(f"sqlite:///{db_path}")
+    assert missing_tables(engine) == []
+    migrated = inspect(engine)
+    reference = create_engine("sqlite://")
+    Base.metadata.create_all(reference)
+    for table in Base.metadata.tables:
+        assert ({column["name"] for column in migrated.get_columns(table)}
+                == {column["name"] for column in inspect(reference).get_columns(table)}), table
+    engine.dispose()
+
+
+def test_upgrade_head_backfills_a_populated_create_all_database(tmp_path):
+    db_path = tmp_path / "legacy.db"
+    engine = create_engine(f"sqlite:///{db_path}")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        user = User(email="legacy@example.com", hashed_password="x", display_name="Legacy")
+        session.add(user)
+        session.flush()
+        session.add(Achievement(user_id=user.id, title="Ran", date=date(2024, 5, 1), completed=True))
+        session.add(Todo(user_id=user.id, title="Shop", date=date(2024, 5, 1), priority="high"))
+        session.commit()
+        user_id = user.id
+
+    alembic(db_path, "upgrade", "head")
+    assert "(head)" in alembic(db_path, "current").stdout
+    with engine.connect() as connection:
+        summaries = connection.execute(text(
+            "SELECT user_id, date, achievements, achievements_completed, todos, todos_high, version "
+            "FROM daily_summaries"
+        )).all()
+        changes = connection.execute(text("SELECT kind, deleted FROM sync_changes ORDER BY kind")).all()
+    engine.dispose()
+    assert [tuple(row) for row in summaries] == [(user_id, "2024-05-01", 1, 1, 1, 1, 0)]
+    assert [tuple(row) for row in changes] == [("achievement", 0), ("todo", 0), ("user", 0)]
@@ -0,0 +1,113 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.ratelimit import RateLimitMiddleware, RateLimitStore, ShardedMemoryStore, parse_limit
+from app.core.security import create_access_token
+
+
+@pytest.fixture
+def limited_client():
+    app = FastAPI()
+
+    @app.get("/api/todos")
+    def todos():
+        return []
+
+    @app.post("/api/auth/login")
+    def login():
+        return {}
+
+    @app.get("/api/health")
+    def health():
+        return {"status": "ok"}
+
+    store = ShardedMemoryStore(shards=4)
+    app.add_middleware(
+        RateLimitMiddleware, store=store, per_ip="100/minute", exempt=["/api/health"],
+        limits={"default": "3/minute", "POST /api/auth/login": "1/minute"},
+    )
+    return TestClient(app)
+
+
+def bearer(email: str) -> dict:
+    return {"Authorization": f"Bearer {create_access_token({'sub': email})}"}
+
+
+def test_bucket_refills_at_the_limit_rate():
+    store = ShardedMemoryStore(shards=1)
+    limit = parse_limit("2/second")
+    assert store.take("k", limit, now=0) == (True, 1, 0.0)
+    assert store.take("k", limit, now=0) == (True, 0, 0.0)
+    allowed, remaining, retry_after = store.take("k", limit, now=0.25)
+    assert (allowed, remaining, retry_after) == (False, 0, 0.25)
+    assert store.take("k", limit, now=0.5)[0] is True
+    # Never more than the burst, however long the bucket sat idle
+    assert store.take("k", limit, now=100) == (True, 1, 0.0)
+
+
+def test_full_buckets_are_swept():
+    store = ShardedMemoryStore(shards=2, sweep_seconds=10)
+    limit = parse_limit("10/second")
+    store.take("idle", limit, now=store._shards[0].swept_at)
+    store.take("busy", limit, now=store._shards[0].swept_at)
+    assert len(store) == 2
+    store.sweep(now=store._shards[0].swept_at + 0.05)
+    assert len(store) == 2
+    store.sweep(now=store._shards[0].swept_at + 1)
+    assert len(store) == 0
+    assert store.stats()["swept"] == 2
+
+
+def test_parse_limit_rejects_bad_input():
+    assert parse_limit("120/minute").rate == 2
+    for text in ("120", "ten/minute", "5/fortnight", "0/second"):
+        with pytest.raises(ValueError):
+            parse_limit(text)
+
+
+def test_exceeding_the_limit_returns_429(limited_client):
+    for remaining in ("2", "1", "0"):
+        response = limited_client.get("/api/todos")
+        assert response.status_code == 200
+        assert response.headers["x-ratelimit-remaining"] == remaining
+
+    response = limited_client.get("/api/todos")
+    assert response.status_code == 429
+    assert response.json() == {"detail": "Too many requests, please retry later"}
+    assert int(response.headers["retry-after"]) == 20
+    assert response.headers["x-ratelimit-limit"] == "3/minute"
+
+
+def test_route_limits_and_users_have_separate_buckets(limited_client):
+    assert limited_client.post("/api/auth/login").status_code == 200
+    assert limited_client.post("/api/auth/login").status_code == 429
+    # The stricter login limit does not apply to other routes
+    assert limited_client.get("/api/todos").status_code == 200
+
+    for _ in range(3):
+        assert limited_client.get("/api/todos", headers=bearer("a@example.com")).status_code == 200
+    assert limited_client.get("/api/todos", headers=bearer("a@example.com")).status_code == 429
+    assert limited_client.get("/api/todos", headers=bearer("b@example.com")).status_code == 200
+
+
+def test_exempt_paths_are_not_limited(limited_client):
+    for _ in range(10):
+        response = limited_client.get("/api/health")
+        assert response.status_code == 200
+        assert "x-ratelimit-limit" not in response.headers
+
+
+def test_app_is_not_rate_limited_by_default(client):
+    for _ in range(11):
+        response = client.post("/api/auth/login", json={"email": "nobody@example.com", "password": "wrong"})
+        assert response.status_code == 401
+
+
+def test_stores_must_implement_take_and_clear():
+    class Partial(RateLimitStore):
+        def take(self, key, limit, now=None):
+            return True, 0, 0.0
+
+    with pytest.raises(TypeError):
+        Partial()
@@ -0,0 +1,137 @@
+import pytest
+import time
+from datetime import date, timedelta
+
+from app.recurrence import expansion_cache, last_occurrence
+
+MONDAY = date(2024, 3, 4)
+
+
+@pytest.fixture
+def rule(client, auth_headers):
+    response = client.post("/api/recurring", json={
+        "title": "Gym", "priority": "high", "rrule": "FREQ=WEEKLY;BYDAY=MO,WE", "dtstart": MONDAY.isoformat()
+    }, headers=auth_headers)
+    assert response.status_code == 201
+    return response.json()
+
+
+def recurring(client, auth_headers, day: str) -> list:
+    return client.get(f"/api/days/{day}", headers=auth_headers).json()["recurring"]
+
+
+def test_occurrences_are_expanded_for_requested_days(client, auth_headers, rule):
+    assert rule["until"] is None
+    assert recurring(client, auth_headers, "2024-03-05") == []
+    assert recurring(client, auth_headers, "2024-03-06") == [{
+        "rule_id": rule["id"], "date": "2024-03-06", "title": "Gym", "notes": None,
+        "completed": False, "priority": "high", "due_time": None,
+    }]
+    # Before dtstart
+    assert recurring(client, auth_headers, "2024-02-28") == []
+
+    days = client.get("/api/days", params={"start": "2024-03-04", "end": "2024-03-10"},
+                      headers=auth_headers).json()["days"]
+    assert [day for day, view in days.items() if view["recurring"]] == ["2024-03-04", "2024-03-06"]
+
+
+def test_invalid_rules_are_rejected(client, auth_headers):
+    for text in ("FREQ=HOURLY", "FREQ=WEEKLY;BYDAY=XX", "not a rule", "FREQ=DAILY;DTSTART=20240101"):
+        response = client.post("/api/recurring", json={
+            "title": "Bad", "rrule": text, "dtstart": MONDAY.isoformat()
+        }, headers=auth_headers)
+        assert response.status_code == 400, text
+
+
+def test_bounded_rule_stores_its_last_occurrence(client, auth_headers):
+    assert last_occurrence("FREQ=DAILY;COUNT=3", MONDAY) == date(2024, 3, 6)
+    response = client.post("/api/recurring", json={
+        "title": "Course", "rrule": "FREQ=WEEKLY;UNTIL=20240320", "dtstart": MONDAY.isoformat()
+    }, headers=auth_headers)
+    assert response.json()["until"] == "2024-03-18"
+    assert recurring(client, auth_headers, "2024-03-18") != []
+    assert recurring(client, auth_headers, "2024-03-25") == []
+
+
+def test_rules_ending_past_the_horizon_are_rejected(client, auth_headers):
+    for text in ("FREQ=DAILY;UNTIL=99991231", "FREQ=DAILY;COUNT=100000000"):
+        response = client.post("/api/recurring", json={
+            "title": "Forever", "rrule": text, "dtstart": MONDAY.isoformat()
+        }, headers=auth_headers)
+        assert response.status_code == 400, text
+    assert last_occurrence("FREQ=YEARLY;COUNT=10", MONDAY) == date(2033, 3, 4)
+
+
+def test_rules_that_never_match_are_rejected_quickly(client, auth_headers):
+    for text in ("FREQ=DAILY;BYMONTH=2;BYMONTHDAY=30;COUNT=1", "FREQ=DAILY;BYMONTH=2;BYMONTHDAY=30"):
+        started = time.perf_counter()
+        response = client.post("/api/recurring", json={
+            "title": "Never", "rrule": text, "dtstart": MONDAY.isoformat()
+        }, headers=auth_headers)
+        assert response.status_code == 422, text
+        assert time.perf_counter() - started < 2, text
+
+
+def test_override_changes_only_its_occurrence_and_day(client, auth_headers, rule):
+    monday_etag = client.get("/api/days/2024-03-04", headers=auth_headers).headers["etag"]
+    wednesday_etag = client.get("/api/days/2024-03-06", headers=auth_headers).headers["etag"]
+
+    response = client.patch(f"/api/recurring/{rule['id']}/occurrences/2024-03-06",
+                            json={"completed": True, "title": "Gym (legs)"}, headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json()["completed"] is True
+
+    wednesday = client.get("/api/days/2024-03-06", headers=auth_headers)
+    assert wednesday.headers["etag"] != wednesday_etag
+    assert wednesday.json()["recurring"][0]["title"] == "Gym (legs)"
+    assert wednesday.json()["recurring"][0]["priority"] == "high"
+    assert client.get("/api/days/2024-03-04", headers={
+        **auth_headers, "If-None-Match": monday_etag
+    }).status_code == 304
+    assert recurring(client, auth_headers, "2024-03-11")[0]["completed"] is False
+
+
+def test_cancel_and_restore_occurrence(client, auth_headers, rule):
+    url = f"/api/recurring/{rule['id']}/occurrences/2024-03-11"
+    assert client.delete(url, headers=auth_headers).status_code == 204
+    assert recurring(client, auth_headers, "2024-03-11") == []
+    assert recurring(client, auth_headers, "2024-03-13") != []
+
+    client.patch(url, json={"cancelled": False}, headers=auth_headers)
+    assert recurring(client, auth_headers, "2024-03-11")[0]["title"] == "Gym"
+
+
+def test_override_requires_an_occurrence(client, auth_headers, rule):
+    response = client.patch(f"/api/recurring/{rule['id']}/occurrences/2024-03-05",
+                            json={"completed": True}, headers=auth_headers)
+    assert response.status_code == 404
+
+
+def test_rule_changes_refresh_every_day(client, auth_headers, rule):
+    first = client.get("/api/days/2024-03-04", headers=auth_headers)
+
+    response = client.patch(f"/api/recurring/{rule['id']}", json={"title": "Swim"}, headers=auth_headers)
+    assert response.status_code == 200
+    second = client.get("/api/days/2024-03-04", headers={**auth_headers, "If-None-Match": first.headers["etag"]})
+    assert second.status_code == 200
+    assert second.json()["recurring"][0]["title"] == "Swim"
+
+    assert client.delete(f"/api/recurring/{rule['id']}", headers=auth_headers).status_code == 204
+    assert recurring(client, auth_headers, "2024-03-04") == []
+    assert client.get("/api/recurring", headers=auth_headers).json() == []
+
+
+def test_year_view_expands_each_rule_once_per_year(client, auth_headers, rule):
+    expansion_cache.clear()
+    params = {"start": "2024-01-01", "end": "2024-12-31"}
+    before = expansion_cache.stats()
+    days = client.get("/api/days", params=params, headers=auth_headers).json()["days"]
+    mondays_and_wednesdays = sum(
+        1 for n in range((date(2024, 12, 31) - MONDAY).days + 1) if (MONDAY + timedelta(days=n)).weekday() in (0, 2)
+    )
+    assert sum(len(view["recurring"]) for view in days.values()) == mondays_and_wednesdays
+    # A changed range over the same year reuses the expansion
+    client.get("/api/days", params={"start": "2024-02-01", "end": "2024-11-30"}, headers=auth_headers)
+    after = expansion_cache.stats()
+    assert after["misses"] - before["misses"] == 1
+    assert after["hits"] - before["hits"] == 1
@@ -0,0 +1,95 @@
+import asyncio
+import sqlite3
+import pytest
+from datetime import date
+
+from app.core.config import settings
+from app.core.replicas import dispose_replicas, get_read_replicas
+from app.models import Todo
+
+
+def copy_primary(path) -> None:
+    """Stand-in for replication: snapshot the test database into the file"""
+    source, target = sqlite3.connect("test.db"), sqlite3.connect(path)
+    source.backup(target)
+    source.close()
+    target.close()
+
+
+@pytest.fixture
+def replicas(client, monkeypatch, tmp_path):
+    """Point READ_DATABASE_URLS at the given files, each a copy of the primary unless copy=False"""
+    def configure(*names, copy=True):
+        paths = [tmp_path / name for name in names]
+        if copy:
+            for path in paths:
+                copy_primary(path)
+        monkeypatch.setattr(settings, "READ_DATABASE_URLS", [f"sqlite:///{path}" for path in paths])
+        return paths
+    yield configure
+    asyncio.run(dispose_replicas())
+
+
+def day_titles(client, auth_headers, day="2024-05-01"):
+    return [todo["title"] for todo in client.get(f"/api/days/{day}", headers=auth_headers).json()["todos"]]
+
+
+def add_on_primary_only(db, test_user, title):
+    db.add(Todo(user_id=test_user.id, title=title, date=date(2024, 5, 1)))
+    db.commit()
+
+
+def test_reads_rotate_over_replicas_until_the_user_writes(
+    client, db, test_user, auth_headers, replicas, stats_headers
+):
+    client.post("/api/todos/2024-05-01", headers=auth_headers, json={"title": "Replicated", "date": "2024-05-01"})
+    replicas("a.db", "b.db")
+    add_on_primary_only(db, test_user, "Not replicated yet")
+
+    assert day_titles(client, auth_headers) == ["Replicated"]
+    assert client.get("/api/todos", headers=auth_headers).json()["items"][0]["title"] == "Replicated"
+    health = client.get("/api/health/replicas", headers=stats_headers).json()
+    assert [replica["reads"] for replica in health["replicas"]] == [1, 1]
+    assert all(replica["healthy"] for replica in health["replicas"])
+
+    # Writes go to the primary, and so do the writer's reads right after
+    client.post("/api/todos/2024-05-01", headers=auth_headers, json={"title": "Written", "date": "2024-05-01"})
+    assert day_titles(client, auth_headers) == ["Replicated", "Not replicated yet", "Written"]
+    health = client.get("/api/health/replicas", headers=stats_headers).json()
+    assert [replica["reads"] for replica in health["replicas"]] == [1, 1]
+
+
+def test_unhealthy_replicas_leave_the_rotation(client, db, test_user, auth_headers, replicas, stats_headers):
+    client.post("/api/todos/2024-05-01", headers=auth_headers, json={"title": "Replicated", "date": "2024-05-01"})
+    good, missing = replicas("good.db", "missing.db", copy=False)
+    copy_primary(good)
+    add_on_primary_only(db, test_user, "Not replicated yet")
+
+    # missing.db has no tables yet
+    assert asyncio.run(get_read_replicas().check()) == 1
+    for _ in range(3):
+        assert day_titles(client, auth_headers) == ["Replicated"]
+    health = client.get("/api/health/replicas", headers=stats_headers).json()["replicas"]
+    assert [(replica["healthy"], replica["reads"]) for replica in health] == [(True, 3), (False, 0)]
+
+    copy_primary(missing)
+    assert asyncio.run(get_read_replicas().check()) == 2
+    day_titles(client, auth_headers)
+    assert get_read_replicas().replicas[1].reads == 1
+
+
+def test_reads_fall_back_to_the_primary(client, db, test_user, auth_headers, replicas):
+    replicas("stale.db")
+
+    # Registered after the copy: the auth lookup misses on the replica
+    client.post("/api/auth/register",
+                json={"email": "new@example.com", "password": "newpass123", "display_name": "New"})
+    token = client.post("/api/auth/login", json={"email": "new@example.com", "password": "newpass123"}).json()
+    response = client.get("/api/user/me", headers={"Authorization": f"Bearer {token['access_token']}"})
+    assert response.status_code == 200
+    assert response.json()["email"] == "new@example.com"
+
+    # Every replica down: reads use the primary
+    get_read_replicas().replicas[0].mark_down(RuntimeError("gone"))
+    add_on_primary_only(db, test_user, "Primary")
+    assert day_titles(client, auth_headers) == ["Primary"]
@@ -0,0 +1,77 @@
+import pytest
+from datetime import date
+
+from app import search as search_index
+from app.models import User, Achievement, Todo
+
+
+@pytest.fixture
+def searchable(db, test_user):
+    other = User(email="other@example.com", hashed_password="x", display_name="Other")
+    db.add(other)
+    db.commit()
+    db.add_all([
+        Todo(user_id=test_user.id, title="Buy groceries", notes="milk and eggs", date=date(2024, 1, 1)),
+        Todo(user_id=test_user.id, title="Call plumber", notes="groceries can wait", date=date(2024, 1, 2)),
+        Achievement(user_id=test_user.id, title="Grocery run done", date=date(2024, 1, 3)),
+        Todo(user_id=other.id, title="Other user's groceries", date=date(2024, 1, 1)),
+    ])
+    db.commit()
+
+
+def test_search_ranks_prefix_matches(client, auth_headers, searchable):
+    response = client.get("/api/search", headers=auth_headers, params={"q": "groc"})
+    assert response.status_code == 200
+    items = response.json()["items"]
+    assert len(items) == 3
+    # Title matches outrank notes-only matches
+    assert items[-1]["title"] == "Call plumber"
+    assert "<mark>groceries</mark>" in items[-1]["notes_snippet"]
+    titles = {item["title_highlight"] for item in items}
+    assert "Buy <mark>groceries</mark>" in titles
+    assert {item["type"] for item in items} == {"todo", "achievement"}
+
+
+def test_search_keyset_pagination(client, auth_headers, searchable):
+    seen = []
+    params = {"q": "groc", "limit": 1}
+    while True:
+        body = client.get("/api/search", headers=auth_headers, params=params).json()
+        seen += [(item["type"], item["id"]) for item in body["items"]]
+        if not body["next_cursor"]:
+            break
+        params["cursor"] = body["next_cursor"]
+    assert len(seen) == len(set(seen)) == 3
+
+
+def test_search_index_follows_updates_and_deletes(client, db, auth_headers, searchable):
+    todo = db.query(Todo).filter_by(title="Buy groceries").one()
+    client.patch(f"/api/todos/{todo.id}", headers=auth_headers, json={"title": "Buy vegetables"})
+    achievement = db.query(Achievement).one()
+    client.delete(f"/api/achievements/{achievement.id}", headers=auth_headers)
+
+    body = client.get("/api/search", headers=auth_headers, params={"q": "vegetables"}).json()
+    assert [item["id"] for item in body["items"]] == [todo.id]
+    body = client.get("/api/search", headers=auth_headers, params={"q": "grocery", "type": "achievement"}).json()
+    assert body["items"] == []
+
+
+def test_search_rejects_empty_query(client, auth_headers):
+    response = client.get("/api/search", headers=auth_headers, params={"q": "***"})
+    assert response.status_code == 400
+
+
+def test_search_answers_501_without_a_search_index(client, auth_headers, monkeypatch):
+    monkeypatch.setattr(search_index, "DIALECTS", ("postgresql",))
+    response = client.get("/api/search", headers=auth_headers, params={"q": "groceries"})
+    assert response.status_code == 501
+
+
+def test_highlights_escape_user_text(client, db, test_user, auth_headers):
+    db.add(Todo(user_id=test_user.id, title='<img src=x onerror="alert(1)"> plan',
+                notes="<b>plan</b> & more", date=date(2024, 5, 1)))
+    db.commit()
+
+    hit = client.get("/api/search", headers=auth_headers, params={"q": "plan"}).json()["items"][0]
+    assert hit["title_highlight"] == "&lt;img src=x onerror=&quot;alert(1)&quot;&gt; <mark>plan</mark>"
+    assert hit["notes_snippet"] == "&lt;b&gt;<mark>plan</mark>&lt;/b&gt; &amp; more"
@@ -0,0 +1,66 @@
+import threading
+
+import pytest
+import bcrypt
+
+from app.core.config import settings
+from app.core import security
+from app.core.security import (
+    PasswordHashPool, PasswordHashPoolFull, get_password_hash, needs_rehash, verify_password
+)
+from app.models import User
+
+
+def test_needs_rehash_compares_cost(monkeypatch):
+    monkeypatch.setattr(settings, "BCRYPT_ROUNDS", 5)
+    assert not needs_rehash(bcrypt.hashpw(b"pw", bcrypt.gensalt(rounds=5)).decode())
+    assert needs_rehash(bcrypt.hashpw(b"pw", bcrypt.gensalt(rounds=4)).decode())
+    assert needs_rehash("not-a-bcrypt-hash")
+
+
+def test_password_pool_rejects_when_saturated():
+    pool = PasswordHashPool(max_workers=1, max_pending=1)
+    release = threading.Event()
+    try:
+        future = pool.submit(release.wait)
+        with pytest.raises(PasswordHashPoolFull):
+            pool.submit(release.wait)
+        release.set()
+        future.result()
+        assert pool.run(verify_password, "pw", get_password_hash("pw")) is True
+    finally:
+        release.set()
+        pool.shutdown()
+
+
+def test_register_returns_503_when_pool_saturated(client, monkeypatch):
+    async def saturated(*args):
+        raise PasswordHashPoolFull()
+
+    monkeypatch.setattr(security.password_pool, "run_async", saturated)
+    response = client.post(
+        "/api/auth/register",
+        json={"email": "busy@example.com", "password": "secret", "display_name": "Busy"}
+    )
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+
+def test_login_rehashes_outdated_cost(client, db, monkeypatch):
+    monkeypatch.setattr(settings, "BCRYPT_ROUNDS", 5)
+    user = User(
+        email="old@example.com",
+        hashed_password=bcrypt.hashpw(b"oldpass", bcrypt.gensalt(rounds=4)).decode(),
+        display_name="Old Hash"
+    )
+    db.add(user)
+    db.commit()
+
+    response = client.post(
+        "/api/auth/login",
+        json={"email": "old@example.com", "password": "oldpass"}
+    )
+    assert response.status_code == 200
+    db.refresh(user)
+    assert user.hashed_password.startswith("$2b$05$")
+    assert verify_password("oldpass", user.hashed_password)
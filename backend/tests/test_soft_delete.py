@@ -0,0 +1,86 @@
+from datetime import date, datetime, timedelta
+from sqlalchemy import text
+
+from app.api.days import TODO_FIELDS, rows_statement
+from app.models import DailySummary, DeletedTodo, Todo
+from app.tombstones import purge_tombstones
+
+
+def create_todo(client, auth_headers, title="Todo", day="2024-05-01"):
+    return client.post(f"/api/todos/{day}", headers=auth_headers, json={"title": title, "date": day}).json()
+
+
+def day_titles(client, auth_headers, day="2024-05-01"):
+    return [todo["title"] for todo in client.get(f"/api/days/{day}", headers=auth_headers).json()["todos"]]
+
+
+def test_delete_hides_row_until_restored(client, db, test_user, auth_headers):
+    todo = create_todo(client, auth_headers)
+    cursor = client.get("/api/sync", headers=auth_headers).json()["cursor"]
+
+    assert client.delete(f"/api/todos/{todo['id']}", headers=auth_headers).status_code == 204
+    assert db.get(Todo, todo["id"]).deleted_at is not None
+    assert day_titles(client, auth_headers) == []
+    assert client.get("/api/todos", headers=auth_headers).json()["items"] == []
+    assert client.get("/api/search", headers=auth_headers, params={"q": "todo"}).json()["items"] == []
+    assert client.patch(f"/api/todos/{todo['id']}", headers=auth_headers, json={"title": "x"}).status_code == 404
+    assert client.delete(f"/api/todos/{todo['id']}", headers=auth_headers).status_code == 404
+    changes = client.get("/api/sync", headers=auth_headers, params={"since": cursor}).json()
+    assert changes["deleted_todos"] == [todo["id"]]
+    db.expire_all()
+    assert db.query(DailySummary).filter_by(user_id=test_user.id, date=date(2024, 5, 1)).one().todos == 0
+
+    restored = client.post(f"/api/todos/{todo['id']}/restore", headers=auth_headers)
+    assert restored.status_code == 200
+    assert restored.json()["title"] == "Todo"
+    assert day_titles(client, auth_headers) == ["Todo"]
+    db.expire_all()
+    assert db.query(DailySummary).filter_by(user_id=test_user.id, date=date(2024, 5, 1)).one().todos == 1
+
+    # Only deleted rows can be restored
+    assert client.post(f"/api/todos/{todo['id']}/restore", headers=auth_headers).status_code == 404
+
+
+def test_batch_delete_and_achievement_restore(client, auth_headers):
+    created = client.post("/api/todos/batch", headers=auth_headers,
+                          json=[{"title": f"T{i}", "date": "2024-05-01"} for i in range(3)]).json()
+    response = client.request("DELETE", "/api/todos/batch", headers=auth_headers, json=[created[0]["id"]])
+    assert response.json() == {"deleted": 1}
+    assert day_titles(client, auth_headers) == ["T1", "T2"]
+    # A deleted row counts as unknown for further batch writes
+    response = client.request("DELETE", "/api/todos/batch", headers=auth_headers, json=[created[0]["id"]])
+    assert response.status_code == 404
+
+    achievement = client.post("/api/achievements/2024-05-01", headers=auth_headers,
+                              json={"title": "Win", "date": "2024-05-01"}).json()
+    client.delete(f"/api/achievements/{achievement['id']}", headers=auth_headers)
+    assert client.post(f"/api/achievements/{achievement['id']}/restore", headers=auth_headers).status_code == 200
+    assert client.get("/api/days/2024-05-01", headers=auth_headers).json()["achievements"][0]["title"] == "Win"
+
+
+def test_purge_archives_old_tombstones_in_batches(client, db, auth_headers):
+    ids = [create_todo(client, auth_headers, f"T{i}")["id"] for i in range(5)]
+    for todo_id in ids[:4]:
+        client.delete(f"/api/todos/{todo_id}", headers=auth_headers)
+
+    engine = db.get_bind()
+    assert purge_tombstones(engine, retention_days=30) == {"achievements": 0, "todos": 0}
+    moved = purge_tombstones(engine, retention_days=30, batch_size=3, now=datetime.utcnow() + timedelta(days=31))
+    assert moved == {"achievements": 0, "todos": 4}
+
+    db.expire_all()
+    assert [todo.id for todo in db.query(Todo).all()] == [ids[4]]
+    archived = db.query(DeletedTodo).order_by(DeletedTodo.id).all()
+    assert [row.id for row in archived] == ids[:4]
+    assert all(row.deleted_at and row.archived_at for row in archived)
+    assert client.post(f"/api/todos/{ids[0]}/restore", headers=auth_headers).status_code == 404
+    assert day_titles(client, auth_headers) == ["T4"]
+
+
+def test_day_view_uses_partial_index(db):
+    for day in (date(2024, 5, 1), date(2024, 5, 2)):
+        stmt = rows_statement(Todo, TODO_FIELDS, 1, day, day)
+        sql = str(stmt.compile(db.get_bind(), compile_kwargs={"literal_binds": True}))
+        plan = " ".join(row[3] for row in db.execute(text(f"EXPLAIN QUERY PLAN {sql}")))
+        assert "USING INDEX ix_todos_user_id_date" in plan
+        assert "TEMP B-TREE" not in plan
@@ -0,0 +1,91 @@
+import os
+import subprocess
+import sys
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.pool import StaticPool
+
+from app import startup
+from app.core.config import settings
+from app.main import app
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def memory_engine():
+    return create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+
+
+def test_import_does_not_touch_the_database(tmp_path):
+    db_path = tmp_path / "never-created.db"
+    code = (
+        "import app.main, app.core.database as database; "
+        "assert database._engine is None and database._async_engine is None"
+    )
+    env = {**os.environ, "DATABASE_URL": f"sqlite:///{db_path}"}
+    result = subprocess.run([sys.executable, "-c", code], cwd=BACKEND_DIR, env=env, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    assert not db_path.exists()
+
+
+def test_prepare_schema_check_requires_migrated_tables(monkeypatch):
+    monkeypatch.setattr(startup, "_schema_prepared", False)
+    engine = memory_engine()
+    with pytest.raises(startup.SchemaNotReady, match="alembic upgrade head"):
+        startup.prepare_schema(engine, mode="check")
+
+    startup.prepare_schema(engine, mode="create")
+    assert startup.missing_tables(engine) == []
+    assert "schema" in startup.timings
+
+
+def test_migrated_database_serves_with_schema_check(tmp_path):
+    """The documented production path: alembic upgrade head, then SCHEMA_STARTUP=check"""
+    env = {**os.environ, "DATABASE_URL": f"sqlite:///{tmp_path / 'prod.db'}", "SCHEMA_STARTUP": "check"}
+    migrate = subprocess.run([sys.executable, "-m", "alembic", "upgrade", "head"], cwd=BACKEND_DIR, env=env,
+                             capture_output=True, text=True)
+    assert migrate.returncode == 0, migrate.stderr
+
+    code = (
+        "from fastapi.testclient import TestClient\n"
+        "from app.main import app\n"
+        "with TestClient(app) as client:\n"
+        "    account = {'email': 'prod@example.com', 'password': 'prodpass123'}\n"
+        "    profile = {**account, 'display_name': 'Prod'}\n"
+        "    assert client.post('/api/auth/register', json=profile).status_code == 200\n"
+        "    token = client.post('/api/auth/login', json=account).json()['access_token']\n"
+        "    headers = {'Authorization': f'Bearer {token}'}\n"
+        "    todo = {'title': 'Ship', 'date': '2024-05-01'}\n"
+        "    assert client.post('/api/todos/2024-05-01', headers=headers, json=todo).status_code == 201\n"
+        "    assert client.get('/api/days/2024-05-01', headers=headers).json()['todos'][0]['title'] == 'Ship'\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code], cwd=BACKEND_DIR, env=env, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+
+
+def test_prepare_schema_runs_once_per_process(monkeypatch):
+    monkeypatch.setattr(startup, "_schema_prepared", False)
+    engine = memory_engine()
+    startup.prepare_schema(engine, mode="skip")
+    # Already prepared: the empty database is not checked again
+    startup.prepare_schema(engine, mode="check")
+
+
+def test_prepare_schema_rejects_unknown_mode():
+    with pytest.raises(ValueError):
+        startup.prepare_schema(memory_engine(), mode="migrate")
+
+
+def test_lifespan_reports_startup_budget(monkeypatch, stats_headers):
+    monkeypatch.setattr(startup, "_schema_prepared", False)
+    monkeypatch.setattr(settings, "SCHEMA_STARTUP", "skip")
+    with TestClient(app) as client:
+        report = client.get("/api/health/startup", headers=stats_headers).json()
+        metrics = client.get("/api/metrics", headers=stats_headers).text
+
+    assert report["budget_ms"] == settings.STARTUP_BUDGET_MS
+    assert report["ready_ms"] >= report["import_ms"] > 0
+    assert isinstance(report["within_budget"], bool)
+    assert 'app_startup_seconds{phase="ready"}' in metrics
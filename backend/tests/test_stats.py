@@ -0,0 +1,76 @@
+import json
+from datetime import date, timedelta
+
+from app.models import DailySummary
+
+
+def summary_for(db, user, day):
+    db.expire_all()
+    return db.query(DailySummary).filter_by(user_id=user.id, date=day).one()
+
+
+def test_summary_follows_single_row_writes(client, db, test_user, auth_headers):
+    day = "2024-04-10"
+    todo = client.post(
+        f"/api/todos/{day}", headers=auth_headers,
+        json={"title": "Todo", "date": day, "priority": "high"}
+    ).json()
+    client.post(f"/api/achievements/{day}", headers=auth_headers, json={"title": "Win", "date": day})
+    client.patch(f"/api/todos/{todo['id']}", headers=auth_headers, json={"completed": True, "priority": "low"})
+
+    summary = summary_for(db, test_user, date(2024, 4, 10))
+    assert (summary.todos, summary.todos_completed, summary.todos_low, summary.todos_high) == (1, 1, 1, 0)
+    assert summary.achievements == 1
+
+    client.delete(f"/api/todos/{todo['id']}", headers=auth_headers)
+    summary = summary_for(db, test_user, date(2024, 4, 10))
+    assert (summary.todos, summary.todos_completed, summary.todos_low) == (0, 0, 0)
+
+
+def test_summary_follows_bulk_writes(client, db, test_user, auth_headers):
+    items = [{"title": f"T{i}", "date": "2024-04-11", "priority": "medium"} for i in range(5)]
+    created = client.post("/api/todos/batch", headers=auth_headers, json=items).json()
+    client.patch(
+        "/api/todos/batch", headers=auth_headers,
+        json=[{"id": t["id"], "completed": True} for t in created[:3]]
+    )
+    client.request("DELETE", "/api/todos/batch", headers=auth_headers, json=[created[0]["id"]])
+    body = json.dumps({"type": "achievement", "title": "Imported", "date": "2024-04-11", "completed": True})
+    client.post("/api/import", headers=auth_headers, content=body.encode())
+
+    summary = summary_for(db, test_user, date(2024, 4, 11))
+    assert (summary.todos, summary.todos_completed, summary.todos_medium) == (4, 2, 4)
+    assert (summary.achievements, summary.achievements_completed) == (1, 1)
+
+
+def test_period_summary(client, auth_headers):
+    for day in ("2024-04-01", "2024-04-07", "2024-04-08"):
+        client.post(f"/api/achievements/{day}", headers=auth_headers, json={"title": "Win", "date": day})
+
+    response = client.get(
+        "/api/stats/summary", headers=auth_headers, params={"period": "week", "date": "2024-04-03"}
+    )
+    body = response.json()
+    assert (body["start"], body["end"]) == ("2024-04-01", "2024-04-07")
+    assert body["achievements"] == 2
+    assert body["active_days"] == 2
+
+    body = client.get(
+        "/api/stats/summary", headers=auth_headers, params={"period": "month", "date": "2024-04-03"}
+    ).json()
+    assert (body["end"], body["achievements"]) == ("2024-04-30", 3)
+
+
+def test_streak(client, auth_headers):
+    today = date(2024, 5, 20)
+    for offset in (1, 2, 3, 10, 11, 12, 13):
+        day = (today - timedelta(days=offset)).isoformat()
+        client.post(f"/api/achievements/{day}", headers=auth_headers, json={"title": "Win", "date": day})
+
+    body = client.get(
+        "/api/stats/streak", headers=auth_headers, params={"as_of": today.isoformat()}
+    ).json()
+    assert body == {"current": 3, "longest": 4, "last_active": "2024-05-19"}
+
+    body = client.get("/api/stats/streak", headers=auth_headers, params={"as_of": "2024-05-25"}).json()
+    assert body["current"] == 0
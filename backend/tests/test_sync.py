@@ -0,0 +1,65 @@
+def sync(client, headers, cursor=None, **params):
+    if cursor is not None:
+        params["since"] = cursor
+    response = client.get("/api/sync", headers=headers, params=params)
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_full_then_delta_sync(client, test_user, auth_headers):
+    todo = client.post("/api/todos/2024-03-01", headers=auth_headers,
+                       json={"title": "Offline", "date": "2024-03-01"}).json()
+    achievement = client.post("/api/achievements/2024-03-01", headers=auth_headers,
+                              json={"title": "Done", "date": "2024-03-01"}).json()
+    
+    full = sync(client, auth_headers)
+    assert [t["title"] for t in full["todos"]] == ["Offline"]
+    assert [a["title"] for a in full["achievements"]] == ["Done"]
+    assert full["has_more"] is False
+    
+    # Nothing changed: an empty delta with the same cursor
+    idle = sync(client, auth_headers, full["cursor"])
+    assert (idle["todos"], idle["achievements"], idle["cursor"]) == ([], [], full["cursor"])
+    
+    client.patch(f"/api/todos/{todo['id']}", headers=auth_headers, json={"completed": True})
+    client.delete(f"/api/achievements/{achievement['id']}", headers=auth_headers)
+    client.patch("/api/user/me", headers=auth_headers, json={"quote": "Synced"})
+    
+    delta = sync(client, auth_headers, full["cursor"])
+    assert [(t["id"], t["completed"]) for t in delta["todos"]] == [(todo["id"], True)]
+    assert delta["achievements"] == []
+    assert delta["deleted_achievements"] == [achievement["id"]]
+    assert delta["user"]["quote"] == "Synced"
+
+
+def test_sync_covers_batch_writes_and_pages(client, test_user, auth_headers):
+    created = client.post("/api/todos/batch", headers=auth_headers,
+                          json=[{"title": f"Batch {i}", "date": "2024-03-02"} for i in range(5)]).json()
+    start = sync(client, auth_headers)
+    
+    client.request("DELETE", "/api/todos/batch", headers=auth_headers, json=[created[0]["id"]])
+    client.patch("/api/todos/batch", headers=auth_headers, json=[{"id": created[1]["id"], "title": "Renamed"}])
+    
+    delta = sync(client, auth_headers, start["cursor"])
+    assert delta["deleted_todos"] == [created[0]["id"]]
+    assert [t["title"] for t in delta["todos"]] == ["Renamed"]
+    
+    pages, cursor = [], None
+    while True:
+        page = sync(client, auth_headers, cursor, limit=2)
+        pages.append(page)
+        cursor = page["cursor"]
+        if not page["has_more"]:
+            break
+    assert sum(len(p["todos"]) for p in pages) == 4
+    assert sum(len(p["deleted_todos"]) for p in pages) == 1
+
+
+def test_login_rehash_is_not_a_profile_change(client, test_user, auth_headers):
+    cursor = sync(client, auth_headers)["cursor"]
+    client.post("/api/auth/login", json={"email": "test@example.com", "password": "testpass123"})
+    assert sync(client, auth_headers, cursor)["user"] is None
+
+
+def test_invalid_cursor(client, auth_headers):
+    assert client.get("/api/sync", headers=auth_headers, params={"since": "garbage"}).status_code == 400